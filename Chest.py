@@ -3,12 +3,18 @@ Chest class for the Escape-WE-Project game.
 Handles chest interactions and item spawning.
 """
 
+import logging
 import pygame
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from config import (
-    SCREEN_HEIGHT, CHEST_SIZE, load_image, ASSETS
+    CHEST_SIZE, ASSETS
 )
+from animation import Animator, load_atlas
 from item import spawn_weapon
+from physics import ground_top
+from audio import audio
+
+logger = logging.getLogger(__name__)
 
 
 class Chest(pygame.sprite.Sprite):
@@ -31,23 +37,29 @@ class Chest(pygame.sprite.Sprite):
         """
         super().__init__()
         
+        # State
+        self.opened = False
+
         # Load chest sprites
-        self.closed_image = load_image(ASSETS['chest_closed'], CHEST_SIZE)
-        self.opened_image = load_image(ASSETS['chest_open'], CHEST_SIZE)
-        self.image = self.closed_image
+        self.load_sprites()
         
         # Position
         x, y = position
         if y is None:
-            y = SCREEN_HEIGHT - self.image.get_height() - 20
+            y = ground_top(self.image.get_height(), 20)
             
         self.rect = self.image.get_rect(topleft=(x, y))
         
-        # State
-        self.opened = False
         self.items = [spawn_weapon()]  # Start with one weapon
         self.font = pygame.font.SysFont(None, 24)
 
+    def load_sprites(self) -> None:
+        """Load the closed and open chest sprites."""
+        atlas = load_atlas({'closed': (ASSETS['chest_closed'], CHEST_SIZE),
+                            'open': (ASSETS['chest_open'], CHEST_SIZE)}, ('still',))
+        self.animator = Animator(atlas, 'open' if self.opened else 'closed', 'still')
+        self.image = self.animator.frame()
+
     def open_chest(self) -> Optional[str]:
         """
         Open the chest and return the first item's name.
@@ -57,7 +69,9 @@ class Chest(pygame.sprite.Sprite):
         """
         if not self.opened and self.items:
             self.opened = True
-            self.image = self.opened_image
+            self.animator.play('still', 'open')
+            self.image = self.animator.frame()
+            audio.play('chest')
             return self.items[0].name
         return None
 
@@ -68,7 +82,7 @@ class Chest(pygame.sprite.Sprite):
         Args:
             screen: Pygame surface to draw on
         """
-        screen.blit(self.image, self.rect)
+        self.animator.draw(screen, self.rect)
 
         # Draw items if chest is opened
         if self.opened and self.items:
@@ -96,7 +110,8 @@ class Chest(pygame.sprite.Sprite):
         return len(self.items) == 0
 
 
-def handle_click(chest: Chest, player_inventory, placing_item: Dict[str, Any], player) -> None:
+def handle_click(chest: Chest, player_inventory, placing_item: Dict[str, Any], player,
+                 mouse_pos: Optional[Tuple[int, int]] = None) -> None:
     """
     Handle mouse clicks for chest and inventory interactions.
     
@@ -105,8 +120,10 @@ def handle_click(chest: Chest, player_inventory, placing_item: Dict[str, Any], p
         player_inventory: Player's inventory
         placing_item: Dictionary containing item being placed
         player: Player instance
+        mouse_pos: Position of the click (defaults to pygame's mouse position)
     """
-    mouse_pos = pygame.mouse.get_pos()
+    if mouse_pos is None:
+        mouse_pos = pygame.mouse.get_pos()
 
     # Handle chest interaction
     if chest.items and not chest.opened:
@@ -137,7 +154,7 @@ def handle_click(chest: Chest, player_inventory, placing_item: Dict[str, Any], p
             placing_item["display_text"] = None
             placing_item["display_rect"] = None
             chest.remove_item()
-            print("Item discarded")
+            logger.info("Item discarded")
 
     # Handle inventory item selection
     else:
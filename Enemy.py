@@ -3,68 +3,182 @@ Enemy class for the Escape-WE-Project game.
 Handles enemy movement, behavior, and combat.
 """
 
+import logging
 import pygame
 import random
-from typing import Tuple
+from typing import Optional, Tuple
 from config import (
-    SCREEN_WIDTH, SCREEN_HEIGHT, ENEMY_SIZE, ENEMY_SPEED, 
-    ENEMY_MOVE_DURATION, load_image, ASSETS
+    SCREEN_WIDTH, ENEMY_SIZE, ENEMY_SPEED, 
+    ENEMY_MOVE_DURATION, ENEMY_FALL_SPEED, ASSETS
 )
+from animation import Animator, load_atlas
+from physics import ground_top
+from tilemap import TileMap
+from navigation import FlowField
+
+logger = logging.getLogger(__name__)
+
+# Time and distance below which a walk step is treated as done
+_EPSILON = 1e-9
+
+# Sprite of each enemy type; all of them share one atlas
+ENEMY_SPRITES = {
+    str(enemy_type): (ASSETS[f'enemy{enemy_type}'], (ENEMY_SIZE, ENEMY_SIZE))
+    for enemy_type in (1, 2, 3)
+}
 
 class Enemy:
     """
     Enemy class with movement and combat capabilities.
+
+    Without a fixed ``y``, an enemy stands on the highest platform above
+    its spawn point and patrols it, turning around at its edges. With a
+    ``navigation`` field, it walks towards the player instead whenever the
+    field has a direction for it, dropping off platform edges if that is
+    the way.
     """
-    def __init__(self, x: int = None, y: int = None):
-        self.enemy_type = random.randint(1, 3)
+    def __init__(self, x: int = None, y: int = None, tilemap: Optional[TileMap] = None,
+                 enemy_type: Optional[int] = None, rng: Optional[random.Random] = None):
+        # Draws the enemy's type, position, walk and key drop; the shared generator if None
+        self.rng = rng or random
+        self.enemy_type = self.rng.randint(1, 3) if enemy_type is None else enemy_type
         self.width = ENEMY_SIZE
         self.height = ENEMY_SIZE
+        self.tilemap = tilemap
+        self.navigation: Optional[FlowField] = None
         if x is None:
-            x = random.randint(0, SCREEN_WIDTH * 3 - self.width)
+            x = self.rng.randint(0, SCREEN_WIDTH * 3 - self.width)
         if y is None:
-            y = SCREEN_HEIGHT - self.height
+            y = ground_top(self.height)
+            if tilemap:
+                center = x + self.width // 2
+                y = tilemap.ground_below(center, center + 1, 0) - self.height
+                bounds = tilemap.platform_bounds(center, center + 1, y + self.height)
+                if bounds:
+                    x = max(bounds[0], min(x, bounds[1] - self.width))
         self.x = x
         self.y = y
         self.speed = ENEMY_SPEED
-        self.current_direction = random.choice([-1, 1])
+        self.current_direction = self.rng.choice([-1, 1])
         self.move_timer = 0
         self.move_duration = ENEMY_MOVE_DURATION
-        self.image = self._get_enemy_image()
+        self.load_sprites()
         self.rect = self.image.get_rect(topleft=(self.x, self.y))
         self.health = 100
-        self.drops_key = random.choice([True, False])
-
-    def _get_enemy_image(self) -> pygame.Surface:
-        enemy_images = {
-            1: ASSETS['enemy1'],
-            2: ASSETS['enemy2'],
-            3: ASSETS['enemy3']
-        }
-        image_path = enemy_images.get(self.enemy_type, ASSETS['enemy1'])
-        return load_image(image_path, (ENEMY_SIZE, ENEMY_SIZE))
-
-    def move(self) -> None:
-        if self.move_timer <= 0:
-            self.current_direction = random.choice([-1, 1])
-            self.move_timer = self.move_duration
-        self.x += self.current_direction * self.speed
-        self.move_timer -= 1
-
-    def update(self) -> None:
-        self.move()
+        self.drops_key = self.rng.choice([True, False])
+
+    def load_sprites(self) -> None:
+        """Load the idle and walk animations of the enemy's type."""
+        sprite = str(self.enemy_type) if str(self.enemy_type) in ENEMY_SPRITES else '1'
+        self.animator = Animator(load_atlas(ENEMY_SPRITES, ('idle', 'walk')), sprite, 'walk')
+        self.image = self.animator.frame()
+
+    def move(self, dt: float) -> None:
+        """
+        Advance the random walk by a span of time.
+
+        Whole walk segments are applied at once, so catching up on a long
+        span costs one step per direction change rather than one step per
+        frame, while drawing the same random choices. On a platform, a
+        segment is cut short at the edge, where the enemy turns around.
+        While chasing, the enemy moves a tile column at a time and samples
+        the navigation field again in each column.
+
+        Args:
+            dt: Seconds to advance
+        """
+        remaining = dt
+        while remaining > _EPSILON:
+            bottom = self.y + self.height
+            if self.tilemap:
+                ground = self.tilemap.ground_below(self.x, self.x + self.width, bottom)
+                if ground > bottom:
+                    remaining -= self._fall(ground - bottom, remaining)
+                    continue
+            if self.navigation:
+                direction = self.navigation.direction(self.x + self.width / 2, bottom)
+                if direction:
+                    remaining -= self._chase(direction, remaining)
+                    continue
+            bounds = None
+            if self.tilemap:
+                bounds = self.tilemap.platform_bounds(self.x, self.x + self.width, bottom)
+            if self.move_timer <= _EPSILON:
+                self.current_direction = self.rng.choice([-1, 1])
+                self.move_timer = self.move_duration
+            step = min(remaining, self.move_timer)
+            if bounds:
+                room = self._room(bounds)
+                if room <= _EPSILON:
+                    # At the edge: turn around without using up the segment
+                    self.current_direction = -self.current_direction
+                    room = self._room(bounds)
+                if room <= _EPSILON:
+                    # Platform too narrow to walk on: stand still for the segment
+                    self.move_timer -= step
+                    remaining -= step
+                    continue
+                step = min(step, room / self.speed)
+            self.x += self.current_direction * self.speed * step
+            self.move_timer -= step
+            remaining -= step
+
+    def _fall(self, distance: float, dt: float) -> float:
+        """Drop towards the surface below, returning the seconds used."""
+        duration = distance / ENEMY_FALL_SPEED
+        if dt >= duration:
+            self.y += distance
+            return duration
+        self.y += ENEMY_FALL_SPEED * dt
+        return dt
+
+    def _chase(self, direction: int, dt: float) -> float:
+        """Walk towards the next tile column in a direction, returning the seconds used."""
+        self.current_direction = direction
+        size = self.tilemap.tile_size if self.tilemap else self.width
+        offset = self.tilemap.offset_x if self.tilemap else 0
+        center = self.x + self.width / 2 + offset
+        if direction == 1:
+            distance = size - center % size
+        else:
+            distance = center % size or size
+        to_goal = (self.navigation.goal_x - center) * direction
+        if 0 < to_goal < distance:
+            distance = to_goal
+        step = min(dt, distance / self.speed)
+        self.x += direction * self.speed * step
+        return step
+
+    def _room(self, bounds: Tuple[float, float]) -> float:
+        """Distance the enemy can walk in its current direction before leaving the platform."""
+        if self.current_direction == 1:
+            return bounds[1] - self.width - self.x
+        return self.x - bounds[0]
+
+    def update(self, dt: float) -> None:
+        """
+        Update the enemy state.
+
+        Args:
+            dt: Seconds to advance
+        """
+        x = self.x
+        self.move(dt)
         self.rect.topleft = (self.x, self.y)
+        self.animator.play('walk' if self.x != x else 'idle')
+        self.animator.update(dt)
 
     def draw(self, screen: pygame.Surface) -> None:
-        if self.current_direction == 1:
-            screen.blit(self.image, self.rect)
-        else:
-            flipped_image = pygame.transform.flip(self.image, True, False)
-            screen.blit(flipped_image, self.rect)
+        self.animator.draw(screen, self.rect, mirrored=self.current_direction != 1)
+
+    def get_mask(self) -> pygame.mask.Mask:
+        """Get the collision mask of the frame currently drawn."""
+        return self.animator.mask(mirrored=self.current_direction != 1)
 
     def take_damage(self, damage: int) -> bool:
         self.health -= damage
         if self.health <= 0:
-            print(f"Enemy defeated! Drops key: {self.drops_key}")
+            logger.info("Enemy defeated", extra={"fields": {"drops_key": self.drops_key}})
             return True
         return False
 
@@ -0,0 +1,314 @@
+"""
+Sprite animation for the Escape-WE-Project game.
+Packs the animation frames of a set of sprites into one atlas surface and
+plays them back with time-based controllers.
+"""
+
+import logging
+import math
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Tuple
+import pygame
+from config import (
+    ANIMATION_CLIPS, ATLAS_MAX_WIDTH, load_image, classify_alpha, convert_to_format
+)
+from quality import get_profile
+
+logger = logging.getLogger(__name__)
+
+# Sprite file and size by sprite name
+SpriteSheet = Dict[str, Tuple[str, Tuple[int, int]]]
+
+
+def pose(image: pygame.Surface, clip: str, progress: float, faces_right: bool = True) -> pygame.Surface:
+    """
+    Draw one frame of a clip from a still sprite.
+
+    The sprites are single images, so each clip is a pose applied to the
+    whole sprite: ``idle`` breathes, ``walk`` rocks from foot to foot with
+    a bob on every step and ``attack`` leans into the swing and back. The
+    frame keeps the sprite's size and stands on the same bottom edge.
+
+    Args:
+        image: Still sprite with per-pixel alpha
+        clip: Clip name in ``ANIMATION_CLIPS``
+        progress: Position of the frame in the clip, from 0 to 1
+        faces_right: Whether the sprite looks to the right, so leaning
+            forward tilts it clockwise
+
+    Returns:
+        New surface with per-pixel alpha
+    """
+    width, height = image.get_size()
+    stretch_x = stretch_y = 1.0
+    tilt = lift = 0.0
+    if clip == 'idle':
+        breath = (1 - math.cos(2 * math.pi * progress)) / 2
+        stretch_x, stretch_y = 1 + 0.02 * breath, 1 - 0.03 * breath
+    elif clip == 'walk':
+        step = math.sin(2 * math.pi * progress)
+        tilt = 4 * step
+        lift = 0.05 * height * abs(step)
+    elif clip == 'attack':
+        lean = math.sin(math.pi * progress)
+        tilt = 10 * lean * (-1 if faces_right else 1)
+        stretch_x, stretch_y = 1 + 0.04 * lean, 1 - 0.02 * lean
+    if stretch_x == stretch_y == 1 and not tilt and not lift:
+        return image.copy()
+
+    # Keep on/off transparency crisp so the atlas can still use a colorkey
+    smooth = get_profile().smooth_scaling and classify_alpha(image) == "alpha"
+    posed = image
+    if stretch_x != 1 or stretch_y != 1:
+        size = (round(width * stretch_x), round(height * stretch_y))
+        posed = pygame.transform.smoothscale(posed, size) if smooth else pygame.transform.scale(posed, size)
+    if tilt:
+        posed = pygame.transform.rotozoom(posed, tilt, 1) if smooth else pygame.transform.rotate(posed, tilt)
+    frame = pygame.Surface((width, height), pygame.SRCALPHA)
+    frame.blit(posed, posed.get_rect(midbottom=(width // 2, height - round(lift))))
+    return frame
+
+
+@dataclass(frozen=True)
+class Clip:
+    """
+    Frames of one clip of one sprite, as subsurfaces of an atlas.
+
+    Attributes:
+        frames: Frames facing the way the sprite was drawn
+        mirrored: The same frames flipped horizontally
+        areas: Rect of each frame in the atlas
+        mirrored_areas: Rect of each mirrored frame in the atlas
+        fps: Frames played per second
+        loop: Whether playback wraps around instead of holding the last frame
+    """
+
+    frames: Tuple[pygame.Surface, ...]
+    mirrored: Tuple[pygame.Surface, ...]
+    areas: Tuple[pygame.Rect, ...]
+    mirrored_areas: Tuple[pygame.Rect, ...]
+    fps: float
+    loop: bool
+
+
+class Atlas:
+    """
+    Animation frames of a set of sprites packed into one surface.
+
+    Frames and their mirrored copies are packed onto shelves, tallest
+    first, and the atlas is stored in the fastest blit format its alpha
+    allows, like ``load_image`` does for single images. Frames are handed
+    out as subsurfaces, which share the atlas's pixels; ``Animator.draw``
+    blits the atlas with the frame's rect instead, which keeps RLE
+    acceleration that a subsurface does not have.
+
+    Attributes:
+        surface: Surface holding every frame
+        clips: Clip by (sprite name, clip name)
+    """
+
+    def __init__(self, frames: Dict[Tuple[str, str], Sequence[pygame.Surface]],
+                 max_width: int = ATLAS_MAX_WIDTH):
+        """
+        Pack frames into a new atlas.
+
+        Args:
+            frames: Frames with per-pixel alpha by (sprite name, clip name)
+            max_width: Widest the atlas may grow before frames start a new row
+        """
+        entries = []
+        for key, clip_frames in frames.items():
+            for index, frame in enumerate(clip_frames):
+                entries.append((key, False, index, frame))
+                entries.append((key, True, index, pygame.transform.flip(frame, True, False)))
+        entries.sort(key=lambda entry: -entry[3].get_height())
+
+        places = []
+        x = y = shelf = width = 0
+        for entry in entries:
+            frame_width, frame_height = entry[3].get_size()
+            if x and x + frame_width > max_width:
+                x, y, shelf = 0, y + shelf, 0
+            places.append(pygame.Rect((x, y), (frame_width, frame_height)))
+            x += frame_width
+            shelf = max(shelf, frame_height)
+            width = max(width, x)
+
+        packed = pygame.Surface((max(1, width), max(1, y + shelf)), pygame.SRCALPHA)
+        for (_, _, _, frame), place in zip(entries, places):
+            packed.blit(frame, place)
+        blit_format = classify_alpha(packed)
+        self.surface = convert_to_format(packed, blit_format)
+
+        areas: Dict[Tuple[Tuple[str, str], bool], list] = {}
+        for (key, flipped, index, _), place in zip(entries, places):
+            areas.setdefault((key, flipped), [None] * len(frames[key]))[index] = place
+        self.clips: Dict[Tuple[str, str], Clip] = {}
+        for key in frames:
+            _, fps, loop = ANIMATION_CLIPS[key[1]]
+            forward, backward = tuple(areas[(key, False)]), tuple(areas[(key, True)])
+            self.clips[key] = Clip(
+                tuple(self.surface.subsurface(area) for area in forward),
+                tuple(self.surface.subsurface(area) for area in backward),
+                forward, backward, fps, loop
+            )
+        self._masks: Dict[Tuple[int, int], pygame.mask.Mask] = {}
+        logger.debug("Packed %d frames into a %s atlas as %s", len(entries), self.surface.get_size(),
+                     blit_format)
+
+    def mask(self, frame: pygame.Surface) -> pygame.mask.Mask:
+        """
+        Get the collision mask of a frame, built on first use.
+
+        Args:
+            frame: Frame of one of the atlas's clips
+
+        Returns:
+            Mask shared by everything showing the frame
+        """
+        key = frame.get_offset()
+        mask = self._masks.get(key)
+        if mask is None:
+            mask = self._masks[key] = pygame.mask.from_surface(frame)
+        return mask
+
+
+# Built atlases by sprites, clips and facing; shared like the image cache
+_atlas_cache: Dict[tuple, Atlas] = {}
+
+
+def load_atlas(sprites: SpriteSheet, clips: Sequence[str], faces_right: bool = True) -> Atlas:
+    """
+    Get the atlas of the given sprites posed for each clip, building it on first use.
+
+    Args:
+        sprites: Sprite file and size by sprite name
+        clips: Clip names in ``ANIMATION_CLIPS``
+        faces_right: Whether the sprites look to the right
+
+    Returns:
+        Atlas with a clip for every sprite and clip name
+    """
+    key = (tuple(sorted(sprites.items())), tuple(clips), faces_right)
+    atlas = _atlas_cache.get(key)
+    if atlas is None:
+        frames = {}
+        for name, (path, size) in sprites.items():
+            image = load_image(path, size).convert_alpha()
+            for clip in clips:
+                count, _, loop = ANIMATION_CLIPS[clip]
+                # A looping clip starts where it ends; a one-shot clip is sampled mid-frame
+                offset = 0.0 if loop else 0.5
+                frames[(name, clip)] = [pose(image, clip, (index + offset) / count, faces_right)
+                                        for index in range(count)]
+        atlas = _atlas_cache[key] = Atlas(frames)
+    return atlas
+
+
+def clear_atlas_cache() -> None:
+    """Drop all built atlases so the next loads pose the sprites again."""
+    _atlas_cache.clear()
+
+
+class Animator:
+    """
+    Time-based playback of one sprite's clips from an atlas.
+
+    The frame shown depends only on the time spent in the current clip, so
+    animations run at the same speed at any frame rate and cost nothing to
+    advance beyond adding ``dt``.
+
+    Attributes:
+        atlas: Atlas holding the frames
+        sprite: Sprite name in the atlas
+        name: Name of the clip playing
+        clip: Clip playing
+        time: Seconds since the clip started
+    """
+
+    def __init__(self, atlas: Atlas, sprite: str, clip: str):
+        """
+        Initialize at the start of a clip.
+
+        Args:
+            atlas: Atlas holding the frames
+            sprite: Sprite name in the atlas
+            clip: Clip to start with
+        """
+        self.atlas = atlas
+        self.sprite = sprite
+        self.name = clip
+        self.clip = atlas.clips[(sprite, clip)]
+        self.time = 0.0
+
+    def play(self, clip: str, sprite: Optional[str] = None) -> None:
+        """
+        Switch to a clip, starting it over unless it is already playing.
+
+        Args:
+            clip: Clip name
+            sprite: Sprite to switch to (defaults to the current one)
+        """
+        sprite = sprite or self.sprite
+        if clip != self.name or sprite != self.sprite:
+            self.sprite = sprite
+            self.name = clip
+            self.clip = self.atlas.clips[(sprite, clip)]
+            self.time = 0.0
+
+    def update(self, dt: float) -> None:
+        """
+        Advance the clip.
+
+        Args:
+            dt: Seconds to advance
+        """
+        self.time += dt
+
+    @property
+    def index(self) -> int:
+        """Index of the frame to show."""
+        index = int(self.time * self.clip.fps)
+        count = len(self.clip.frames)
+        return index % count if self.clip.loop else min(index, count - 1)
+
+    @property
+    def finished(self) -> bool:
+        """Whether a clip that does not loop has reached its last frame."""
+        return not self.clip.loop and self.time * self.clip.fps >= len(self.clip.frames)
+
+    def frame(self, mirrored: bool = False) -> pygame.Surface:
+        """
+        Get the frame to show.
+
+        Args:
+            mirrored: Whether to get the horizontally flipped frame
+
+        Returns:
+            Subsurface of the atlas
+        """
+        return (self.clip.mirrored if mirrored else self.clip.frames)[self.index]
+
+    def mask(self, mirrored: bool = False) -> pygame.mask.Mask:
+        """
+        Get the collision mask of the frame to show.
+
+        Args:
+            mirrored: Whether to get the mask of the flipped frame
+
+        Returns:
+            Mask shared by everything showing the frame
+        """
+        return self.atlas.mask(self.frame(mirrored))
+
+    def draw(self, screen: pygame.Surface, position, mirrored: bool = False) -> None:
+        """
+        Draw the frame to show.
+
+        Args:
+            screen: Pygame surface to draw on
+            position: Top-left corner (x, y) or a rect
+            mirrored: Whether to draw the horizontally flipped frame
+        """
+        areas = self.clip.mirrored_areas if mirrored else self.clip.areas
+        screen.blit(self.atlas.surface, position, areas[self.index])
@@ -0,0 +1,192 @@
+"""
+Sound effects for the Escape-WE-Project game.
+Decodes every sound once up front and plays them on a fixed pool of mixer channels.
+"""
+
+import logging
+import math
+import os
+import random
+from array import array
+from typing import Dict, List, Optional
+import pygame
+from config import (
+    AUDIO_FREQUENCY, AUDIO_BUFFER, AUDIO_CHANNELS, AUDIO_VOLUME, AUDIO_CATEGORY_LIMITS,
+    AUDIO_RETRIGGER_MS, SOUNDS
+)
+
+logger = logging.getLogger(__name__)
+
+# Stand-in sounds used when a category's file is missing:
+# (seconds, start Hz, end Hz, noise share of the signal)
+TONES = {
+    'hit': (0.08, 700, 180, 0.6),
+    'pickup': (0.12, 660, 1320, 0.0),
+    'door': (0.30, 110, 60, 0.2),
+    'chest': (0.20, 440, 880, 0.1),
+    'damage': (0.18, 220, 140, 0.4),
+}
+
+
+def synthesize(category: str, frequency: int, channels: int, volume: float = 0.5) -> array:
+    """
+    Generate a short sweep with a decaying envelope as signed 16-bit samples.
+
+    Args:
+        category: Sound category in ``TONES``
+        frequency: Mixer sample rate in Hz
+        channels: Mixer output channels; every sample is repeated for each
+        volume: Peak amplitude from 0 to 1
+
+    Returns:
+        Interleaved samples ready for ``pygame.mixer.Sound(buffer=...)``
+    """
+    seconds, start_hz, end_hz, noise = TONES[category]
+    count = int(seconds * frequency)
+    rng = random.Random(category)
+    peak = volume * 32767
+    samples = array('h')
+    phase = 0.0
+    for index in range(count):
+        progress = index / count
+        phase += 2 * math.pi * (start_hz + (end_hz - start_hz) * progress) / frequency
+        signal = (1 - noise) * math.sin(phase) + noise * rng.uniform(-1, 1)
+        value = int(peak * signal * (1 - progress) ** 2)
+        samples.extend([value] * channels)
+    return samples
+
+
+class AudioSystem:
+    """
+    Decoded sounds and the mixer channels they are played on.
+
+    ``load`` decodes every sound and claims the mixer's channels once, so
+    ``play`` never reads a file or creates a sound. Each category may use
+    at most its limit of channels; past the limit, or when every channel is
+    busy, the oldest voice is stolen. A voice younger than
+    ``retrigger_ms`` is never stolen and the new sound is dropped instead,
+    so fifty hits in one frame play as a few voices rather than cutting
+    each other off. Until ``load`` succeeded, e.g. in the headless
+    simulation, ``play`` does nothing.
+
+    Attributes:
+        enabled: Whether sounds are loaded and played
+        sounds: Decoded sound by category
+        limits: Voices each category may play at once
+        retrigger_ms: Age below which a voice is not stolen
+    """
+
+    def __init__(self, limits: Optional[Dict[str, int]] = None,
+                 retrigger_ms: int = AUDIO_RETRIGGER_MS):
+        """
+        Initialize without sounds or channels.
+
+        Args:
+            limits: Voices each category may play at once (defaults to the config's)
+            retrigger_ms: Age in milliseconds below which a voice is not stolen
+        """
+        self.enabled = False
+        self.sounds: Dict[str, pygame.mixer.Sound] = {}
+        self.limits = dict(AUDIO_CATEGORY_LIMITS if limits is None else limits)
+        self.retrigger_ms = retrigger_ms
+        self._channels: List[pygame.mixer.Channel] = []
+        # Category and start time of the last sound played on each channel
+        self._owners: List[Optional[str]] = []
+        self._started: List[int] = []
+
+    def load(self, sounds: Dict[str, str] = SOUNDS, channels: int = AUDIO_CHANNELS,
+             volume: float = AUDIO_VOLUME) -> bool:
+        """
+        Open the mixer, claim its channels and decode every sound.
+
+        Sound files that are missing or cannot be decoded are replaced by
+        a synthesized stand-in. Loading again does nothing.
+
+        Args:
+            sounds: Sound file by category
+            channels: Mixer channels in the voice pool
+            volume: Volume of every sound from 0 to 1
+
+        Returns:
+            True if sounds can be played
+        """
+        if self.enabled:
+            return True
+        try:
+            # pygame.init() opens the mixer with its own defaults and a large buffer
+            # unless pre_init ran first; reopen it with the configured latency
+            if pygame.mixer.get_init() not in (None, (AUDIO_FREQUENCY, -16, 2)):
+                pygame.mixer.quit()
+            if not pygame.mixer.get_init():
+                pygame.mixer.init(AUDIO_FREQUENCY, -16, 2, AUDIO_BUFFER)
+            frequency, size, outputs = pygame.mixer.get_init()
+        except (pygame.error, TypeError) as error:
+            logger.warning("Sound disabled: %s", error)
+            return False
+
+        pygame.mixer.set_num_channels(channels)
+        self._channels = [pygame.mixer.Channel(index) for index in range(channels)]
+        self._owners = [None] * channels
+        self._started = [0] * channels
+        for category, filename in sounds.items():
+            sound = None
+            if os.path.exists(filename):
+                try:
+                    sound = pygame.mixer.Sound(filename)
+                except pygame.error as error:
+                    logger.warning("Could not decode %s: %s", filename, error)
+            if sound is None and category in TONES and size == -16:
+                sound = pygame.mixer.Sound(buffer=synthesize(category, frequency, outputs).tobytes())
+            if sound is None:
+                logger.warning("No sound for %s", category)
+                continue
+            sound.set_volume(volume)
+            self.sounds[category] = sound
+        self.enabled = True
+        logger.info("Sounds loaded", extra={"fields": {"sounds": len(self.sounds), "channels": channels}})
+        return True
+
+    def play(self, category: str) -> bool:
+        """
+        Play a category's sound on a free channel or one stolen from an older voice.
+
+        Args:
+            category: Sound category, e.g. "hit"
+
+        Returns:
+            True if the sound started, False if it was dropped
+        """
+        sound = self.sounds.get(category) if self.enabled else None
+        if sound is None:
+            return False
+        now = pygame.time.get_ticks()
+        playing = 0
+        free = oldest = oldest_own = -1
+        for index, channel in enumerate(self._channels):
+            if not channel.get_busy():
+                if free < 0:
+                    free = index
+                continue
+            if self._owners[index] == category:
+                playing += 1
+                if oldest_own < 0 or self._started[index] < self._started[oldest_own]:
+                    oldest_own = index
+            if oldest < 0 or self._started[index] < self._started[oldest]:
+                oldest = index
+
+        if playing >= self.limits.get(category, len(self._channels)):
+            index = oldest_own
+        elif free >= 0:
+            index = free
+        else:
+            index = oldest
+        if index < 0 or index != free and now - self._started[index] < self.retrigger_ms:
+            return False
+        self._channels[index].play(sound)
+        self._owners[index] = category
+        self._started[index] = now
+        return True
+
+
+# Sound effects shared by the whole process
+audio = AudioSystem()
@@ -0,0 +1,303 @@
+"""
+Level balance simulator for the Escape-WE-Project game.
+Plays many seeded levels with a scripted player across a process pool and
+aggregates completion times, damage taken and failure rates.
+
+Usage:
+    python balance.py [--runs N] [--levels 1,2,3] [--workers N] [--seed S] [--json PATH]
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Tuple
+from config import (
+    SERVER_TICK_RATE, PLAYER_MAX_HEALTH, BALANCE_RUNS, BALANCE_TIME_LIMIT, BALANCE_BATCH_SIZE,
+    BALANCE_ARRIVE_DISTANCE, BALANCE_THREAT_DISTANCE
+)
+from simulation import Simulation, InputSnapshot, init_headless
+
+
+@dataclass
+class RunResult:
+    """
+    Outcome of one simulated level.
+
+    Attributes:
+        level: Level number
+        seed: Seed the level was built with
+        outcome: "completed", "died" or "timeout"
+        time: Simulated seconds until the outcome
+        damage: Health lost, counting each lost life as a full health bar
+        enemies_defeated: Enemies the player killed
+        key_droppers: Killed enemies that were flagged to drop a key
+    """
+
+    level: int
+    seed: int
+    outcome: str
+    time: float
+    damage: float
+    enemies_defeated: int
+    key_droppers: int
+
+
+class ScriptedPolicy:
+    """
+    A simple player that fetches the sword, then the key, then opens the door.
+
+    The policy walks straight towards its current goal and presses interact
+    once it is there, moving on without the sword if the chest does not open
+    within a second. An enemy closer than ``threat_distance`` is attacked if
+    the player has the sword and jumped over otherwise. It never waits or
+    retreats, so its results are a baseline for comparing levels rather than
+    the times a skilled player would reach.
+
+    Attributes:
+        arrive_distance: Horizontal distance at which a goal counts as reached
+        threat_distance: Horizontal distance at which an enemy is dealt with
+        skip_chest: Whether the policy gave up on the chest this level
+    """
+
+    def __init__(self, arrive_distance: int = BALANCE_ARRIVE_DISTANCE,
+                 threat_distance: int = BALANCE_THREAT_DISTANCE):
+        """
+        Initialize the policy.
+
+        Args:
+            arrive_distance: Horizontal distance at which a goal counts as reached
+            threat_distance: Horizontal distance at which an enemy is dealt with
+        """
+        self.arrive_distance = arrive_distance
+        self.threat_distance = threat_distance
+        self.skip_chest = False
+        self._waited = 0
+
+    def reset(self) -> None:
+        """Forget the previous level before playing a new one."""
+        self.skip_chest = False
+        self._waited = 0
+
+    def goal(self, simulation: Simulation) -> int:
+        """
+        Get the horizontal position the player is heading for.
+
+        Args:
+            simulation: Simulation being played
+
+        Returns:
+            Center of the chest, key or door in world coordinates
+        """
+        player = simulation.player
+        if simulation.weapon is None and not simulation.chest.opened and not self.skip_chest:
+            return simulation.chest.rect.centerx
+        if not player.has_key and not simulation.key.is_picked_up:
+            return simulation.key.rect.centerx
+        return simulation.door.rect.centerx
+
+    def act(self, simulation: Simulation) -> InputSnapshot:
+        """
+        Choose the input for the next tick.
+
+        Args:
+            simulation: Simulation being played
+
+        Returns:
+            Input for ``Simulation.step``
+        """
+        player = simulation.player
+        x = player.rect.centerx
+        distance = self.goal(simulation) - x
+        inputs = InputSnapshot(cursor_x=x + (1 if player.facing_right else -1), cursor_y=player.rect.centery)
+        if abs(distance) > self.arrive_distance:
+            inputs.right = distance > 0
+            inputs.left = distance < 0
+        else:
+            inputs.interact = True
+            if simulation.weapon is None and not self.skip_chest:
+                # Something nearer, like the door, can take the interaction
+                self._waited += 1
+                self.skip_chest = self._waited > simulation.tick_rate
+
+        threat = min(simulation.enemies.values(), default=None,
+                     key=lambda enemy: abs(enemy.rect.centerx - x))
+        if threat is not None and abs(threat.rect.centerx - x) < self.threat_distance:
+            if simulation.weapon:
+                inputs.attack = True
+                inputs.cursor_x, inputs.cursor_y = threat.rect.center
+            elif (threat.rect.centerx > x) == (distance > 0):
+                inputs.jump = True
+        return inputs
+
+
+def play(simulation: Simulation, level: int, seed: int, policy: ScriptedPolicy,
+         time_limit: float = BALANCE_TIME_LIMIT) -> RunResult:
+    """
+    Play one level from its start until it is completed, lost or timed out.
+
+    Args:
+        simulation: Simulation to play in; it is reset to the level's start
+        level: Level number
+        seed: Seed for everything the level leaves to chance
+        policy: Policy choosing the player's input
+        time_limit: Simulated seconds before the run counts as timed out
+
+    Returns:
+        Outcome of the run
+    """
+    simulation.start_level(level, seed)
+    policy.reset()
+    player = simulation.player
+    health = (player.lives - 1) * PLAYER_MAX_HEALTH + player.health
+    stream = simulation.stream
+    defeated = key_droppers = 0
+    outcome = "timeout"
+    for _ in range(int(time_limit * simulation.tick_rate)):
+        enemies = dict(simulation.enemies)
+        simulation.step(policy.act(simulation))
+        if simulation.level != level:
+            outcome = "completed"
+            break
+        if simulation.stream is not stream:
+            outcome = "died"
+            break
+        for enemy_id, enemy in enemies.items():
+            # Enemies that left the dict without leaving the stream were unloaded, not killed
+            if enemy_id not in simulation.enemies and enemy not in stream.enemies:
+                defeated += 1
+                key_droppers += enemy.drops_key
+    if outcome == "died":
+        damage = float(health)
+    else:
+        damage = health - ((player.lives - 1) * PLAYER_MAX_HEALTH + player.health)
+    return RunResult(level, seed, outcome, simulation.tick / simulation.tick_rate,
+                     damage, defeated, key_droppers)
+
+
+# Simulation of the current worker process, built once by ``_init_worker``
+_simulation: Optional[Simulation] = None
+
+
+def _init_worker(tick_rate: int) -> None:
+    """Build the worker's simulation; loading sprites and levels is done once per process."""
+    global _simulation
+    init_headless()
+    _simulation = Simulation(seed=0, tick_rate=tick_rate)
+
+
+def _play_batch(runs: List[Tuple[int, int]]) -> List[RunResult]:
+    """Play a batch of (level, seed) runs in the worker's simulation."""
+    policy = ScriptedPolicy()
+    return [play(_simulation, level, seed, policy) for level, seed in runs]
+
+
+def simulate(levels: List[int], runs: int, seed: int = 0, workers: Optional[int] = None,
+             tick_rate: int = SERVER_TICK_RATE,
+             batch_size: int = BALANCE_BATCH_SIZE) -> List[RunResult]:
+    """
+    Play ``runs`` seeded levels spread across a process pool.
+
+    Runs are sent to the workers in batches so the cost of passing them
+    between processes stays small next to the cost of playing them.
+
+    Args:
+        levels: Level numbers to play, in turn
+        runs: Total number of runs
+        seed: Seed the run seeds are drawn from
+        workers: Worker processes, one per core if None
+        tick_rate: Simulation ticks per simulated second
+        batch_size: Runs sent to a worker at a time
+
+    Returns:
+        Result of every run
+    """
+    seeds = random.Random(seed)
+    plan = [(levels[index % len(levels)], seeds.getrandbits(32)) for index in range(runs)]
+    batches = [plan[start:start + batch_size] for start in range(0, len(plan), batch_size)]
+    results: List[RunResult] = []
+    with ProcessPoolExecutor(workers or os.cpu_count(), initializer=_init_worker,
+                             initargs=(tick_rate,)) as executor:
+        for batch in executor.map(_play_batch, batches):
+            results.extend(batch)
+    return results
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    """Get a percentile of sorted values, 0 if there are none."""
+    return values[min(len(values) - 1, int(fraction * len(values)))] if values else 0.0
+
+
+def summarize(results: List[RunResult]) -> Dict[int, Dict[str, float]]:
+    """
+    Aggregate run results per level.
+
+    Args:
+        results: Run results
+
+    Returns:
+        Per level number: run count, completion, death and timeout rates,
+        completion time percentiles, damage mean and 90th percentile, and
+        mean enemies defeated
+    """
+    by_level: Dict[int, List[RunResult]] = {}
+    for result in results:
+        by_level.setdefault(result.level, []).append(result)
+    summary = {}
+    for level, runs in sorted(by_level.items()):
+        times = sorted(run.time for run in runs if run.outcome == "completed")
+        damage = sorted(run.damage for run in runs)
+        count = len(runs)
+        summary[level] = {
+            "runs": count,
+            "completed": len(times) / count,
+            "died": sum(run.outcome == "died" for run in runs) / count,
+            "timeout": sum(run.outcome == "timeout" for run in runs) / count,
+            "time_p50": _percentile(times, 0.50),
+            "time_p90": _percentile(times, 0.90),
+            "damage_mean": sum(damage) / count,
+            "damage_p90": _percentile(damage, 0.90),
+            "enemies_defeated": sum(run.enemies_defeated for run in runs) / count,
+        }
+    return summary
+
+
+def main() -> None:
+    """Run the balance simulation from the command line and print a table per level."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=BALANCE_RUNS, help="levels to play in total")
+    parser.add_argument("--levels", default=None,
+                        help="comma-separated level numbers to play (default: all)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per core)")
+    parser.add_argument("--seed", type=int, default=0, help="seed the run seeds are drawn from")
+    parser.add_argument("--tick-rate", type=int, default=SERVER_TICK_RATE,
+                        help="simulation ticks per simulated second")
+    parser.add_argument("--json", default=None, metavar="PATH", help="also write every run as JSON")
+    args = parser.parse_args()
+
+    if args.levels:
+        levels = [int(level) for level in args.levels.split(",")]
+    else:
+        from levels import load_levels
+        levels = list(range(1, load_levels().count + 1))
+
+    start = time.perf_counter()
+    results = simulate(levels, args.runs, args.seed, args.workers, args.tick_rate)
+    elapsed = time.perf_counter() - start
+    print(f"Played {len(results)} levels in {elapsed:.1f} s ({len(results) / elapsed:.0f} levels/s)\n")
+    print(f"{'level':>5} {'runs':>7} {'done':>6} {'died':>6} {'timeout':>7} {'time p50':>9} "
+          f"{'time p90':>9} {'damage':>7} {'dmg p90':>7} {'kills':>6}")
+    for level, stats in summarize(results).items():
+        print(f"{level:>5} {stats['runs']:>7} {stats['completed']:>6.1%} {stats['died']:>6.1%} "
+              f"{stats['timeout']:>7.1%} {stats['time_p50']:>8.1f}s {stats['time_p90']:>8.1f}s "
+              f"{stats['damage_mean']:>7.1f} {stats['damage_p90']:>7.1f} {stats['enemies_defeated']:>6.2f}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as output:
+            json.dump([asdict(result) for result in results], output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Asset blit benchmark for the Escape-WE-Project game.
+Compares blit times of every asset as plain ``convert_alpha`` surfaces
+against the format chosen by ``config.optimize_blit_format``.
+
+Usage:
+    python bench_assets.py [--blits N]
+"""
+
+import argparse
+import time
+import pygame
+from typing import Callable, Tuple
+from config import SCREEN_WIDTH, SCREEN_HEIGHT, ASSETS, optimize_blit_format
+
+
+def time_blits(target: pygame.Surface, image: pygame.Surface, blits: int) -> float:
+    """
+    Measure the average time of blitting an image.
+
+    Args:
+        target: Surface to blit onto
+        image: Surface to blit
+        blits: Number of blits to time
+
+    Returns:
+        Average time per blit in microseconds
+    """
+    positions = [((i * 37) % SCREEN_WIDTH, (i * 53) % SCREEN_HEIGHT) for i in range(64)]
+    blit: Callable = target.blit
+    start = time.perf_counter()
+    for i in range(blits):
+        blit(image, positions[i & 63])
+    return (time.perf_counter() - start) / blits * 1_000_000
+
+
+def benchmark_asset(target: pygame.Surface, path: str, blits: int) -> Tuple[str, float, float]:
+    """
+    Compare the blit time of an asset before and after format optimization.
+
+    Args:
+        target: Surface to blit onto
+        path: Asset path
+        blits: Number of blits to time per format
+
+    Returns:
+        Tuple of (chosen format, baseline microseconds, optimized microseconds)
+    """
+    baseline = pygame.image.load(path).convert_alpha()
+    optimized, blit_format = optimize_blit_format(baseline.copy())
+    # Warm up both surfaces (RLE encoding happens on the first blit)
+    target.blit(baseline, (0, 0))
+    target.blit(optimized, (0, 0))
+    return blit_format, time_blits(target, baseline, blits), time_blits(target, optimized, blits)
+
+
+def main() -> None:
+    """Run the benchmark for every asset and print a table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--blits", type=int, default=500, help="blits timed per asset and format")
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+    print(f"{'asset':<20} {'size':>10} {'format':>9} {'alpha us':>10} {'best us':>10} {'speedup':>8}")
+    for name, path in ASSETS.items():
+        blit_format, before, after = benchmark_asset(screen, path, args.blits)
+        size = "x".join(map(str, pygame.image.load(path).get_size()))
+        print(f"{name:<20} {size:>10} {blit_format:>9} {before:>10.1f} {after:>10.1f} "
+              f"{before / after:>7.2f}x")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""
+Gameplay video capture for the Escape-WE-Project game.
+Copies presented frames into a preallocated ring and writes them out from a background thread.
+"""
+
+import logging
+import math
+import os
+import queue
+import subprocess
+import threading
+import time
+from typing import List, Optional
+import pygame
+from config import (
+    FPS, CAPTURE_RING_SIZE, CAPTURE_DIR, CAPTURE_BUDGET_MS, CAPTURE_ENCODER_COMMAND
+)
+
+logger = logging.getLogger(__name__)
+
+CAPTURE_MODES = ("raw", "png", "pipe")
+
+
+class FrameCapture:
+    """
+    Records presented frames without encoding on the game thread.
+
+    ``capture`` only blits the display into the next free surface of a
+    preallocated ring and hands its index to a worker thread, which writes
+    raw RGB, PNG files or pipes raw frames to an encoder process. If the
+    worker falls behind and the ring is full, frames are skipped. If the
+    copy itself gets expensive, only every n-th frame is copied so that the
+    average cost per presented frame stays under ``budget_ms``.
+
+    Attributes:
+        mode: Output mode (raw, png or pipe)
+        output_dir: Directory the recording is written to
+        captured: Frames handed to the worker
+        skipped: Frames dropped because the ring was full or over budget
+        written: Frames written by the worker
+    """
+
+    def __init__(self, size: tuple, mode: str = "png", output_dir: str = CAPTURE_DIR,
+                 ring_size: int = CAPTURE_RING_SIZE, budget_ms: float = CAPTURE_BUDGET_MS,
+                 fps: int = FPS):
+        """
+        Initialize the capture without starting it.
+
+        Args:
+            size: Frame size (width, height)
+            mode: Output mode (raw, png or pipe)
+            output_dir: Directory the recording is written to
+            ring_size: Number of frame buffers allocated when capturing starts
+            budget_ms: Average copy cost allowed per presented frame
+            fps: Frame rate written into encoder metadata
+
+        Raises:
+            ValueError: If the mode is unknown
+        """
+        if mode not in CAPTURE_MODES:
+            raise ValueError(f"Unknown capture mode: {mode}")
+        self.size = size
+        self.mode = mode
+        self.output_dir = output_dir
+        self.budget = budget_ms / 1000
+        self.fps = fps
+        self.active = False
+        self.captured = 0
+        self.skipped = 0
+        self.written = 0
+
+        # Buffers are allocated when capturing first starts, so a game that
+        # never records does not hold them
+        self._ring_size = max(2, ring_size)
+        self._ring: List[pygame.Surface] = []
+        self._free: List[bool] = []
+        self._write_index = 0
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._worker: Optional[threading.Thread] = None
+        self._encoder: Optional[subprocess.Popen] = None
+        self._raw_file = None
+        self._session = ""
+        self._copy_cost = 0.0
+        self._frame_counter = 0
+        self._interval = 1
+
+    def start(self) -> bool:
+        """
+        Open the output and start the worker thread.
+
+        Returns:
+            True if capturing started
+        """
+        if self.active:
+            return True
+        # Release the output of a session the worker ended after a write error
+        self.stop()
+        self._session = time.strftime("capture_%Y%m%d_%H%M%S")
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            width, height = self.size
+            if self.mode == "raw":
+                path = os.path.join(self.output_dir, f"{self._session}_{width}x{height}_rgb24.raw")
+                self._raw_file = open(path, "wb")
+            elif self.mode == "pipe":
+                path = os.path.join(self.output_dir, f"{self._session}.mp4")
+                command = [part.format(width=width, height=height, fps=self.fps, path=path)
+                           for part in CAPTURE_ENCODER_COMMAND]
+                self._encoder = subprocess.Popen(command, stdin=subprocess.PIPE,
+                                                 stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            else:
+                path = os.path.join(self.output_dir, self._session)
+                os.makedirs(path, exist_ok=True)
+        except OSError as e:
+            logger.error("Error starting %s capture: %s", self.mode, e)
+            return False
+
+        if not self._ring:
+            # Display-format buffers make the per-frame copy a plain memory blit
+            self._ring = [pygame.Surface(self.size).convert() for _ in range(self._ring_size)]
+            self._free = [True] * self._ring_size
+        self.active = True
+        self._worker = threading.Thread(target=self._run_worker, name="frame-capture", daemon=True)
+        self._worker.start()
+        logger.info("Capturing %s frames to %s", self.mode, path)
+        return True
+
+    def stop(self) -> None:
+        """Write out the queued frames, close the output and stop the worker."""
+        if self._worker is None:
+            return
+        self.active = False
+        self._queue.put(None)
+        self._worker.join()
+        self._worker = None
+        # A worker that stopped on an error leaves frames and the sentinel queued
+        self._queue = queue.SimpleQueue()
+        self._free = [True] * len(self._ring)
+        if self._raw_file:
+            self._raw_file.close()
+            self._raw_file = None
+        if self._encoder:
+            try:
+                self._encoder.stdin.close()
+            except OSError as e:
+                logger.warning("Encoder exited early: %s", e)
+            self._encoder.wait()
+            self._encoder = None
+        logger.info("Capture stopped", extra={"fields": {
+            "captured": self.captured, "written": self.written, "skipped": self.skipped
+        }})
+
+    def toggle(self) -> None:
+        """Start capturing if stopped, otherwise stop."""
+        if self.active:
+            self.stop()
+        else:
+            self.start()
+
+    def capture(self, screen: pygame.Surface) -> bool:
+        """
+        Copy a presented frame into the ring.
+
+        Args:
+            screen: Display surface after ``display.flip``
+
+        Returns:
+            True if the frame was queued for writing
+        """
+        if not self.active:
+            return False
+        self._frame_counter += 1
+        if self._frame_counter % self._interval:
+            self.skipped += 1
+            return False
+        index = self._write_index
+        if not self._free[index]:
+            # The worker is behind: drop this frame rather than wait
+            self.skipped += 1
+            return False
+
+        start = time.perf_counter()
+        self._ring[index].blit(screen, (0, 0))
+        cost = time.perf_counter() - start
+
+        self._free[index] = False
+        self._write_index = (index + 1) % len(self._ring)
+        self._queue.put(index)
+        self.captured += 1
+
+        # Copy only every n-th frame when a single copy exceeds the budget
+        self._copy_cost += (cost - self._copy_cost) * 0.1
+        self._interval = max(1, math.ceil(self._copy_cost / self.budget))
+        return True
+
+    def _run_worker(self) -> None:
+        """Write queued frames until stopped or an output error ends the capture."""
+        while True:
+            index = self._queue.get()
+            if index is None:
+                return
+            try:
+                self._write(self._ring[index])
+                self.written += 1
+            except (OSError, pygame.error) as e:
+                # A full disk or a dead encoder fails every later frame too
+                logger.error("Error writing captured frame, stopping capture: %s", e)
+                self.active = False
+                return
+            finally:
+                self._free[index] = True
+
+    def _write(self, frame: pygame.Surface) -> None:
+        """Write one frame to the active output."""
+        if self.mode == "png":
+            path = os.path.join(self.output_dir, self._session, f"frame_{self.written:06d}.png")
+            pygame.image.save(frame, path)
+        elif self.mode == "raw":
+            self._raw_file.write(pygame.image.tobytes(frame, "RGB"))
+        else:
+            self._encoder.stdin.write(pygame.image.tobytes(frame, "RGB"))
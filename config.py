@@ -3,13 +3,18 @@ Configuration file for the Escape-WE-Project game.
 Contains all constants and settings used throughout the game.
 """
 
+import logging
 import pygame
-from typing import Tuple
+from typing import Dict, Tuple
+
+logger = logging.getLogger(__name__)
 
 # Display settings
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
 FPS = 60
+MAX_FRAME_DELTA = 0.1  # Longest frame time simulated in one step, in seconds
+BENCHMARK_SECONDS = 10.0  # Default length of an uncapped benchmark run
 
 # Colors
 WHITE = (255, 255, 255)
@@ -20,24 +25,49 @@ BLUE = (0, 128, 255)
 YELLOW = (255, 255, 0)
 CYAN = (0, 255, 255)
 
+# Physics settings
+GROUND_Y = SCREEN_HEIGHT  # Top of the ground every object stands on
+CEILING_Y = 0
+ITEM_REST_OFFSET = 50  # Keys and dropped items lie this far above the ground
+
+# Tile platform settings
+TILE_SIZE = 40
+TILE_CHUNK_WIDTH = SCREEN_WIDTH  # Width of each cached tilemap surface
+PLATFORM_SPACING = 400  # One low platform per this many pixels of level
+PLATFORM_ROWS = (11, 8)  # Tile rows of low and high platforms, both within jump height
+TILE_COLOR = (120, 84, 50)
+TILE_EDGE_COLOR = (70, 48, 28)
+
 # Player settings
 PLAYER_SIZE = 50
-PLAYER_SPEED = 5
-GRAVITY = 0.5
-JUMP_VELOCITY = -15
+# Speeds are in pixels per second, accelerations in pixels per second squared
+PLAYER_SPEED = 300
+GRAVITY = 1800
+JUMP_VELOCITY = -900
 PLAYER_LIVES = 3
 PLAYER_MAX_HEALTH = 100
+PLAYER_INVULNERABILITY = 0.5  # Seconds after a hit during which the player takes no damage
 
 # Enemy settings
 ENEMY_SIZE = 100
-ENEMY_SPEED = 1
-ENEMY_MOVE_DURATION = 60
+ENEMY_SPEED = 60
+ENEMY_MOVE_DURATION = 1.0  # Seconds an enemy keeps walking in one direction
+ENEMY_CHASE_RANGE = 400  # Enemies chase a player this many pixels of walking away
+ENEMY_FALL_SPEED = 480  # Speed of an enemy dropping after walking off a platform
+ENEMY_CONTACT_DAMAGE = 15  # Damage of a hit from touching an enemy
+
+# Simulation level-of-detail settings
+LOD_NEAR_MARGIN = SCREEN_WIDTH // 2
+LOD_FAR_INTERVAL = 8
 
 # Item settings
 ITEM_SIZE = (50, 50)
 WEAPON_SIZE = (75, 75)
 KEY_SIZE = (50, 50)
-ITEM_GRAVITY = 0.8
+ITEM_GRAVITY = 2880
+WEAPON_ATTACK_SPEED = 12.0  # Attack swings completed per second
+WEAPON_SWING_ARC = 45  # Degrees a weapon sweeps through during an attack
+WEAPON_MASK_STEP = 5  # Degrees between the cached blade masks a swing is tested with
 
 # Chest settings
 CHEST_SIZE = (100, 80)
@@ -56,11 +86,101 @@ INVENTORY_MAX_SLOTS = 3
 
 # Game settings
 MAX_BACKGROUND_DUPLICATES = 4
-SCROLL_SPEED = 5
-NORMAL_SPEED = 5
-BORDER_TRANSITION_SPEED = 2
+SCROLL_SPEED = 300  # Pixels per second
+NORMAL_SPEED = 300  # Pixels per second
+BORDER_TRANSITION_SPEED = 120  # Pixels per second
 TRANSITION_DISTANCE = 100
-TOTAL_LEVELS = 10
+
+# Render scaling settings
+RENDER_SCALE = 1.0
+RENDER_SCALE_MIN = 0.5
+RENDER_SCALE_STEP = 0.125
+RENDER_BUDGET_HIGH = 0.9  # Drop scale above this fraction of the frame budget
+RENDER_BUDGET_LOW = 0.6  # Raise scale below this fraction of the frame budget
+RENDER_SCALE_COOLDOWN = 30  # Frames to wait between scale changes
+
+# Level data settings
+LEVEL_SOURCE_PATH = 'levels.json'
+LEVEL_DATA_PATH = 'levels.bin'
+LEVEL_CHUNK_WIDTH = SCREEN_WIDTH  # Levels are stored and streamed in chunks this wide
+STREAM_RADIUS = 1  # Chunks kept loaded on each side of the visible ones
+
+# Quality settings
+QUALITY_CONFIG_PATH = 'quality.json'
+QUALITY_CYCLE_KEY = pygame.K_F5
+
+# Logging settings
+LOG_LEVEL = 'INFO'
+LOG_QUEUE_SIZE = 1024
+LOG_FORMAT = '%(asctime)s %(levelname)s %(name)s: %(message)s'
+
+# Simulation server settings
+SERVER_HOST = '127.0.0.1'
+SERVER_PORT = 5555
+SERVER_TICK_RATE = 30
+INTERPOLATION_DELAY_TICKS = 2
+SERVER_MAX_OUTGOING_BYTES = 256 * 1024  # Queued snapshot bytes before a client is resynced
+MAX_MESSAGE_BYTES = 1024 * 1024  # Largest framed message either side accepts
+LEVEL_WIDTH = SCREEN_WIDTH * 3
+
+# Capture settings
+CAPTURE_DIR = 'captures'
+CAPTURE_RING_SIZE = 8
+CAPTURE_BUDGET_MS = 1.0
+CAPTURE_TOGGLE_KEY = pygame.K_F10
+CAPTURE_ENCODER_COMMAND = [
+    'ffmpeg', '-loglevel', 'error', '-y', '-f', 'rawvideo', '-pix_fmt', 'rgb24',
+    '-s', '{width}x{height}', '-r', '{fps}', '-i', '-',
+    '-c:v', 'libx264', '-preset', 'ultrafast', '-pix_fmt', 'yuv420p', '{path}'
+]
+
+# Tracing settings
+TRACE_BUFFER_SIZE = 200_000
+TRACE_OUTPUT_PATH = 'trace.json'
+TRACE_FLUSH_KEY = pygame.K_F9
+
+# Metrics settings
+METRICS_HOST = '127.0.0.1'
+METRICS_PORT = 9464
+METRICS_FRAME_BUCKETS = (0.005, 0.010, 0.0167, 0.025, 0.0333, 0.050, 0.100, 0.250)
+METRICS_LATENCY_BUCKETS = (0.005, 0.010, 0.020, 0.030, 0.050, 0.075, 0.100, 0.200)
+
+# Input latency settings
+LATENCY_SAMPLE_SIZE = 1000  # Recent measurements kept for percentiles
+LATE_LATCH_MARGIN_MS = 1.0  # Time kept free before each presentation deadline
+LATE_LATCH_SPIN_MS = 1.0  # End of the wait spent polling the clock instead of sleeping
+
+# Animation settings
+# Frames, frames per second and looping of each animation clip
+ANIMATION_CLIPS = {
+    'still': (1, 1.0, True),
+    'idle': (4, 4.0, True),
+    'walk': (6, 10.0, True),
+    'attack': (3, WEAPON_ATTACK_SPEED * 3, False)  # One pass per weapon swing
+}
+ATLAS_MAX_WIDTH = 2048  # Frames that do not fit in a row start a new one
+
+# Audio settings
+AUDIO_FREQUENCY = 22050  # Mixer sample rate in Hz
+AUDIO_BUFFER = 512  # Mixer buffer in samples; smaller plays sooner after a trigger
+AUDIO_CHANNELS = 16  # Mixer channels in the voice pool
+AUDIO_VOLUME = 0.6
+# Voices each sound category may play at once
+AUDIO_CATEGORY_LIMITS = {'hit': 4, 'pickup': 2, 'door': 1, 'chest': 1, 'damage': 2}
+AUDIO_RETRIGGER_MS = 30  # Voices younger than this are not stolen for the same category
+
+# Balance simulation settings
+BALANCE_RUNS = 1000  # Levels played by default
+BALANCE_TIME_LIMIT = 120.0  # Simulated seconds before a run counts as timed out
+BALANCE_BATCH_SIZE = 50  # Runs sent to a worker process at a time
+BALANCE_ARRIVE_DISTANCE = 20  # Horizontal distance at which the scripted player reaches a goal
+BALANCE_THREAT_DISTANCE = 120  # Horizontal distance at which the scripted player deals with an enemy
+
+# Stress test settings
+STRESS_COUNTS = (10, 100, 1000, 10000)  # Entities of each kind per scenario
+STRESS_FRAMES = 300  # Frames run per scenario
+STRESS_SUPERLINEAR_FACTOR = 2.0  # Cost growth beyond the entity growth that counts as not scaling
+STRESS_NOISE_FLOOR_MS = 0.05  # Subsystem costs per frame too small to judge
 
 # Asset paths
 ASSETS = {
@@ -77,10 +197,97 @@ ASSETS = {
     'menu': 'menu.jpg'
 }
 
+# Sound files by category; a missing file is replaced by a synthesized sound
+SOUNDS = {
+    'hit': 'hit.wav',
+    'pickup': 'pickup.wav',
+    'door': 'door.wav',
+    'chest': 'chest.wav',
+    'damage': 'damage.wav'
+}
+
+# Color used as transparent key for images whose alpha is only fully on or off
+COLORKEY = (255, 0, 255)
+
+
+def classify_alpha(image: pygame.Surface) -> str:
+    """
+    Work out the fastest blit format an image's alpha channel allows.
+    
+    Args:
+        image: Image converted with ``convert_alpha``
+        
+    Returns:
+        "opaque" if every pixel is fully opaque, "colorkey" if every pixel is
+        either fully opaque or fully transparent, otherwise "alpha"
+    """
+    width, height = image.get_size()
+    opaque = pygame.mask.from_surface(image, 254).count()
+    if opaque == width * height:
+        return "opaque"
+    visible = pygame.mask.from_surface(image, 0).count()
+    uses_key_color = pygame.mask.from_threshold(
+        image, COLORKEY + (255,), (1, 1, 1, 1)
+    ).count()
+    if visible == opaque and not uses_key_color:
+        return "colorkey"
+    return "alpha"
+
+
+def convert_to_format(image: pygame.Surface, blit_format: str) -> pygame.Surface:
+    """
+    Convert an image to the given blit format.
+    
+    Args:
+        image: Image converted with ``convert_alpha``
+        blit_format: Format name returned by ``classify_alpha``
+        
+    Returns:
+        Converted surface
+    """
+    if blit_format == "opaque":
+        return image.convert()
+    if blit_format == "colorkey":
+        keyed = pygame.Surface(image.get_size()).convert()
+        keyed.fill(COLORKEY)
+        keyed.blit(image, (0, 0))
+        keyed.set_colorkey(COLORKEY, pygame.RLEACCEL)
+        return keyed
+    return image
+
+
+def optimize_blit_format(image: pygame.Surface) -> Tuple[pygame.Surface, str]:
+    """
+    Convert an image to the fastest blit format its alpha channel allows.
+    
+    Fully opaque images become plain display-format surfaces, images whose
+    pixels are either fully opaque or fully transparent become RLE
+    accelerated colorkey surfaces, and anything with partial transparency
+    keeps per-pixel alpha.
+    
+    Args:
+        image: Image converted with ``convert_alpha``
+        
+    Returns:
+        Tuple of (converted surface, chosen format name)
+    """
+    blit_format = classify_alpha(image)
+    return convert_to_format(image, blit_format), blit_format
+
+
+# Loaded images by (path, size); surfaces are shared, so callers must copy before modifying
+_image_cache: Dict[Tuple[str, Tuple[int, int] | None], pygame.Surface] = {}
+IMAGE_CACHE_STATS = {'hits': 0, 'misses': 0}
+
+
 def load_image(path: str, size: Tuple[int, int] | None = None) -> pygame.Surface:
     """
     Load and optionally scale an image.
     
+    Images are cached by path and size, so repeated loads (e.g. every
+    enemy or chest of a new level) return the already decoded surface,
+    and are stored in the fastest blit format their alpha channel allows.
+    
     Args:
         path: Path to the image file
         size: Optional tuple of (width, height) to scale the image
@@ -88,14 +295,37 @@ def load_image(path: str, size: Tuple[int, int] | None = None) -> pygame.Surface
     Returns:
         Loaded pygame Surface
     """
+    from tracing import tracer  # Import here to avoid circular imports
+    from quality import get_profile
+    cache_key = (path, tuple(size) if size else None)
+    cached = _image_cache.get(cache_key)
+    if cached is not None:
+        IMAGE_CACHE_STATS['hits'] += 1
+        return cached
+    IMAGE_CACHE_STATS['misses'] += 1
     try:
-        image = pygame.image.load(path).convert_alpha()
-        if size:
-            image = pygame.transform.scale(image, size)
+        with tracer.span(f"load_image {path}", "asset"):
+            image = pygame.image.load(path).convert_alpha()
+            # Classify before scaling: smoothscale blends edge alpha, which
+            # would otherwise hide that an image is opaque or keyed
+            blit_format = classify_alpha(image)
+            if size:
+                if get_profile().smooth_scaling and blit_format != "colorkey":
+                    image = pygame.transform.smoothscale(image, size)
+                else:
+                    image = pygame.transform.scale(image, size)
+            image = convert_to_format(image, blit_format)
+        logger.debug("Loaded %s %s as %s", path, image.get_size(), blit_format)
+        _image_cache[cache_key] = image
         return image
     except pygame.error as e:
-        print(f"Error loading image {path}: {e}")
+        logger.error("Error loading image %s: %s", path, e)
         # Return a colored surface as fallback
         fallback = pygame.Surface((50, 50))
         fallback.fill(RED)
-        return fallback 
\ No newline at end of file
+        return fallback
+
+
+def clear_image_cache() -> None:
+    """Drop all cached images so the next loads read them from disk again."""
+    _image_cache.clear()
@@ -0,0 +1,105 @@
+"""
+Contact tracking for the Escape-WE-Project game.
+Turns overlaps between the player and the level's objects into enter, stay and exit events.
+"""
+
+from typing import Any, Callable, Dict, Optional, Sequence
+import pygame
+
+# Callbacks receive the touched object; ``stay`` also gets the seconds it has been touched
+EnterCallback = Callable[[Any], None]
+StayCallback = Callable[[Any, float], None]
+ExitCallback = Callable[[Any], None]
+
+
+class ContactManager:
+    """
+    Overlaps of one body with groups of objects, kept from frame to frame.
+
+    Each ``update`` finds the objects of a group whose ``rect`` overlaps the
+    body in a single ``Rect.collidelistall`` call and compares them with the
+    group's contacts of the previous update. A new overlap fires the group's
+    ``enter`` callback, an overlap that continues fires ``stay`` with the
+    time spent in contact, and an overlap that ended, or whose object left
+    the group, fires ``exit``. Game rules then react to contacts changing
+    instead of testing every object against the player every frame.
+
+    Callbacks run after the whole group was tested, so they may remove
+    objects from the group's list.
+    """
+
+    def __init__(self):
+        """Initialize without listeners or contacts."""
+        self._listeners: Dict[str, tuple] = {}
+        self._active: Dict[str, Dict[Any, float]] = {}
+
+    def listen(self, group: str, enter: Optional[EnterCallback] = None,
+               stay: Optional[StayCallback] = None, exit: Optional[ExitCallback] = None) -> None:
+        """
+        Set the callbacks of a group.
+
+        Args:
+            group: Group name, e.g. "enemy"
+            enter: Called when an object starts touching the body
+            stay: Called on every later update while it still touches
+            exit: Called when it stops touching or leaves the group
+        """
+        self._listeners[group] = (enter, stay, exit)
+
+    def update(self, rect: pygame.Rect, groups: Dict[str, Sequence[Any]], dt: float) -> None:
+        """
+        Test the body against the groups and fire the contact callbacks.
+
+        Args:
+            rect: Body's rectangle
+            groups: Objects with a ``rect`` by group name
+            dt: Seconds since the previous update
+        """
+        for group, objects in groups.items():
+            enter, stay, exit = self._listeners.get(group, (None, None, None))
+            previous = self._active.get(group, {})
+            current = {}
+            for index in rect.collidelistall([obj.rect for obj in objects]):
+                obj = objects[index]
+                current[obj] = previous[obj] + dt if obj in previous else 0.0
+            self._active[group] = current
+
+            for obj, duration in list(current.items()):
+                if obj not in previous:
+                    if enter:
+                        enter(obj)
+                elif stay:
+                    stay(obj, duration)
+            if exit:
+                for obj in previous:
+                    if obj not in current:
+                        exit(obj)
+
+    def touching(self, group: str, obj: Any) -> bool:
+        """
+        Check whether an object touched the body at the last update.
+
+        Args:
+            group: Group the object is in
+            obj: Object to check
+
+        Returns:
+            True if the object is in contact
+        """
+        return obj in self._active.get(group, ())
+
+    def assume(self, group: str, obj: Any) -> None:
+        """
+        Treat an object as already touching, so it fires no ``enter`` until
+        it has stopped touching the body once, e.g. an item dropped at the
+        player's feet.
+
+        Args:
+            group: Group the object is in
+            obj: Object to mark
+        """
+        self._active.setdefault(group, {})[obj] = 0.0
+
+    def clear(self) -> None:
+        """Forget all contacts without firing ``exit``, e.g. when a level is rebuilt."""
+        self._active.clear()
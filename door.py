@@ -3,12 +3,18 @@ Door class for the Escape-WE-Project game.
 Handles door interactions and level progression.
 """
 
+import logging
 import pygame
 import random
-from typing import Tuple
+from typing import Optional, Tuple
 from config import (
-    SCREEN_HEIGHT, DOOR_SIZE, load_image, ASSETS
+    DOOR_SIZE, ASSETS
 )
+from animation import Animator, load_atlas
+from physics import ground_top
+from audio import audio
+
+logger = logging.getLogger(__name__)
 
 
 class Door:
@@ -22,29 +28,39 @@ class Door:
         total_width: Total width of the scrollable area
     """
     
-    def __init__(self, size: Tuple[int, int], total_width: int):
+    def __init__(self, size: Tuple[int, int], total_width: int, x: Optional[int] = None):
         """
         Initialize a door.
         
         Args:
             size: Door size (width, height)
             total_width: Total width of the scrollable area
+            x: Horizontal position in the level (random if None)
         """
         self.size = size
         self.total_width = total_width
         self.is_open = False
 
         # Load door sprite
-        self.image = load_image(ASSETS['door'], size)
+        self.load_sprites()
         self.rect = self.image.get_rect()
 
         # Randomize position
-        self._randomize_position()
+        if x is None:
+            self._randomize_position()
+        else:
+            self.rect.topleft = (x, ground_top(self.size[1]))
+
+    def load_sprites(self) -> None:
+        """Load the door sprite."""
+        self.animator = Animator(load_atlas({'door': (ASSETS['door'], self.size)}, ('still',)),
+                                 'door', 'still')
+        self.image = self.animator.frame()
 
     def _randomize_position(self) -> None:
         """Set door to a random position within the level."""
         x = random.randint(0, self.total_width - self.size[0])
-        y = SCREEN_HEIGHT - self.size[1]
+        y = ground_top(self.size[1])
         self.rect.topleft = (x, y)
 
     def draw(self, screen: pygame.Surface, scroll_offset: int) -> None:
@@ -61,7 +77,7 @@ class Door:
             
             # Only draw if door is visible on screen
             if adjusted_rect.right >= 0 and adjusted_rect.left <= screen.get_width():
-                screen.blit(self.image, adjusted_rect.topleft)
+                self.animator.draw(screen, adjusted_rect.topleft)
 
     def is_near(self, player, scroll_offset: int) -> bool:
         """
@@ -86,11 +102,12 @@ class Door:
             player: Player instance
         """
         if player.has_key:
-            print(f"{player.name} uses the key to open the door and proceeds to the next level!")
+            logger.info("%s uses the key to open the door and proceeds to the next level!", player.name)
             self.is_open = True
             player.has_key = False  # Remove key after use
+            audio.play('door')
         else:
-            print("You need a key to open this door!")
+            logger.info("You need a key to open this door!")
 
     def reset(self) -> None:
         """Reset the door to closed state and randomize position."""
@@ -3,74 +3,216 @@ Main game file for the Escape-WE-Project game.
 Handles the main game loop, rendering, and state management.
 """
 
+import argparse
+import logging
 import pygame
 import sys
 import time
-import random
 from typing import List, Dict, Any
 from config import (
-    SCREEN_WIDTH, SCREEN_HEIGHT, FPS, WHITE, BLACK, RED,
-    BUTTON_WIDTH, BUTTON_HEIGHT, BUTTON_TEXT_SIZE, TOTAL_LEVELS,
-    MAX_BACKGROUND_DUPLICATES, NORMAL_SPEED, load_image, ASSETS, DOOR_SIZE
+    SCREEN_WIDTH, SCREEN_HEIGHT, WHITE, BLACK, RED,
+    BUTTON_WIDTH, BUTTON_HEIGHT, BUTTON_TEXT_SIZE,
+    NORMAL_SPEED, TRACE_FLUSH_KEY, METRICS_PORT, QUALITY_CYCLE_KEY, LOG_LEVEL,
+    CAPTURE_TOGGLE_KEY, MAX_FRAME_DELTA, BENCHMARK_SECONDS, ENEMY_CONTACT_DAMAGE,
+    AUDIO_FREQUENCY, AUDIO_BUFFER,
+    load_image, clear_image_cache, ASSETS
 )
+from animation import clear_atlas_cache
 from player import Player
 from enemy import Enemy
-from item import spawn_key
 from chest import Chest, handle_click
 from door import Door
 from inventory import Inventory
+from lod import EnemyLODScheduler
+from physics import PhysicsWorld
+from tilemap import TileMap
+from levels import load_levels
+from scenes import SceneManager, MenuScene, LevelScene, WinScene
+from tracing import tracer
+from metrics import metrics, MetricsExporter
+from resolution import RenderTarget
+from quality import QualityProfile, set_profile, next_profile_name
+from logs import setup_logging, shutdown_logging
+from capture import FrameCapture, CAPTURE_MODES
+from latency import InputLatencyTracker, LateLatchPacer
+from inputs import InputSource, PygameInput
+from contacts import ContactManager
+from weapons import SwingHitDetector
+from audio import audio
+from pipeline import FrameRecorder, Frame, RenderThread, draw_frame
+
+logger = logging.getLogger(__name__)
 
 
 class Game:
     """
     Main game class that manages the game state and loop.
     
+    Several games can run side by side in one process when each is given
+    its own screen and input source; ``step`` then advances one of them by
+    a frame. Sprites are loaded once per process and shared between them.
+
     Attributes:
-        screen: Pygame display surface
+        screen: Surface the game draws to
+        input: Input source the game reads events, keys and the mouse from
+        owns_display: Whether the game opened the window and presents its frames
         clock: Pygame clock for FPS control
-        current_screen: Current game screen (menu, game, win)
+        scenes: Scene manager driving the menu, level and win screens
+        current_screen: Name of the active scene (menu, game, win)
         current_level: Current level number
+        levels: Compiled level library the levels are built from
         player: Player instance
+        physics: Physics world stepping the player, key and dropped items
+        contacts: Player's contacts with enemies, dropped items and the key
+        swing: Hit detection along the equipped weapon's swing
         player_inventory: Player's inventory
+        render_target: Render target the game world is drawn to
+        quality: Active quality profile
+        capture: Gameplay recorder, toggled with CAPTURE_TOGGLE_KEY
+        input_latency: Input-to-flip latency measurements
+        pacer: Late-latching frame pacer, None when the loop sleeps after rendering
+        renderer: Render thread drawing the previous frame while ``run`` simulates
+            the next, None when frames are drawn by ``step``
+        target_fps: Frame rate the game loop is capped at
+        uncapped: Run frames as fast as possible instead of at target_fps
+        dt: Seconds the current frame advances the game by
         backgrounds: List of background rectangles for scrolling
         dropped_items: List of items dropped in the world
         placing_item: Item being placed in inventory
     """
     
-    def __init__(self):
-        """Initialize the game."""
-        pygame.init()
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        pygame.display.set_caption('Escape')
+    def __init__(self, quality: str | None = None, render_scale: float | None = None,
+                 dynamic_resolution: bool = False, capture_mode: str = "png",
+                 late_latch: bool = False, screen: pygame.Surface | None = None,
+                 input_source: InputSource | None = None, pipelined: bool = False):
+        """
+        Initialize the game.
+        
+        Args:
+            quality: Quality profile name (defaults to the config file's default)
+            render_scale: Internal resolution of the game world relative to the window,
+                overriding the quality profile's
+            dynamic_resolution: Lower the render scale automatically when over the frame budget
+            capture_mode: Output mode of the gameplay recorder (raw, png or pipe)
+            late_latch: Sleep before polling input instead of after rendering
+            screen: SCREEN_WIDTH x SCREEN_HEIGHT surface to draw to instead of
+                opening the window; pygame and a display mode must already be
+                set up, e.g. with ``simulation.init_headless``
+            input_source: Where to read input from (defaults to pygame's keyboard and mouse)
+            pipelined: Let ``run`` draw each frame on a render thread while it
+                simulates the next one
+        """
+        self.owns_display = screen is None
+        if self.owns_display:
+            pygame.mixer.pre_init(AUDIO_FREQUENCY, -16, 2, AUDIO_BUFFER)
+            pygame.init()
+            screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+            pygame.display.set_caption('Escape')
+        self.screen = screen
+        self.input = input_source or PygameInput()
+        self.quality: QualityProfile = set_profile(quality)
+        self.target_fps = self.quality.target_fps
+        self.render_target = RenderTarget(
+            self.quality.render_scale if render_scale is None else render_scale,
+            dynamic_resolution, 1 / self.target_fps
+        )
+        self.capture = FrameCapture(self.screen.get_size(), capture_mode, fps=self.target_fps)
+        self.input_latency = InputLatencyTracker()
+        if pipelined and late_latch:
+            # Pipelining shows each frame a frame later, undoing the latency late latching saves
+            logger.warning("Late latching is not used with pipelined rendering")
+            late_latch = False
+        self.pacer = LateLatchPacer(self.target_fps) if late_latch else None
+        self.renderer = RenderThread(self.screen, self._draw_frame, self._present) if pipelined else None
         
         # Game state
         self.clock = pygame.time.Clock()
-        self.current_screen = "menu"
+        self.uncapped = False
+        self.dt = 1 / self.target_fps
+        self._move_carry = 0.0
+        self._frame_times: List[float] | None = None
         self.current_level = 1
+        self.levels = load_levels()
+        self.running = True
         
         # Load assets
         self._load_assets()
+        audio.load()
         
         # Initialize game objects
-        self.player = Player("Hero", (100, SCREEN_HEIGHT - 250), 50)
+        self.physics = PhysicsWorld()
+        self.player = Player("Hero", (100, SCREEN_HEIGHT - 250), 50, self.physics)
         self.player_inventory = Inventory()
         self.dropped_items = []
+        self.contacts = ContactManager()
+        self.contacts.listen("enemy", enter=self._on_enemy_contact, stay=self._on_enemy_contact)
+        self.contacts.listen("item", enter=self._on_item_contact)
+        self.swing = SwingHitDetector()
+        self.enemy_lod = EnemyLODScheduler(far_interval=self.quality.lod_far_interval)
         self.placing_item: dict[str, Any] = {"item": None, "display_text": None, "display_rect": None}
         
         # Background scrolling
-        self.backgrounds = [
-            pygame.Rect(x * SCREEN_WIDTH, 0, SCREEN_WIDTH, SCREEN_HEIGHT) 
-            for x in range(MAX_BACKGROUND_DUPLICATES)
-        ]
+        self.backgrounds: List[pygame.Rect] = []
+        self._build_backgrounds(self.quality.background_layers)
         
         # UI elements
         self._setup_ui()
         
         # Hide system cursor and create custom cursor
-        pygame.mouse.set_visible(False)
+        if self.owns_display:
+            pygame.mouse.set_visible(False)
         self.cursor_surface = pygame.Surface((10, 10), pygame.SRCALPHA)
         pygame.draw.circle(self.cursor_surface, RED, (5, 5), 5)
 
+        # Screens
+        self.scenes = SceneManager([MenuScene(self), LevelScene(self), WinScene(self)])
+        self.scenes.change("menu")
+
+    @property
+    def current_screen(self) -> str:
+        """Name of the active scene (menu, game, win)."""
+        return self.scenes.current_name
+
+    def apply_quality(self, name: str | None) -> None:
+        """
+        Switch to another quality profile and rebuild the cached assets.
+        
+        Args:
+            name: Quality profile name
+        """
+        if self.renderer:
+            self.renderer.wait()
+        self.quality = set_profile(name)
+        self.target_fps = self.quality.target_fps
+        self.render_target.scale = self.quality.render_scale
+        self.render_target.budget = 1 / self.target_fps
+        if self.pacer:
+            self.pacer.period = 1 / self.target_fps
+        self.enemy_lod.far_interval = max(1, self.quality.lod_far_interval)
+        self._build_backgrounds(self.quality.background_layers)
+
+        # Reload every sprite so resampling settings take effect
+        clear_image_cache()
+        clear_atlas_cache()
+        self._load_assets()
+        self.player.load_sprites()
+        for scene in self.scenes.scenes.values():
+            scene.reload_sprites()
+        logger.info("Quality profile: %s", self.quality.name)
+
+    def _build_backgrounds(self, count: int) -> None:
+        """
+        Create the background tiles used for scrolling.
+        
+        Args:
+            count: Number of tiles (at least 2 to cover the screen while scrolling)
+        """
+        start = min((bg.left for bg in self.backgrounds), default=0)
+        self.backgrounds = [
+            pygame.Rect(start + x * SCREEN_WIDTH, 0, SCREEN_WIDTH, SCREEN_HEIGHT)
+            for x in range(max(2, count))
+        ]
+
     def _load_assets(self) -> None:
         """Load game assets."""
         self.menu_background = load_image(ASSETS['menu'], (SCREEN_WIDTH, SCREEN_HEIGHT))
@@ -122,11 +264,13 @@ class Game:
         text_rect = text_render.get_rect(center=rect.center)
         return button_surf, text_render
 
-    def _draw_text(self, text: str, color: tuple, font: pygame.font.Font, rect: pygame.Rect) -> None:
+    def _draw_text(self, screen: pygame.Surface, text: str, color: tuple, font: pygame.font.Font,
+                   rect: pygame.Rect) -> None:
         """
         Draw centered text on screen.
         
         Args:
+            screen: Surface to draw on
             text: Text to draw
             color: Text color
             font: Font to use
@@ -134,18 +278,19 @@ class Game:
         """
         text_obj = font.render(text, True, color)
         text_rect = text_obj.get_rect(center=rect.center)
-        self.screen.blit(text_obj, text_rect)
+        screen.blit(text_obj, text_rect)
 
-    def _render_health(self, player: Player) -> None:
+    def _render_health(self, screen: pygame.Surface, player: Player) -> None:
         """
         Render player health on screen.
         
         Args:
+            screen: Surface to draw on
             player: Player instance
         """
         health_text = self.font.render(f"Health: {player.health}", True, RED)
         health_rect = health_text.get_rect(topleft=(10, 10))
-        self.screen.blit(health_text, health_rect)
+        screen.blit(health_text, health_rect)
 
     def _handle_menu_events(self, event: pygame.event.Event) -> bool:
         """
@@ -160,12 +305,30 @@ class Game:
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
             mouse_pos = event.pos
             if self.start_button_rect.collidepoint(mouse_pos):
-                self.current_screen = "game"
+                self.scenes.change("game")
                 self._reset_level()
             elif self.exit_button_rect.collidepoint(mouse_pos):
                 return False
         return True
 
+    def _handle_win_events(self, event: pygame.event.Event) -> bool:
+        """
+        Handle events in win screen.
+        
+        Args:
+            event: Pygame event
+            
+        Returns:
+            True if game should continue, False to quit
+        """
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            if self.main_menu_button_rect.collidepoint(event.pos):
+                self.scenes.change("menu")
+                self.current_level = 1
+                self._reset_level()
+                self.player_inventory = Inventory()
+        return True
+
     def _handle_game_events(self, event: pygame.event.Event, 
                           enemies: List[Enemy], chest: Chest, 
                           door: Door, key, total_scroll: int) -> bool:
@@ -198,7 +361,10 @@ class Game:
             elif event.key == pygame.K_q:
                 dropped_item = self.player.drop_item()
                 if dropped_item:
+                    dropped_item.enter_world(self.physics)
                     self.dropped_items.append(dropped_item)
+                    # Not picked up again until the player has stepped off it
+                    self.contacts.assume("item", dropped_item)
                     
         elif event.type == pygame.KEYUP:
             if event.key == pygame.K_d:
@@ -229,7 +395,7 @@ class Game:
         """
         # Key pickup
         if (not self.player.has_key and not key.is_picked_up and 
-            key.is_collision(self.player)):
+            self.contacts.touching("key", key)):
             key.interact(self.player)
             
         # Door interaction
@@ -254,7 +420,7 @@ class Game:
             enemies: List of enemies
             chest: Chest instance
         """
-        mouse_pos = pygame.mouse.get_pos()
+        mouse_pos = self.input.get_mouse_pos()
         
         # Inventory slot clicks
         for i in range(self.player_inventory.max_slots):
@@ -266,34 +432,73 @@ class Game:
                 self.player.equip_item(self.player_inventory.slots[i])
                 break
 
-        # Attack with weapon
+        # Attack with weapon; hits are found as the swing sweeps in later frames
         if (self.player.equipped_item and 
             self.player.equipped_item.item_type == "Weapon"):
-            damage = self.player.attack(time.time())
-            for enemy in enemies[:]:
-                if damage > 0 and self.player.equipped_item.is_collision(enemy):
-                    print(f"Dealt {damage} damage!")
-                    enemies.remove(enemy)
+            self.player.attack(time.time())
 
         # Chest interaction
-        handle_click(chest, self.player_inventory, self.placing_item, self.player)
+        handle_click(chest, self.player_inventory, self.placing_item, self.player, mouse_pos)
+
+    def _resolve_swing(self, swept: tuple, enemies: List[Enemy]) -> None:
+        """
+        Defeat the enemies the equipped weapon hit in part of its swing.
+        
+        Args:
+            swept: Attack progress before and after this frame's part of the swing
+            enemies: List of enemies
+        """
+        player = self.player
+        for enemy in self.swing.sweep(player.equipped_item, player.rect.center,
+                                      player.equipped_item_angle, swept, enemies):
+            logger.info("Dealt damage", extra={"fields": {"enemy_type": enemy.enemy_type}})
+            audio.play('hit')
+            enemies.remove(enemy)
+
+    def _on_enemy_contact(self, enemy: Enemy, seconds: float = 0.0) -> None:
+        """
+        Hurt the player while touching an enemy, at most once per invulnerability window.
+        
+        Args:
+            enemy: Enemy touching the player
+            seconds: Time the enemy has been touching the player
+        """
+        if self.player.take_hit(ENEMY_CONTACT_DAMAGE):
+            self.scenes.change("menu")
+
+    def _on_item_contact(self, item) -> None:
+        """
+        Pick up a dropped weapon the player walks onto with empty hands.
+        
+        Args:
+            item: Dropped item the player started touching
+        """
+        if item.item_type == "Weapon" and not self.player.equipped_item:
+            item.leave_world()
+            self.player.equip_item(item)
+            self.dropped_items.remove(item)
+            audio.play('pickup')
 
     def _reset_level(self) -> None:
         """Reset the current level state."""
-        self.player.position = pygame.Vector2((100, SCREEN_HEIGHT - 250))
-        self.player.rect.topleft = (int(self.player.position.x), int(self.player.position.y))
+        self.player.set_position((100, SCREEN_HEIGHT - 250))
         self.player.has_key = False
         self.player_inventory.clear()
 
-    def _update_scrolling(self, keys: pygame.key.ScancodeWrapper, 
+    def _reset_backgrounds(self) -> None:
+        """Move the scrolling backgrounds back to the start of the level."""
+        for x, bg in enumerate(self.backgrounds):
+            bg.topleft = (x * SCREEN_WIDTH, 0)
+
+    def _update_scrolling(self, keys, 
                          total_scroll: int, max_scroll: int,
                          chest: Chest, key, enemies: List[Enemy], 
                          door: Door) -> tuple:
         """
-        Update screen scrolling and object positions.
+        Update screen scrolling and object positions for the current frame's ``dt``.
         
         Args:
-            keys: Pressed keys
+            keys: Held keys from the input source
             total_scroll: Current scroll offset
             max_scroll: Maximum scroll offset
             chest: Chest instance
@@ -311,29 +516,38 @@ class Game:
         scroll_amount = 0
         is_scrolling = False
 
+        # Objects are placed on whole pixels: move by whole pixels and carry the rest
+        if keys[pygame.K_d] or keys[pygame.K_a]:
+            distance = NORMAL_SPEED * self.dt + self._move_carry
+            speed = int(distance)
+            self._move_carry = distance - speed
+        else:
+            speed = 0
+            self._move_carry = 0.0
+
         if keys[pygame.K_d]:
             if total_scroll < max_scroll:
                 if self.player.rect.right < right_boundary:
-                    move_amount = NORMAL_SPEED
+                    move_amount = speed
                 elif self.player.rect.right >= right_boundary:
-                    scroll_amount = min(NORMAL_SPEED, max_scroll - total_scroll)
+                    scroll_amount = min(speed, max_scroll - total_scroll)
                     is_scrolling = True
                     self._scroll_objects(scroll_amount, chest, key, enemies)
                     total_scroll += scroll_amount
             else:
-                move_amount = NORMAL_SPEED
+                move_amount = speed
 
         elif keys[pygame.K_a]:
             if total_scroll > 0:
                 if self.player.rect.left > left_boundary:
-                    move_amount = -NORMAL_SPEED
+                    move_amount = -speed
                 elif self.player.rect.left <= left_boundary:
-                    scroll_amount = min(NORMAL_SPEED, total_scroll)
+                    scroll_amount = min(speed, total_scroll)
                     is_scrolling = True
                     self._scroll_objects(-scroll_amount, chest, key, enemies)
                     total_scroll -= scroll_amount
             else:
-                move_amount = -NORMAL_SPEED
+                move_amount = -speed
 
         return total_scroll, move_amount, is_scrolling
 
@@ -362,13 +576,20 @@ class Game:
         chest.rect.x -= scroll_amount
         if not key.is_picked_up:
             key.rect.x -= scroll_amount
+        for item in self.dropped_items:
+            item.rect.x -= scroll_amount
         for enemy in enemies:
             enemy.x -= scroll_amount
 
-    def _draw_menu(self) -> None:
-        """Draw the menu screen."""
-        self.screen.blit(self.menu_background, (0, 0))
-        self._draw_text("Escape", BLACK, self.font_title, 
+    def _draw_menu(self, screen: pygame.Surface) -> None:
+        """
+        Draw the menu screen.
+        
+        Args:
+            screen: Surface to draw on
+        """
+        screen.blit(self.menu_background, (0, 0))
+        self._draw_text(screen, "Escape", BLACK, self.font_title, 
                        pygame.Rect(0, 50, SCREEN_WIDTH, 100))
         
         # Draw buttons
@@ -379,203 +600,364 @@ class Game:
             self.exit_button_rect, "Exit"
         )
         
-        self.screen.blit(start_button_surf, self.start_button_rect)
-        self.screen.blit(start_button_text, start_button_text.get_rect(
+        screen.blit(start_button_surf, self.start_button_rect)
+        screen.blit(start_button_text, start_button_text.get_rect(
             center=self.start_button_rect.center
         ))
-        self.screen.blit(exit_button_surf, self.exit_button_rect)
-        self.screen.blit(exit_button_text, exit_button_text.get_rect(
+        screen.blit(exit_button_surf, self.exit_button_rect)
+        screen.blit(exit_button_text, exit_button_text.get_rect(
             center=self.exit_button_rect.center
         ))
         
-        self.screen.blit(self.cursor_surface, pygame.mouse.get_pos())
+        screen.blit(self.cursor_surface, self.input.get_mouse_pos())
 
-    def _draw_game(self, enemies: List[Enemy], chest: Chest, 
-                  door: Door, key, total_scroll: int) -> None:
+    def _draw_game(self, screen: pygame.Surface, enemies: List[Enemy], chest: Chest, 
+                  door: Door, key, total_scroll: int, tilemap: TileMap | None = None) -> None:
         """
         Draw the game screen.
         
         Args:
+            screen: Surface to draw on, or a recorder when rendering is pipelined
             enemies: List of enemies
             chest: Chest instance
             door: Door instance
             key: Key item
             total_scroll: Current scroll offset
+            tilemap: Platforms of the level
         """
+        # The world layer may be drawn at a reduced resolution, or recorded for the render thread
+        world = screen.world if isinstance(screen, FrameRecorder) else self.render_target.begin(screen)
+
         # Draw backgrounds
-        for bg in self.backgrounds:
-            self.screen.blit(self.game_background, bg.topleft)
+        with tracer.span("draw backgrounds"):
+            for bg in self.backgrounds:
+                world.blit(self.game_background, bg.topleft)
+
+        # Draw platforms from their cached chunks
+        if tilemap:
+            with tracer.span("draw tiles"):
+                tilemap.draw(world)
 
         # Draw dropped items
-        for item in self.dropped_items[:]:
-            item.apply_gravity()
-            item.draw(self.screen)
-            if item.is_collision(self.player) and not self.player.equipped_item:
-                if item.item_type == "Weapon":
-                    self.player.equip_item(item)
-                    self.dropped_items.remove(item)
-
-        # Draw enemies
-        for enemy in enemies:
-            enemy.update()
-            enemy.draw(self.screen)
-            if enemy.rect.colliderect(self.player.rect):
-                dead = self.player.take_damage(0.5)
-                if dead:
-                    self.current_screen = "menu"
+        with tracer.span("draw dropped items"):
+            for item in self.dropped_items:
+                item.draw(world)
+
+        # Update enemies (far-away ones at a reduced rate) and draw them
+        with tracer.span("enemies"):
+            self.enemy_lod.update(enemies, self.dt)
+            for enemy in enemies:
+                enemy.draw(world)
+
+        # Damage and pickups follow the player's contacts changing
+        with tracer.span("contacts"):
+            self.contacts.update(self.player.rect, {
+                "enemy": enemies,
+                "item": self.dropped_items,
+                "key": () if key.is_picked_up else (key,),
+            }, self.dt)
 
         # Draw game objects
-        door.draw(self.screen, total_scroll)
-        self.player.draw(self.screen)
-        chest.draw(self.screen)
-        
-        if not key.is_picked_up:
-            key.draw(self.screen)
+        with tracer.span("draw objects"):
+            door.draw(world, total_scroll)
+            self.player.draw(world)
+            chest.draw(world)
             
-        self.player_inventory.display_inventory(self.screen)
-        
-        if self.player.equipped_item:
-            self.player.equipped_item.draw(self.screen)
+            if not key.is_picked_up:
+                key.draw(world)
 
-        # Draw UI elements
-        if self.placing_item["display_text"] and self.placing_item["display_rect"] is not None:
-            self.screen.blit(self.placing_item["display_text"], self.placing_item["display_rect"])
+        if not isinstance(screen, FrameRecorder):
+            with tracer.span("present world"):
+                self.render_target.present(screen)
 
-        level_text = self.level_font.render(f"Level: {self.current_level}", True, BLACK)
-        level_rect = level_text.get_rect(centerx=SCREEN_WIDTH // 2, top=10)
-        self.screen.blit(level_text, level_rect)
+        # The UI is always drawn at full resolution
+        with tracer.span("draw ui"):
+            self.player_inventory.display_inventory(screen)
+            
+            if self.player.equipped_item:
+                self.player.equipped_item.draw(screen)
+
+            # Draw UI elements
+            if self.placing_item["display_text"] and self.placing_item["display_rect"] is not None:
+                screen.blit(self.placing_item["display_text"], self.placing_item["display_rect"])
+
+            level_text = self.level_font.render(f"Level: {self.current_level}", True, BLACK)
+            level_rect = level_text.get_rect(centerx=SCREEN_WIDTH // 2, top=10)
+            screen.blit(level_text, level_rect)
 
-        self._render_health(self.player)
-        self.screen.blit(self.cursor_surface, pygame.mouse.get_pos())
+            self._render_health(screen, self.player)
+            screen.blit(self.cursor_surface, self.input.get_mouse_pos())
 
-    def _draw_win_screen(self) -> None:
-        """Draw the win screen."""
-        self.screen.blit(self.menu_background, (0, 0))
+    def _draw_win_screen(self, screen: pygame.Surface) -> None:
+        """
+        Draw the win screen.
+        
+        Args:
+            screen: Surface to draw on
+        """
+        screen.blit(self.menu_background, (0, 0))
         win_text = self.font_title.render("Congratulations! You Win!", True, WHITE)
         win_rect = win_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3))
-        self.screen.blit(win_text, win_rect)
+        screen.blit(win_text, win_rect)
 
         main_menu_button_surf, main_menu_button_text = self._create_button(
             self.main_menu_button_rect, "Main Menu"
         )
-        self.screen.blit(main_menu_button_surf, self.main_menu_button_rect)
-        self.screen.blit(main_menu_button_text, main_menu_button_text.get_rect(
+        screen.blit(main_menu_button_surf, self.main_menu_button_rect)
+        screen.blit(main_menu_button_text, main_menu_button_text.get_rect(
             center=self.main_menu_button_rect.center
         ))
 
-        self.screen.blit(self.cursor_surface, pygame.mouse.get_pos())
+        screen.blit(self.cursor_surface, self.input.get_mouse_pos())
 
-    def run(self) -> None:
-        """Run the main game loop."""
-        running = True
-        
-        while running:
-            current_time = time.time()
-            
-            # Handle events
-            for event in pygame.event.get():
+    def step(self) -> bool:
+        """
+        Handle input, update and draw one frame of the active scene.
+
+        The frame is drawn to ``screen`` but not presented, and the game
+        advances by ``dt``; ``run`` does both for a game that owns the
+        window, while a caller running several games sets ``dt`` and
+        presents their screens itself. With pipelined rendering, the frame
+        is recorded instead and handed to the render thread, which draws
+        and presents it while the next frame is simulated.
+
+        Returns:
+            False once the game wants to quit, True otherwise
+        """
+        start = time.perf_counter()
+        self.scenes.apply_pending()
+        scene = self.scenes.current
+
+        # Handle events
+        with tracer.span("events"):
+            events = self.input.get_events()
+            self.input_latency.poll(events)
+            for event in events:
                 if event.type == pygame.QUIT:
-                    running = False
-                elif self.current_screen == "menu":
-                    running = self._handle_menu_events(event)
-                elif self.current_screen == "game":
-                    # --- BEGIN LEVEL SETUP ---
-                    chest = Chest()
-                    door = Door(DOOR_SIZE, SCREEN_WIDTH * 3)
-                    key = spawn_key()
-                    key.rect.topleft = (random.randint(100, SCREEN_WIDTH * 3 - 100), SCREEN_HEIGHT - key.rect.height - 30)
-                    enemies = [Enemy() for _ in range(3)]
-                    total_scroll = 0
-                    max_scroll = SCREEN_WIDTH * 3 - SCREEN_WIDTH
-                    level_complete = False
-                    # --- END LEVEL SETUP ---
-
-                    # --- BEGIN LEVEL LOOP ---
-                    while not level_complete and running:
-                        current_time = time.time()
-                        for level_event in pygame.event.get():
-                            if level_event.type == pygame.QUIT:
-                                running = False
-                                break
-                            else:
-                                running = self._handle_game_events(
-                                    level_event, enemies, chest, door, key, total_scroll
-                                )
-                                if not running:
-                                    break
-                        if not running:
-                            break
-                        keys = pygame.key.get_pressed()
-                        total_scroll, move_amount, is_scrolling = self._update_scrolling(
-                            keys, total_scroll, max_scroll, chest, key, enemies, door
-                        )
-                        if not is_scrolling:
-                            new_x = self.player.rect.x + move_amount
-                            if 0 <= new_x <= SCREEN_WIDTH - self.player.rect.width:
-                                self.player.rect.x = new_x
-                            elif new_x < 0:
-                                self.player.rect.left = 0
-                            elif new_x > SCREEN_WIDTH - self.player.rect.width:
-                                self.player.rect.right = SCREEN_WIDTH
-                        self.player.update(is_scrolling)
-                        if self.player.equipped_item:
-                            self.player.update_cursor_pos(pygame.mouse.get_pos())
-                            self.player.update(is_scrolling)
-                        if door.is_open:
-                            level_complete = True
-                        self.screen.fill(WHITE)
-                        self._draw_game(enemies, chest, door, key, total_scroll)
-                        pygame.display.flip()
-                        self.clock.tick(FPS)
-                    # --- END LEVEL LOOP ---
-
-                    # Handle level completion
-                    if level_complete:
-                        if self.current_level == TOTAL_LEVELS:
-                            self.current_screen = "win"
-                            while self.current_screen == "win" and running:
-                                for win_event in pygame.event.get():
-                                    if win_event.type == pygame.QUIT:
-                                        running = False
-                                    elif (win_event.type == pygame.MOUSEBUTTONDOWN and 
-                                          win_event.button == 1):
-                                        if self.main_menu_button_rect.collidepoint(win_event.pos):
-                                            self.current_screen = "menu"
-                                            self.current_level = 1
-                                            self._reset_level()
-                                            self.player_inventory = Inventory()
-                                self.screen.fill(WHITE)
-                                self._draw_win_screen()
-                                pygame.display.flip()
-                                self.clock.tick(FPS)
-                        else:
-                            self.current_level += 1
-                elif self.current_screen == "win":
-                    for win_event in pygame.event.get():
-                        if win_event.type == pygame.QUIT:
-                            running = False
-                        elif (win_event.type == pygame.MOUSEBUTTONDOWN and 
-                              win_event.button == 1):
-                            if self.main_menu_button_rect.collidepoint(win_event.pos):
-                                self.current_screen = "menu"
-                                self.current_level = 1
-                                self._reset_level()
-                                self.player_inventory = Inventory()
+                    self.running = False
+                elif event.type == pygame.KEYDOWN and event.key == TRACE_FLUSH_KEY:
+                    tracer.flush()
+                elif event.type == pygame.KEYDOWN and event.key == QUALITY_CYCLE_KEY:
+                    self.apply_quality(next_profile_name())
+                elif event.type == pygame.KEYDOWN and event.key == CAPTURE_TOGGLE_KEY:
+                    if self.renderer:
+                        self.renderer.wait()
+                    self.capture.toggle()
+                elif not scene.handle_event(event):
+                    self.running = False
+                if not self.running:
+                    return False
+
+        # Update and draw the active scene
+        with tracer.span("update"):
+            scene.update()
+        if self.renderer:
+            with tracer.span("record"):
+                recorder = FrameRecorder(self.screen.get_size())
+                scene.draw(recorder)
+                frame = recorder.finish(self.input_latency.take_pending(), time.perf_counter() - start)
+            with tracer.span("wait for render"):
+                self.renderer.submit(frame)
+            return True
+        with tracer.span("draw"):
             self.screen.fill(WHITE)
-            if self.current_screen == "menu":
-                self._draw_menu()
-            elif self.current_screen == "win":
-                self._draw_win_screen()
-            pygame.display.flip()
-            self.clock.tick(FPS)
-        pygame.quit()
+            scene.draw(self.screen)
+        return True
+
+    def _draw_frame(self, screen: pygame.Surface, frame: Frame) -> None:
+        """Draw a recorded frame; runs on the render thread."""
+        with tracer.span("draw"):
+            draw_frame(screen, frame, self.render_target)
+
+    def _present(self, frame: Frame | None = None, draw_seconds: float = 0.0) -> None:
+        """
+        Show the drawn screen and record what showing it measures.
+        
+        Args:
+            frame: Recorded frame that was drawn on the render thread,
+                None if the screen was drawn by ``step``
+            draw_seconds: Time the render thread spent drawing the frame
+        """
+        if self.owns_display:
+            with tracer.span("display.flip"):
+                pygame.display.flip()
+        if self.pacer:
+            self.pacer.presented()
+        for latency in self.input_latency.presented(polls=frame.polls if frame else None):
+            metrics.record_input_latency(latency)
+        with tracer.span("capture"):
+            self.capture.capture(self.screen)
+        if frame:
+            # Simulation and drawing overlap, so the slower of the two sets the pace
+            self.render_target.record_frame(max(frame.sim_seconds, draw_seconds))
+
+    def run(self, duration: float | None = None) -> None:
+        """
+        Run the main game loop.
+        
+        Args:
+            duration: Seconds after which to stop, None to run until quit
+        """
+        self.running = True
+        end = None if duration is None else time.perf_counter() + duration
+        if self.renderer:
+            self.renderer.start()
+        
+        while self.running:
+            if self.pacer and not self.uncapped:
+                with tracer.span("late-latch wait"):
+                    self.pacer.wait()
+            frame_start = time.perf_counter()
+            with tracer.span("frame"):
+                if not self.step():
+                    break
+                if not self.renderer:
+                    self._present()
+                    self.render_target.record_frame(time.perf_counter() - frame_start)
+                # The pacer already waited at the top of the frame
+                if self.pacer or self.uncapped:
+                    frame_ms = self.clock.tick()
+                else:
+                    frame_ms = self.clock.tick(self.target_fps)
+                metrics.record_frame(frame_ms / 1000, self.clock.get_fps())
+                # The next frame advances by the time this one took
+                self.dt = min(frame_ms / 1000, MAX_FRAME_DELTA)
+                if self._frame_times is not None:
+                    self._frame_times.append(time.perf_counter() - frame_start)
+                if end is not None and time.perf_counter() >= end:
+                    self.running = False
+
+        if self.renderer:
+            self.renderer.stop()
+        stats = self.input_latency.stats()
+        if stats:
+            if self.pacer:
+                stats["missed_deadlines"] = self.pacer.missed
+            logger.info("Input latency", extra={"fields": stats})
+        self.scenes.shutdown()
+        self.capture.stop()
+        if self.owns_display:
+            pygame.quit()
+
+    def benchmark(self, scene: str, seconds: float = BENCHMARK_SECONDS) -> Dict[str, float]:
+        """
+        Run one scene without a frame cap and measure its throughput.
+
+        Motion is scaled by the frame time, so the game plays at normal speed
+        while frames run as fast as they can.
+
+        Args:
+            scene: Scene to run (menu, game or win)
+            seconds: How long to run
+
+        Returns:
+            Frame count, average and worst-case frame rates
+        """
+        self.uncapped = True
+        self._frame_times = []
+        self.scenes.change(scene)
+        self.run(seconds)
+        times = sorted(self._frame_times)
+        self._frame_times = None
+        if not times:
+            return {"frames": 0}
+        total = sum(times)
+        return {
+            "frames": len(times),
+            "avg_fps": round(len(times) / total, 1),
+            "p1_low_fps": round(1 / times[min(len(times) - 1, int(len(times) * 0.99))], 1),
+            "avg_frame_ms": round(total / len(times) * 1000, 3),
+            "max_frame_ms": round(times[-1] * 1000, 3),
+        }
+
+
+def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    """
+    Parse command line options.
+    
+    Args:
+        argv: Arguments to parse (defaults to sys.argv)
+        
+    Returns:
+        Parsed options
+    """
+    parser = argparse.ArgumentParser(description="Escape - a 2D side-scrolling adventure")
+    parser.add_argument(
+        "--log-level", default=LOG_LEVEL, choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        type=str.upper, help=f"minimum level of log messages (default {LOG_LEVEL})"
+    )
+    parser.add_argument(
+        "--trace", nargs="?", const="", default=None, metavar="PATH",
+        help="record frame spans and write a Chrome trace-event file on exit or F9"
+    )
+    parser.add_argument(
+        "--metrics", nargs="?", type=int, const=METRICS_PORT, default=None, metavar="PORT",
+        help=f"serve Prometheus metrics on localhost (default port {METRICS_PORT})"
+    )
+    parser.add_argument(
+        "--capture", nargs="?", const="png", default=None, choices=CAPTURE_MODES,
+        help="record gameplay from the start (raw, png or pipe to ffmpeg); F10 toggles in game"
+    )
+    parser.add_argument(
+        "--benchmark", default=None, choices=["menu", "game", "win"],
+        help="run a scene without the frame cap and report the highest frame rate it reaches"
+    )
+    parser.add_argument(
+        "--benchmark-seconds", type=float, default=BENCHMARK_SECONDS, metavar="SECONDS",
+        help=f"length of the benchmark run (default {BENCHMARK_SECONDS:g})"
+    )
+    parser.add_argument(
+        "--level", type=int, default=1, metavar="N",
+        help="level to start in (and to benchmark with --benchmark game)"
+    )
+    parser.add_argument(
+        "--late-latch", action="store_true",
+        help="sleep before polling input instead of after rendering, to cut input latency"
+    )
+    parser.add_argument(
+        "--pipelined", action="store_true",
+        help="draw each frame on a render thread while the next one is simulated "
+             "(not supported on macOS, where SDL must present from the main thread)"
+    )
+    parser.add_argument(
+        "--quality", default=None, metavar="PROFILE",
+        help="quality profile from quality.json (low, medium, high); F5 cycles in game"
+    )
+    parser.add_argument(
+        "--render-scale", type=float, default=None, metavar="SCALE",
+        help="internal resolution of the game world relative to the window"
+    )
+    parser.add_argument(
+        "--dynamic-resolution", action="store_true",
+        help="lower the render scale automatically when frames go over budget"
+    )
+    return parser.parse_args(argv)
 
 
 def main():
     """Main function to start the game."""
-    game = Game()
-    game.run()
+    args = parse_args()
+    setup_logging(args.log_level)
+    if args.trace is not None:
+        tracer.enable(args.trace or None)
+    exporter = None
+    if args.metrics is not None:
+        exporter = MetricsExporter(metrics, port=args.metrics)
+        exporter.start()
+    game = Game(args.quality, args.render_scale, args.dynamic_resolution, args.capture or "png",
+                args.late_latch, pipelined=args.pipelined)
+    game.current_level = args.level
+    if args.capture:
+        game.capture.start()
+    if args.benchmark:
+        result = game.benchmark(args.benchmark, args.benchmark_seconds)
+        print(f"Benchmark {args.benchmark}: " + ", ".join(f"{k}={v}" for k, v in result.items()))
+    else:
+        game.run()
+    if exporter:
+        exporter.stop()
+    shutdown_logging()
 
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
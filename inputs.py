@@ -0,0 +1,143 @@
+"""
+Input sources for the Escape-WE-Project game.
+Supplies the events, held keys and mouse position a game instance reads.
+"""
+
+from typing import List, Set, Tuple
+import pygame
+
+
+class InputSource:
+    """
+    Where a game instance reads its input from.
+
+    A game never asks pygame directly for input, so several games in one
+    process can each read their own.
+    """
+
+    def get_events(self) -> List[pygame.event.Event]:
+        """
+        Take the events since the previous call.
+
+        Returns:
+            Events in the order they happened
+        """
+        raise NotImplementedError
+
+    def get_pressed(self) -> "HeldKeys | pygame.key.ScancodeWrapper":
+        """
+        Get the keys held down, indexable by key constant like ``pygame.key.get_pressed()``.
+
+        Returns:
+            Held keys
+        """
+        raise NotImplementedError
+
+    def get_mouse_pos(self) -> Tuple[int, int]:
+        """
+        Get the mouse position on the game's screen.
+
+        Returns:
+            Mouse position (x, y)
+        """
+        raise NotImplementedError
+
+
+class PygameInput(InputSource):
+    """The keyboard and mouse of pygame's window."""
+
+    def get_events(self) -> List[pygame.event.Event]:
+        """Take the events from pygame's event queue."""
+        return pygame.event.get()
+
+    def get_pressed(self) -> pygame.key.ScancodeWrapper:
+        """Get the keys held down on the keyboard."""
+        return pygame.key.get_pressed()
+
+    def get_mouse_pos(self) -> Tuple[int, int]:
+        """Get the mouse position in the window."""
+        return pygame.mouse.get_pos()
+
+
+class HeldKeys:
+    """
+    Set of held keys that reads like ``pygame.key.get_pressed()``.
+
+    Attributes:
+        keys: Key constants held down
+    """
+
+    def __init__(self):
+        """Initialize with no keys held."""
+        self.keys: Set[int] = set()
+
+    def __getitem__(self, key: int) -> bool:
+        return key in self.keys
+
+
+class ScriptedInput(InputSource):
+    """
+    Input fed by code, e.g. a test, a bot or one player of a split screen.
+
+    Posted events are handed out by the next ``get_events``, which also
+    applies them to the held keys and the mouse position the way pygame
+    does, so key and mouse events alone are enough to drive a game.
+
+    Attributes:
+        held: Keys held down
+        mouse_pos: Mouse position on the game's screen
+    """
+
+    def __init__(self):
+        """Initialize with no pending events, no keys held and the mouse at the origin."""
+        self.held = HeldKeys()
+        self.mouse_pos: Tuple[int, int] = (0, 0)
+        self._events: List[pygame.event.Event] = []
+
+    def post(self, event_type: int, **attributes) -> None:
+        """
+        Queue an event.
+
+        Args:
+            event_type: Pygame event type, e.g. ``pygame.KEYDOWN``
+            **attributes: Event attributes, e.g. ``key`` or ``pos``
+        """
+        self._events.append(pygame.event.Event(event_type, attributes))
+
+    def press(self, key: int) -> None:
+        """Queue a key press."""
+        self.post(pygame.KEYDOWN, key=key, mod=0, unicode="", scancode=0)
+
+    def release(self, key: int) -> None:
+        """Queue a key release."""
+        self.post(pygame.KEYUP, key=key, mod=0, unicode="", scancode=0)
+
+    def move_mouse(self, pos: Tuple[int, int]) -> None:
+        """Queue a mouse movement."""
+        self.post(pygame.MOUSEMOTION, pos=pos, rel=(0, 0), buttons=(0, 0, 0))
+
+    def click(self, pos: Tuple[int, int], button: int = 1) -> None:
+        """Queue a mouse button press and release at a position."""
+        self.move_mouse(pos)
+        self.post(pygame.MOUSEBUTTONDOWN, pos=pos, button=button)
+        self.post(pygame.MOUSEBUTTONUP, pos=pos, button=button)
+
+    def get_events(self) -> List[pygame.event.Event]:
+        """Take the queued events and apply them to the held keys and mouse position."""
+        events, self._events = self._events, []
+        for event in events:
+            if event.type == pygame.KEYDOWN:
+                self.held.keys.add(event.key)
+            elif event.type == pygame.KEYUP:
+                self.held.keys.discard(event.key)
+            elif event.type in (pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP):
+                self.mouse_pos = event.pos
+        return events
+
+    def get_pressed(self) -> HeldKeys:
+        """Get the keys held down."""
+        return self.held
+
+    def get_mouse_pos(self) -> Tuple[int, int]:
+        """Get the mouse position."""
+        return self.mouse_pos
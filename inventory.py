@@ -4,13 +4,22 @@ Handles item storage, management, and UI display.
 """
 
 import pygame
-from typing import Optional, List, Any
+from typing import Optional, List, Any, Tuple
 from config import (
     SCREEN_WIDTH, INVENTORY_SLOT_WIDTH, INVENTORY_SLOT_HEIGHT,
-    INVENTORY_SLOT_MARGIN, INVENTORY_MAX_SLOTS, WHITE, BLACK, YELLOW
+    INVENTORY_SLOT_MARGIN, INVENTORY_MAX_SLOTS, WHITE, BLACK, YELLOW, COLORKEY
 )
 
 
+def _border(size: Tuple[int, int], color: Tuple[int, int, int], width: int) -> pygame.Surface:
+    """Draw a rectangle border onto a colorkey surface of the given size."""
+    border = pygame.Surface(size)
+    border.fill(COLORKEY)
+    pygame.draw.rect(border, color, border.get_rect(), width)
+    border.set_colorkey(COLORKEY, pygame.RLEACCEL)
+    return border
+
+
 class Inventory:
     """
     Inventory system for managing player items.
@@ -36,6 +45,11 @@ class Inventory:
         
         # UI elements
         self.bin_rect = pygame.Rect(0, 0, 60, 30)
+        # Borders are drawn once and blitted, like any other sprite
+        slot_size = (INVENTORY_SLOT_WIDTH, INVENTORY_SLOT_HEIGHT)
+        self._slot_border = _border(slot_size, WHITE, 2)
+        self._selected_border = _border(slot_size, YELLOW, 4)
+        self._bin_border = _border(self.bin_rect.size, BLACK, 2)
 
     def add_item(self, item, slot_index: int) -> bool:
         """
@@ -136,11 +150,11 @@ class Inventory:
             slot_rect = pygame.Rect(slot_x, y, INVENTORY_SLOT_WIDTH, INVENTORY_SLOT_HEIGHT)
             
             # Draw slot border
-            pygame.draw.rect(screen, WHITE, slot_rect, 2)
+            screen.blit(self._slot_border, slot_rect)
 
             # Highlight selected slot
             if i == self.selected_slot:
-                pygame.draw.rect(screen, YELLOW, slot_rect, 4)
+                screen.blit(self._selected_border, slot_rect)
 
             # Draw item name
             item_name = self.get_item_name(i)
@@ -151,7 +165,7 @@ class Inventory:
         # Draw bin button
         bin_x = x + inventory_width + INVENTORY_SLOT_MARGIN
         self.bin_rect.topleft = (bin_x, y)
-        pygame.draw.rect(screen, BLACK, self.bin_rect, 2)
+        screen.blit(self._bin_border, self.bin_rect)
         bin_text = self.font.render("Bin", True, BLACK)
         bin_text_rect = bin_text.get_rect(center=self.bin_rect.center)
         screen.blit(bin_text, bin_text_rect)
@@ -3,14 +3,21 @@ Item class for the Escape-WE-Project game.
 Handles weapons, keys, and other collectible items.
 """
 
+import logging
 import pygame
 import math
 import random
 from typing import Optional, Tuple
 from config import (
-    SCREEN_WIDTH, SCREEN_HEIGHT, ITEM_SIZE, WEAPON_SIZE, KEY_SIZE,
-    ITEM_GRAVITY, load_image, ASSETS
+    SCREEN_WIDTH, ITEM_SIZE, WEAPON_SIZE, KEY_SIZE,
+    ITEM_GRAVITY, ITEM_REST_OFFSET, WEAPON_ATTACK_SPEED, WEAPON_SWING_ARC, WEAPON_MASK_STEP,
+    load_image, ASSETS
 )
+from quality import get_profile
+from physics import PhysicsWorld, ground_top
+from audio import audio
+
+logger = logging.getLogger(__name__)
 
 
 class Item:
@@ -44,6 +51,8 @@ class Item:
         # Physics
         self.gravity = ITEM_GRAVITY
         self.y_velocity = 0
+        self.physics: Optional[PhysicsWorld] = None
+        self.physics_handle: Optional[int] = None
         
         # Sprite handling
         self.sprite = sprite.copy() if sprite else None
@@ -58,11 +67,14 @@ class Item:
         # Equipment properties
         self.equipped_offset = (50, 90)
         self.rotation_angle = 0
+        self._rotation_cache: dict[int, pygame.Surface] = {}
+        self._rotation_cache_step = 0.0
+        self._mask_cache: dict[int, pygame.mask.Mask] = {}
         
         # Combat properties
         self.attack_animation = False
         self.attack_progress = 0
-        self.attack_speed = 0.2
+        self.attack_speed = WEAPON_ATTACK_SPEED
 
     def draw(self, screen: pygame.Surface, player_position: Optional[Tuple[int, int]] = None) -> None:
         """
@@ -84,19 +96,8 @@ class Item:
             center_x = player_position[0] + self.equipped_offset[0]
             center_y = player_position[1] + self.equipped_offset[1]
             
-            # Handle attack animation
-            if self.attack_animation:
-                self.attack_progress += self.attack_speed
-                if self.attack_progress >= 1:
-                    self.attack_animation = False
-                    self.attack_progress = 0
-                
-                # Add swing animation
-                swing_angle = 45 * (1 - self.attack_progress)
-                self.rotation_angle += swing_angle
-            
             # Rotate and draw
-            rotated_image = pygame.transform.rotate(self.original_image, self.rotation_angle)
+            rotated_image = self._rotated_image(self.rotation_angle)
             rotated_rect = rotated_image.get_rect(center=(center_x, center_y))
             screen.blit(rotated_image, rotated_rect)
             self.rect = rotated_rect
@@ -123,17 +124,105 @@ class Item:
             angle: Rotation angle in radians
         """
         self.rotation_angle = math.degrees(angle)
-        self.image = pygame.transform.rotate(self.original_image, self.rotation_angle)
+        self.image = self._rotated_image(self.rotation_angle)
         self.rect = self.image.get_rect(center=self.rect.center)
 
+    def _rotated_image(self, degrees: float) -> pygame.Surface:
+        """
+        Get the item image rotated to the active profile's rotation precision.
+        
+        Rotations are quantized to ``rotation_step`` degrees and cached, so a
+        weapon following the cursor reuses a fixed set of rotated images.
+        
+        Args:
+            degrees: Rotation angle in degrees
+            
+        Returns:
+            Rotated image
+        """
+        step = get_profile().rotation_step
+        if step <= 0:
+            return pygame.transform.rotate(self.original_image, degrees)
+        if step != self._rotation_cache_step:
+            self._rotation_cache.clear()
+            self._rotation_cache_step = step
+        index = round(degrees / step) % max(1, round(360 / step))
+        image = self._rotation_cache.get(index)
+        if image is None:
+            image = pygame.transform.rotate(self.original_image, index * step)
+            self._rotation_cache[index] = image
+        return image
+
+    def blade_mask(self, degrees: float) -> pygame.mask.Mask:
+        """
+        Get the collision mask of the item rotated like ``rotate`` draws it.
+        
+        Masks are cached every WEAPON_MASK_STEP degrees, independent of the
+        quality profile, so hits do not depend on the rendering settings.
+        
+        Args:
+            degrees: Rotation angle in degrees
+            
+        Returns:
+            Mask of the rotated image
+        """
+        index = round(degrees / WEAPON_MASK_STEP) % round(360 / WEAPON_MASK_STEP)
+        mask = self._mask_cache.get(index)
+        if mask is None:
+            rotated = pygame.transform.rotate(self.original_image, index * WEAPON_MASK_STEP)
+            mask = pygame.mask.from_surface(rotated)
+            self._mask_cache[index] = mask
+        return mask
+
     def start_attack(self) -> None:
         """Start the attack animation."""
         self.attack_animation = True
         self.attack_progress = 0
 
+    def swing_offset(self, progress: Optional[float] = None) -> float:
+        """
+        Get the angle the swing adds to the weapon's aim.
+        
+        A swing starts WEAPON_SWING_ARC degrees off the aim and ends on it.
+        
+        Args:
+            progress: Attack progress from 0 to 1 (defaults to the current one)
+            
+        Returns:
+            Offset in radians, 0 when not attacking
+        """
+        if progress is None:
+            if not self.attack_animation:
+                return 0.0
+            progress = self.attack_progress
+        return math.radians(WEAPON_SWING_ARC) * (1 - progress)
+
+    def advance_attack(self, dt: float) -> Optional[Tuple[float, float]]:
+        """
+        Advance the attack animation.
+
+        Args:
+            dt: Seconds to advance
+
+        Returns:
+            Attack progress before and after this step, to test the part of
+            the swing in between for hits; None when not attacking
+        """
+        if not self.attack_animation:
+            return None
+        start = self.attack_progress
+        self.attack_progress += self.attack_speed * dt
+        end = min(1.0, self.attack_progress)
+        if self.attack_progress >= 1:
+            self.attack_animation = False
+            self.attack_progress = 0
+        return start, end
+
     def is_collision(self, entity) -> bool:
         """
-        Check collision with another entity.
+        Check whether the item touches another entity, e.g. to be picked up.
+
+        Weapon hits are found along the swing by ``weapons.SwingHitDetector``.
         
         Args:
             entity: Entity to check collision with
@@ -141,15 +230,7 @@ class Item:
         Returns:
             True if collision detected
         """
-        if self.item_type == "Weapon":
-            if not self.attack_animation:
-                return False
-            # Create larger hitbox during attack
-            attack_rect = self.rect.inflate(20, 20)
-            return attack_rect.colliderect(entity.rect)
-        else:
-            # For keys and other items, just use rect collision
-            return self.rect.colliderect(entity.rect)
+        return self.rect.colliderect(entity.rect)
 
     def interact(self, player) -> None:
         """
@@ -164,24 +245,47 @@ class Item:
         if self.item_type == "Key" and not self.is_picked_up:
             player.pick_up_key(self)
             self.is_picked_up = True
+            audio.play('pickup')
+            self.leave_world()
         elif self.item_type == "Weapon" and player.has_key and not self.is_picked_up:
             player.pick_up_item(self)
             player.has_key = False
             self.is_picked_up = True
+            audio.play('pickup')
+            self.leave_world()
         elif self.item_type == "Weapon" and not player.has_key:
-            print(f"You need a key to pick up {self.name}.")
+            logger.info("You need a key to pick up %s.", self.name)
 
-    def apply_gravity(self) -> None:
-        """Apply gravity to the item if not picked up."""
-        if self.is_picked_up:
-            return
-        self.y_velocity += self.gravity
-        self.rect.y += int(self.y_velocity)
-        # Check floor collision
-        floor_level = SCREEN_HEIGHT - self.rect.height - 50
-        if self.rect.y >= floor_level:
-            self.rect.y = floor_level
-            self.y_velocity = 0
+    def enter_world(self, physics: PhysicsWorld, falling: bool = True) -> None:
+        """
+        Let the item fall in a physics world until it rests on the ground.
+        
+        Args:
+            physics: Physics world to add the item to
+            falling: Whether the item starts falling (False if it already lies on the ground)
+        """
+        self.leave_world()
+        self.physics = physics
+        physics.add(self, self.rect.y, self.rect.height, self.gravity,
+                    ITEM_REST_OFFSET, falling)
+
+    def leave_world(self) -> None:
+        """Stop simulating the item, e.g. when it is picked up."""
+        if self.physics:
+            self.physics.remove(self)
+            self.physics = None
+
+    def on_physics_step(self, top: float, velocity: float, resting: bool) -> None:
+        """
+        Take the vertical position computed by the physics world.
+        
+        Args:
+            top: New top edge
+            velocity: New vertical velocity
+            resting: Whether the item landed on the ground
+        """
+        self.rect.y = int(top)
+        self.y_velocity = velocity
 
 
 def spawn_key() -> Item:
@@ -193,7 +297,7 @@ def spawn_key() -> Item:
     """
     key_sprite = load_image(ASSETS['key'], KEY_SIZE)
     x = random.randint(50, SCREEN_WIDTH - 50)
-    y = SCREEN_HEIGHT - 100
+    y = ground_top(KEY_SIZE[1] / 2, ITEM_REST_OFFSET)
     return Item("Golden Key", "Key", (x, y), KEY_SIZE, key_sprite)
 
 
@@ -205,4 +309,5 @@ def spawn_weapon() -> Item:
         New weapon item
     """
     sword_sprite = load_image(ASSETS['sword'], WEAPON_SIZE)
-    return Item("Sword", "Weapon", (50, SCREEN_HEIGHT - 100), WEAPON_SIZE, sword_sprite) 
\ No newline at end of file
+    y = ground_top(WEAPON_SIZE[1] / 2, ITEM_REST_OFFSET)
+    return Item("Sword", "Weapon", (50, y), WEAPON_SIZE, sword_sprite) 
\ No newline at end of file
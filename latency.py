@@ -0,0 +1,188 @@
+"""
+Input latency for the Escape-WE-Project game.
+Measures the time from input events to the frame that shows them and paces late-latched frames.
+"""
+
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Sequence
+import pygame
+from config import LATENCY_SAMPLE_SIZE, LATE_LATCH_MARGIN_MS, LATE_LATCH_SPIN_MS
+
+# Events whose effect on screen is measured
+INPUT_EVENTS = (pygame.KEYDOWN, pygame.KEYUP, pygame.MOUSEBUTTONDOWN,
+                pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION)
+
+
+class InputLatencyTracker:
+    """
+    Input-to-photon latency of recent input events.
+
+    Input events are stamped when the game polls them, and the next
+    ``display.flip`` after that is the first frame that can show their
+    effect. Events are only seen at poll time, so an event could have
+    arrived at any point since the previous poll; ``samples`` count half of
+    that interval as queue wait on top of the measured poll-to-flip time.
+    Events of the same poll share one sample.
+
+    Attributes:
+        samples: Recent input-to-flip latencies in seconds
+        polled: Recent poll-to-flip latencies in seconds
+        events: Number of polls with input that were measured
+    """
+
+    def __init__(self, sample_size: int = LATENCY_SAMPLE_SIZE):
+        """
+        Initialize an empty tracker.
+
+        Args:
+            sample_size: Number of recent latencies kept for percentiles
+        """
+        self.samples: Deque[float] = deque(maxlen=sample_size)
+        self.polled: Deque[float] = deque(maxlen=sample_size)
+        self.events = 0
+        self._last_poll: Optional[float] = None
+        self._pending: List[tuple] = []
+
+    def poll(self, events: List[pygame.event.Event], now: Optional[float] = None) -> None:
+        """
+        Stamp the input events of one poll.
+
+        Args:
+            events: Events returned by ``pygame.event.get``
+            now: Time of the poll (defaults to now)
+        """
+        now = time.perf_counter() if now is None else now
+        previous = now if self._last_poll is None else self._last_poll
+        self._last_poll = now
+        # All events of a poll share a stamp; one is enough to measure
+        if any(event.type in INPUT_EVENTS for event in events):
+            self._pending.append((previous, now))
+
+    def take_pending(self) -> List[tuple]:
+        """
+        Hand over the polls no flip has shown yet, e.g. to a frame drawn on another thread.
+
+        Returns:
+            Poll stamps to pass to ``presented`` once that frame is shown
+        """
+        pending, self._pending = self._pending, []
+        return pending
+
+    def presented(self, now: Optional[float] = None,
+                  polls: Optional[Sequence[tuple]] = None) -> List[float]:
+        """
+        Record the flip that first shows the pending input.
+
+        Args:
+            now: Time ``display.flip`` returned (defaults to now)
+            polls: Poll stamps from ``take_pending`` shown by this flip
+                (defaults to the polls still pending)
+
+        Returns:
+            Input-to-flip latencies measured by this flip, in seconds
+        """
+        pending = self._pending if polls is None else polls
+        if not pending:
+            return []
+        now = time.perf_counter() if now is None else now
+        latencies = []
+        for previous, polled in pending:
+            self.polled.append(now - polled)
+            latencies.append(now - (previous + polled) / 2)
+        self.samples.extend(latencies)
+        self.events += len(latencies)
+        if polls is None:
+            self._pending.clear()
+        return latencies
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Summarize the recent latencies.
+
+        Returns:
+            Percentiles and maximum in milliseconds, empty if nothing was measured
+        """
+        if not self.samples:
+            return {}
+        ordered = sorted(self.samples)
+        polled = sorted(self.polled)
+
+        def percentile(values: List[float], fraction: float) -> float:
+            return round(values[min(len(values) - 1, int(fraction * len(values)))] * 1000, 2)
+
+        return {
+            "p50_ms": percentile(ordered, 0.50),
+            "p95_ms": percentile(ordered, 0.95),
+            "p99_ms": percentile(ordered, 0.99),
+            "max_ms": round(ordered[-1] * 1000, 2),
+            "poll_to_flip_p50_ms": percentile(polled, 0.50),
+        }
+
+
+class LateLatchPacer:
+    """
+    Frame pacing that sleeps before input instead of after rendering.
+
+    The usual loop polls input, renders, flips and then sleeps off the rest
+    of the frame, so input that arrives during the sleep waits for the next
+    frame's poll, and with a vsynced display the flip also blocks until the
+    next refresh. The pacer instead sleeps at the start of the frame until
+    just enough time is left to render it before the next presentation
+    deadline, so input is polled as late as possible. The render time is
+    predicted from recent frames, jumping up on a slow frame and easing
+    back down slowly.
+
+    Attributes:
+        period: Target time between presented frames in seconds
+        work: Predicted time from poll to flip in seconds
+        missed: Frames presented after their deadline
+    """
+
+    def __init__(self, fps: int, margin_ms: float = LATE_LATCH_MARGIN_MS,
+                 spin_ms: float = LATE_LATCH_SPIN_MS):
+        """
+        Initialize the pacer.
+
+        Args:
+            fps: Target frame rate
+            margin_ms: Safety margin kept before each deadline
+            spin_ms: Final part of the wait spent polling the clock instead of sleeping
+        """
+        self.period = 1 / fps
+        self.margin = margin_ms / 1000
+        self.spin = spin_ms / 1000
+        self.work = 0.0
+        self.missed = 0
+        self._deadline: Optional[float] = None
+        self._frame_start = 0.0
+
+    def wait(self) -> float:
+        """
+        Sleep until it is time to poll input for the next frame.
+
+        Returns:
+            Seconds waited
+        """
+        start = time.perf_counter()
+        if self._deadline is not None:
+            wake = self._deadline - self.work - self.margin
+            remaining = wake - start
+            if remaining > self.spin:
+                time.sleep(remaining - self.spin)
+            while time.perf_counter() < wake:
+                pass
+        self._frame_start = time.perf_counter()
+        return self._frame_start - start
+
+    def presented(self) -> None:
+        """Record that the frame started by ``wait`` has been flipped."""
+        now = time.perf_counter()
+        work = now - self._frame_start
+        self.work = work if work > self.work else self.work * 0.95 + work * 0.05
+        if self._deadline is None or now > self._deadline + self.margin:
+            if self._deadline is not None:
+                self.missed += 1
+            self._deadline = now + self.period
+        else:
+            self._deadline += self.period
@@ -0,0 +1,363 @@
+"""
+Level data for the Escape-WE-Project game.
+Compiles the editable level source into a compact binary file and reads levels from it on demand.
+
+Usage:
+    python levels.py [--source levels.json] [--output levels.bin]
+"""
+
+import argparse
+import json
+import logging
+import mmap
+import os
+import random
+import struct
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from config import (
+    ENEMY_SIZE, TILE_SIZE, LEVEL_WIDTH, LEVEL_CHUNK_WIDTH, LEVEL_SOURCE_PATH, LEVEL_DATA_PATH,
+    ASSETS
+)
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"ESCL"
+VERSION = 2
+
+# Placeholder for a coordinate chosen from the level seed when the level is built
+AUTO = -0x80000000
+
+# Entity kinds stored in the entity table
+CHEST, DOOR, KEY, ENEMY, PLATFORM = range(5)
+KIND_NAMES = {"chest": CHEST, "door": DOOR, "key": KEY, "enemy": ENEMY, "platform": PLATFORM}
+
+# Level flags
+GENERATE_PLATFORMS = 1
+
+_HEADER = struct.Struct("<4sHHI")  # magic, version, level count, string table offset
+_INDEX = struct.Struct("<II")  # record offset, record size
+# seed, width, background asset, flags, chunk width, global entity count, chunk count
+_LEVEL = struct.Struct("<IIHHHHI")
+_CHUNK = struct.Struct("<I")  # index of a chunk's first entity
+_ENTITY = struct.Struct("<BHiii")  # kind, asset, x, y, extra
+
+# Entities that exist once per level and are always loaded
+GLOBAL_KINDS = (CHEST, DOOR, KEY)
+
+
+@dataclass(frozen=True)
+class EntitySpec:
+    """
+    One row of a level's entity table.
+
+    Attributes:
+        kind: Entity kind (CHEST, DOOR, KEY, ENEMY or PLATFORM)
+        asset: ASSETS key of the entity's sprite, empty for the default
+        x: Horizontal position, or AUTO to place it from the seed
+        y: Vertical position, or AUTO to stand it on the ground
+        extra: Kind-specific value (platform length in tiles)
+    """
+
+    kind: int
+    asset: str
+    x: int
+    y: int
+    extra: int
+
+
+@dataclass
+class LevelData:
+    """
+    Decoded header of one level.
+
+    Enemies and platforms are not decoded here; they are stored by chunk
+    and read with ``LevelLibrary.chunk`` when a chunk is loaded.
+
+    Attributes:
+        number: Level number, starting at 1
+        seed: Seed for everything the level leaves to chance
+        width: Level width in pixels
+        background: ASSETS key of the background image
+        generate_platforms: Whether platforms are generated from the seed
+        chunk_width: Width of a chunk in pixels
+        chunk_count: Number of chunks
+        globals: Chest, door and key entities
+        offset: File offset of the level's chunk index
+    """
+
+    number: int
+    seed: int
+    width: int
+    background: str
+    generate_platforms: bool
+    chunk_width: int
+    chunk_count: int
+    globals: List[EntitySpec] = field(default_factory=list)
+    offset: int = 0
+
+
+def compile_levels(source_path: str = LEVEL_SOURCE_PATH,
+                   output_path: str = LEVEL_DATA_PATH) -> int:
+    """
+    Compile the level source file into the binary level file.
+
+    The source holds a ``levels`` list. Each level has a ``seed``, an
+    optional ``width`` and ``background``, an ``entities`` list of objects
+    with a ``kind`` (chest, door, key, enemy) and optional ``x``, ``y`` and
+    ``asset``, and optional ``platforms`` as ``[column, row, length]``
+    lists; levels without platforms get generated ones.
+
+    Args:
+        source_path: Editable JSON level source
+        output_path: Binary file to write
+
+    Returns:
+        Number of levels compiled
+
+    Raises:
+        ValueError: If the source is malformed or references an unknown asset or kind
+    """
+    with open(source_path, encoding="utf-8") as source_file:
+        source = json.load(source_file)
+
+    strings: Dict[str, int] = {"": 0}
+
+    def intern(name: str) -> int:
+        if name and name not in ASSETS:
+            raise ValueError(f"Unknown asset: {name}")
+        return strings.setdefault(name, len(strings))
+
+    def coordinate(value: Optional[int]) -> int:
+        return AUTO if value is None else int(value)
+
+    records = []
+    for number, level in enumerate(source["levels"], start=1):
+        seed = int(level["seed"]) & 0xFFFFFFFF
+        width = int(level.get("width", LEVEL_WIDTH))
+        chunk_count = max(1, -(-width // LEVEL_CHUNK_WIDTH))
+        # Enemies left to chance are placed now, so each can be filed under its chunk
+        placement = random.Random(seed)
+        global_entities = []
+        chunks: List[List[Tuple[int, bytes]]] = [[] for _ in range(chunk_count)]
+        for entity in level.get("entities", []):
+            kind = KIND_NAMES.get(entity.get("kind"))
+            if kind is None or kind == PLATFORM:
+                raise ValueError(f"Level {number}: unknown entity kind {entity.get('kind')}")
+            x = coordinate(entity.get("x"))
+            if kind == ENEMY and x == AUTO:
+                x = placement.randint(0, width - ENEMY_SIZE)
+            packed = _ENTITY.pack(kind, intern(entity.get("asset", "")),
+                                  x, coordinate(entity.get("y")), 0)
+            if kind in GLOBAL_KINDS:
+                global_entities.append(packed)
+            else:
+                chunks[min(chunk_count - 1, max(0, x // LEVEL_CHUNK_WIDTH))].append((x, packed))
+        platforms = level.get("platforms")
+        for column, row, length in platforms or []:
+            x = column * TILE_SIZE
+            chunks[min(chunk_count - 1, max(0, x // LEVEL_CHUNK_WIDTH))].append(
+                (x, _ENTITY.pack(PLATFORM, 0, column, row, length))
+            )
+        flags = 0 if platforms else GENERATE_PLATFORMS
+
+        starts = []
+        chunk_entities = []
+        for chunk in chunks:
+            starts.append(_CHUNK.pack(len(chunk_entities)))
+            chunk_entities.extend(packed for _, packed in sorted(chunk, key=lambda entry: entry[0]))
+        starts.append(_CHUNK.pack(len(chunk_entities)))
+        records.append(_LEVEL.pack(
+            seed, width, intern(level.get("background", "background")), flags,
+            LEVEL_CHUNK_WIDTH, len(global_entities), chunk_count
+        ) + b"".join(global_entities) + b"".join(starts) + b"".join(chunk_entities))
+
+    offset = _HEADER.size + _INDEX.size * len(records)
+    index = []
+    for record in records:
+        index.append(_INDEX.pack(offset, len(record)))
+        offset += len(record)
+    string_table = struct.pack("<H", len(strings)) + b"".join(
+        struct.pack("<B", len(encoded)) + encoded
+        for encoded in (name.encode("utf-8") for name in strings)
+    )
+
+    # Written beside the output and moved over it, so a game that has the old
+    # file mapped, or a compile that fails halfway, never sees a partial file
+    temp_path = f"{output_path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, "wb") as output_file:
+            output_file.write(_HEADER.pack(MAGIC, VERSION, len(records), offset))
+            output_file.write(b"".join(index))
+            output_file.write(b"".join(records))
+            output_file.write(string_table)
+        os.replace(temp_path, output_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    logger.info("Compiled %d levels to %s", len(records), output_path,
+                extra={"fields": {"bytes": offset + len(string_table)}})
+    return len(records)
+
+
+class LevelLibrary:
+    """
+    Read-only view of a compiled level file.
+
+    The file is memory-mapped; opening it reads only the header, the level
+    index and the asset names. A level's header is decoded when that level
+    is loaded, and the entities of each chunk only when that chunk is read.
+
+    Attributes:
+        path: Compiled level file
+        count: Number of levels
+    """
+
+    def __init__(self, path: str = LEVEL_DATA_PATH):
+        """
+        Map a compiled level file.
+
+        Args:
+            path: Compiled level file
+
+        Raises:
+            ValueError: If the file is not a compiled level file of this version
+        """
+        self.path = path
+        with open(path, "rb") as level_file:
+            self._data = mmap.mmap(level_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.count, strings_offset = _HEADER.unpack_from(self._data, 0)
+        if magic != MAGIC or version != VERSION:
+            self._data.close()
+            raise ValueError(f"{path} is not a version {VERSION} level file")
+        self._index: List[Tuple[int, int]] = [
+            _INDEX.unpack_from(self._data, _HEADER.size + i * _INDEX.size) for i in range(self.count)
+        ]
+        (string_count,) = struct.unpack_from("<H", self._data, strings_offset)
+        self._strings: List[str] = []
+        position = strings_offset + 2
+        for _ in range(string_count):
+            length = self._data[position]
+            self._strings.append(self._data[position + 1:position + 1 + length].decode("utf-8"))
+            position += 1 + length
+        self._cache: Dict[int, LevelData] = {}
+
+    def close(self) -> None:
+        """Unmap the file."""
+        self._data.close()
+
+    def load(self, number: int) -> LevelData:
+        """
+        Decode one level's header and global entities.
+
+        Args:
+            number: Level number, starting at 1
+
+        Returns:
+            Level header
+
+        Raises:
+            IndexError: If there is no such level
+        """
+        level = self._cache.get(number)
+        if level is not None:
+            return level
+        if not 1 <= number <= self.count:
+            raise IndexError(f"No level {number} in {self.path}")
+        offset, _ = self._index[number - 1]
+        (seed, width, background, flags, chunk_width,
+         global_count, chunk_count) = _LEVEL.unpack_from(self._data, offset)
+        offset += _LEVEL.size
+        level = LevelData(number, seed, width, self._strings[background],
+                          bool(flags & GENERATE_PLATFORMS), chunk_width, chunk_count,
+                          self._entities(offset, global_count),
+                          offset + global_count * _ENTITY.size)
+        self._cache[number] = level
+        return level
+
+    def chunk(self, level: LevelData, index: int) -> List[EntitySpec]:
+        """
+        Decode the enemies and platforms of one chunk.
+
+        Args:
+            level: Level header from ``load``
+            index: Chunk index
+
+        Returns:
+            Entities of the chunk, ordered by x
+        """
+        first, = _CHUNK.unpack_from(self._data, level.offset + index * _CHUNK.size)
+        end, = _CHUNK.unpack_from(self._data, level.offset + (index + 1) * _CHUNK.size)
+        table = level.offset + (level.chunk_count + 1) * _CHUNK.size
+        return self._entities(table + first * _ENTITY.size, end - first)
+
+    def _entities(self, offset: int, count: int) -> List[EntitySpec]:
+        """Decode ``count`` entity table rows starting at a file offset."""
+        return [
+            EntitySpec(kind, self._strings[asset], x, y, extra)
+            for kind, asset, x, y, extra in _ENTITY.iter_unpack(
+                self._data[offset:offset + count * _ENTITY.size]
+            )
+        ]
+
+
+def is_current(path: str) -> bool:
+    """
+    Check whether a compiled level file exists and has this module's format version.
+
+    Args:
+        path: Compiled level file
+
+    Returns:
+        True if ``LevelLibrary`` can open the file
+    """
+    try:
+        with open(path, "rb") as level_file:
+            magic, version, _, _ = _HEADER.unpack(level_file.read(_HEADER.size))
+    except (OSError, struct.error):
+        return False
+    return magic == MAGIC and version == VERSION
+
+
+def load_levels(source_path: str = LEVEL_SOURCE_PATH,
+                compiled_path: str = LEVEL_DATA_PATH) -> LevelLibrary:
+    """
+    Open the compiled level file, recompiling it first if the source is
+    newer or the file was compiled for another format version.
+
+    If the file cannot be written, e.g. in a read-only install, an
+    existing compiled file of this version is used as it is.
+
+    Args:
+        source_path: Editable JSON level source
+        compiled_path: Compiled level file
+
+    Returns:
+        Level library
+    """
+    current = is_current(compiled_path)
+    if os.path.exists(source_path) and (
+        not current or os.path.getmtime(source_path) > os.path.getmtime(compiled_path)
+    ):
+        try:
+            compile_levels(source_path, compiled_path)
+        except OSError as error:
+            if not current:
+                raise
+            logger.warning("Could not recompile %s, using the existing file: %s", compiled_path, error)
+    return LevelLibrary(compiled_path)
+
+
+def main() -> None:
+    """Compile the level source from the command line."""
+    parser = argparse.ArgumentParser(description="Compile the level source into a binary level file.")
+    parser.add_argument("--source", default=LEVEL_SOURCE_PATH, help="editable JSON level source")
+    parser.add_argument("--output", default=LEVEL_DATA_PATH, help="compiled level file")
+    args = parser.parse_args()
+    count = compile_levels(args.source, args.output)
+    print(f"Compiled {count} levels to {args.output} ({os.path.getsize(args.output)} bytes)")
+
+
+if __name__ == "__main__":
+    main()
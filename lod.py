@@ -0,0 +1,93 @@
+"""
+Simulation level-of-detail scheduling for the Escape-WE-Project game.
+Updates nearby enemies every tick and far-away enemies at a reduced rate.
+"""
+
+import weakref
+from typing import List
+from config import SCREEN_WIDTH, LOD_NEAR_MARGIN, LOD_FAR_INTERVAL
+from enemy import Enemy
+from tracing import tracer
+
+
+class EnemyLODScheduler:
+    """
+    Schedules enemy updates based on their distance from the viewport.
+
+    Enemies on screen or within ``near_margin`` pixels of it are updated
+    every tick. Enemies further away are updated once every
+    ``far_interval`` ticks and catch up on the time they skipped in a single
+    call to ``Enemy.update``, so their walk stays statistically equivalent
+    to a full-rate simulation.
+
+    Attributes:
+        near_margin: Distance in pixels beyond the screen edges that still counts as near
+        far_interval: Number of ticks between updates of far-away enemies
+        frame: Number of ticks scheduled so far
+    """
+
+    def __init__(self, near_margin: int = LOD_NEAR_MARGIN,
+                 far_interval: int = LOD_FAR_INTERVAL):
+        """
+        Initialize the scheduler.
+
+        Args:
+            near_margin: Distance in pixels beyond the screen edges that still counts as near
+            far_interval: Number of ticks between updates of far-away enemies
+        """
+        self.near_margin = near_margin
+        self.far_interval = max(1, far_interval)
+        self.frame = 0
+        # Seconds each far-away enemy still has to catch up on
+        self._pending: weakref.WeakKeyDictionary[Enemy, float] = weakref.WeakKeyDictionary()
+
+    def is_near(self, enemy: Enemy) -> bool:
+        """
+        Check whether an enemy is on screen or close to it.
+
+        Args:
+            enemy: Enemy to check
+
+        Returns:
+            True if the enemy should be updated every tick
+        """
+        return (enemy.x + enemy.width >= -self.near_margin and
+                enemy.x <= SCREEN_WIDTH + self.near_margin)
+
+    def update(self, enemies: List[Enemy], dt: float) -> int:
+        """
+        Advance all enemies by one tick.
+
+        Args:
+            enemies: List of enemies in the level
+            dt: Seconds the tick advances
+
+        Returns:
+            Number of ``Enemy.update`` calls made this tick
+        """
+        self.frame += 1
+        updated = 0
+        for index, enemy in enumerate(enemies):
+            pending = self._pending.get(enemy, 0.0) + dt
+            # Stagger far updates by list position to spread the cost over frames
+            if self.is_near(enemy) or (self.frame + index) % self.far_interval == 0:
+                with tracer.span("Enemy.update"):
+                    enemy.update(pending)
+                self._pending[enemy] = 0.0
+                updated += 1
+            else:
+                self._pending[enemy] = pending
+        return updated
+
+    def flush(self, enemies: List[Enemy]) -> None:
+        """
+        Bring every enemy up to date with all skipped ticks.
+
+        Args:
+            enemies: List of enemies in the level
+        """
+        for enemy in enemies:
+            pending = self._pending.get(enemy, 0.0)
+            if pending:
+                enemy.update(pending)
+                self._pending[enemy] = 0.0
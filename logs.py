@@ -0,0 +1,123 @@
+"""
+Logging setup for the Escape-WE-Project game.
+Routes log records through a bounded queue to a background writer thread.
+"""
+
+import atexit
+import logging
+import logging.handlers
+import queue
+import sys
+from typing import Optional
+from config import LOG_LEVEL, LOG_QUEUE_SIZE, LOG_FORMAT
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that drops records instead of blocking when the queue is full.
+
+    Attributes:
+        dropped: Number of records dropped so far
+    """
+
+    def __init__(self, record_queue: queue.Queue):
+        """
+        Initialize the handler.
+
+        Args:
+            record_queue: Bounded queue shared with the writer thread
+        """
+        super().__init__(record_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """
+        Put a record on the queue without waiting.
+
+        Args:
+            record: Prepared log record
+        """
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class KeyValueFormatter(logging.Formatter):
+    """
+    Formatter that appends structured fields as ``key=value`` pairs.
+
+    Fields are passed with ``extra={"fields": {...}}``, e.g.
+    ``logger.info("Dealt damage", extra={"fields": {"damage": 50}})``.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        """
+        Format a record with its structured fields.
+
+        Args:
+            record: Log record
+
+        Returns:
+            Formatted line
+        """
+        line = super().format(record)
+        fields = getattr(record, "fields", None)
+        if fields:
+            line += " " + " ".join(f"{key}={value}" for key, value in fields.items())
+        return line
+
+
+_handler: Optional[DroppingQueueHandler] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def setup_logging(level: str = LOG_LEVEL, queue_size: int = LOG_QUEUE_SIZE) -> None:
+    """
+    Send all log records to stdout from a background thread.
+
+    Records are written on the writer thread, so a slow stdout (e.g. a
+    journald pipe) never stalls the frame; when the queue is full new
+    records are dropped and counted instead.
+
+    Args:
+        level: Minimum level name to log (DEBUG, INFO, WARNING, ERROR)
+        queue_size: Maximum number of records waiting to be written
+    """
+    global _handler, _listener
+    if _listener:
+        return
+    record_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+    writer = logging.StreamHandler(sys.stdout)
+    writer.setFormatter(KeyValueFormatter(LOG_FORMAT))
+    _handler = DroppingQueueHandler(record_queue)
+    _listener = logging.handlers.QueueListener(record_queue, writer, respect_handler_level=True)
+
+    root = logging.getLogger()
+    root.setLevel(level.upper())
+    root.addHandler(_handler)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """Write out queued records and stop the writer thread."""
+    global _handler, _listener
+    if not _listener:
+        return
+    logging.getLogger().removeHandler(_handler)
+    _listener.stop()
+    if _handler.dropped:
+        sys.stdout.write(f"Dropped {_handler.dropped} log records under load\n")
+    _handler = None
+    _listener = None
+
+
+def dropped_records() -> int:
+    """
+    Get the number of records dropped because the queue was full.
+
+    Returns:
+        Number of dropped records
+    """
+    return _handler.dropped if _handler else 0
@@ -0,0 +1,233 @@
+"""
+Runtime metrics for the Escape-WE-Project game.
+Collects frame and level counters and serves them in Prometheus text format.
+"""
+
+import bisect
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional, Tuple
+from config import (
+    METRICS_HOST, METRICS_PORT, METRICS_FRAME_BUCKETS, METRICS_LATENCY_BUCKETS, IMAGE_CACHE_STATS
+)
+
+logger = logging.getLogger(__name__)
+
+
+class Metrics:
+    """
+    Counters and gauges updated by the game loop.
+
+    The game thread only increments counters and assigns gauges; turning
+    them into Prometheus text happens in ``render``, which runs on the
+    exporter's thread when the endpoint is scraped.
+
+    Attributes:
+        frames: Number of frames presented
+        input_latencies: Number of input-to-flip latencies recorded
+        fps: Frame rate reported by the game clock
+        enemies: Number of enemies in the current level
+        dropped_items: Number of items lying in the current level
+        level_transitions: Number of level setups performed
+        level_transition_seconds: Total time spent in level setups
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = METRICS_FRAME_BUCKETS,
+                 latency_buckets: Tuple[float, ...] = METRICS_LATENCY_BUCKETS):
+        """
+        Initialize all metrics to zero.
+
+        Args:
+            buckets: Upper bounds in seconds of the frame-time histogram buckets
+            latency_buckets: Upper bounds in seconds of the input latency histogram buckets
+        """
+        self.buckets = tuple(sorted(buckets))
+        # One count per bucket plus the +Inf bucket, not cumulative
+        self.frame_bucket_counts: List[int] = [0] * (len(self.buckets) + 1)
+        self.frame_seconds_sum = 0.0
+        self.frames = 0
+        self.latency_buckets = tuple(sorted(latency_buckets))
+        self.latency_bucket_counts: List[int] = [0] * (len(self.latency_buckets) + 1)
+        self.input_latency_seconds_sum = 0.0
+        self.input_latencies = 0
+        self.fps = 0.0
+        self.enemies = 0
+        self.dropped_items = 0
+        self.level_transitions = 0
+        self.level_transition_seconds = 0.0
+        self.level_transition_max_seconds = 0.0
+
+    def record_frame(self, frame_seconds: float, fps: float) -> None:
+        """
+        Count a presented frame.
+
+        Args:
+            frame_seconds: Time since the previous frame
+            fps: Current frame rate reported by the game clock
+        """
+        self.frame_bucket_counts[bisect.bisect_left(self.buckets, frame_seconds)] += 1
+        self.frame_seconds_sum += frame_seconds
+        self.frames += 1
+        self.fps = fps
+
+    def record_input_latency(self, seconds: float) -> None:
+        """
+        Count the time from an input event to the frame that showed it.
+
+        Args:
+            seconds: Input-to-flip latency
+        """
+        self.latency_bucket_counts[bisect.bisect_left(self.latency_buckets, seconds)] += 1
+        self.input_latency_seconds_sum += seconds
+        self.input_latencies += 1
+
+    def record_level_transition(self, seconds: float) -> None:
+        """
+        Count a level setup.
+
+        Args:
+            seconds: Time the setup took
+        """
+        self.level_transitions += 1
+        self.level_transition_seconds += seconds
+        self.level_transition_max_seconds = max(self.level_transition_max_seconds, seconds)
+
+    def render(self) -> str:
+        """
+        Serialize all metrics in the Prometheus text exposition format.
+
+        Returns:
+            Metrics text ending in a newline
+        """
+        lines = _histogram("escape_frame_seconds", "Time between presented frames.",
+                           self.buckets, self.frame_bucket_counts, self.frame_seconds_sum)
+        lines += _histogram("escape_input_latency_seconds",
+                            "Time from input events to the frame that showed them.",
+                            self.latency_buckets, self.latency_bucket_counts,
+                            self.input_latency_seconds_sum)
+        lines += [
+            "# HELP escape_fps Frame rate reported by the game clock.",
+            "# TYPE escape_fps gauge",
+            f"escape_fps {self.fps}",
+            "# HELP escape_entities Entities in the current level.",
+            "# TYPE escape_entities gauge",
+            f'escape_entities{{kind="enemy"}} {self.enemies}',
+            f'escape_entities{{kind="dropped_item"}} {self.dropped_items}',
+            "# HELP escape_asset_cache_total Image loads served from or added to the cache.",
+            "# TYPE escape_asset_cache_total counter",
+            f'escape_asset_cache_total{{result="hit"}} {IMAGE_CACHE_STATS["hits"]}',
+            f'escape_asset_cache_total{{result="miss"}} {IMAGE_CACHE_STATS["misses"]}',
+            "# HELP escape_level_transition_seconds Time spent setting up levels.",
+            "# TYPE escape_level_transition_seconds summary",
+            f"escape_level_transition_seconds_sum {self.level_transition_seconds}",
+            f"escape_level_transition_seconds_count {self.level_transitions}",
+            "# HELP escape_level_transition_max_seconds Slowest level setup so far.",
+            "# TYPE escape_level_transition_max_seconds gauge",
+            f"escape_level_transition_max_seconds {self.level_transition_max_seconds}",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+def _histogram(name: str, description: str, buckets: Tuple[float, ...],
+               counts: List[int], total: float) -> List[str]:
+    """
+    Serialize a histogram kept as per-bucket counts.
+
+    Args:
+        name: Metric name
+        description: HELP text
+        buckets: Upper bounds of the buckets
+        counts: Count of each bucket plus the +Inf bucket, not cumulative
+        total: Sum of the observed values
+
+    Returns:
+        Lines of the metric
+    """
+    counts = list(counts)
+    lines = [f"# HELP {name} {description}", f"# TYPE {name} histogram"]
+    cumulative = 0
+    for bound, count in zip(buckets, counts):
+        cumulative += count
+        lines.append(f'{name}_bucket{{le="{bound}"}} {cumulative}')
+    cumulative += counts[-1]
+    lines += [
+        f'{name}_bucket{{le="+Inf"}} {cumulative}',
+        f"{name}_sum {total}",
+        f"{name}_count {cumulative}",
+    ]
+    return lines
+
+
+class MetricsExporter:
+    """
+    Serves a ``Metrics`` instance over HTTP from a background thread.
+
+    Attributes:
+        metrics: Metrics to serve
+        address: (host, port) the server is bound to once started
+    """
+
+    def __init__(self, metrics: "Metrics", host: str = METRICS_HOST, port: int = METRICS_PORT):
+        """
+        Initialize the exporter without starting it.
+
+        Args:
+            metrics: Metrics to serve
+            host: Interface to bind to
+            port: Port to bind to (0 picks a free port)
+        """
+        self.metrics = metrics
+        self.address = (host, port)
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> bool:
+        """
+        Bind the socket and start serving in a daemon thread.
+
+        Returns:
+            True if the exporter is running
+        """
+        metrics = self.metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args) -> None:
+                # Keep scrapes out of the game's output
+                pass
+
+        try:
+            self._server = ThreadingHTTPServer(self.address, Handler)
+        except OSError as e:
+            logger.error("Error starting metrics exporter on %s: %s", self.address, e)
+            return False
+        self._server.daemon_threads = True
+        self.address = self._server.server_address[:2]
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        name="metrics-exporter", daemon=True)
+        self._thread.start()
+        logger.info("Serving metrics on http://%s:%s/metrics", *self.address)
+        return True
+
+    def stop(self) -> None:
+        """Stop serving and close the socket."""
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+            self._thread = None
+
+
+# Process-wide metrics shared by all modules
+metrics = Metrics()
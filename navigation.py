@@ -0,0 +1,159 @@
+"""
+Enemy navigation for the Escape-WE-Project game.
+Computes one shared flow field towards the player that every enemy samples.
+"""
+
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+from config import GROUND_Y, ENEMY_CHASE_RANGE
+from tilemap import TileMap
+
+# Standing place as (level column, top of the surface stood on)
+Node = Tuple[int, int]
+
+
+class FlowField:
+    """
+    Walking directions towards the player over a level's surfaces.
+
+    The nodes are the surfaces of each tile column: the ground and the top
+    of every platform. An enemy can walk to the same surface in a
+    neighbouring column, or walk off an edge and drop to whatever is below
+    it there, but it cannot climb. A breadth-first search back from the
+    player's node, run only when the player reaches another node, gives
+    every node within ``chase_range`` the direction of its next step, so an
+    enemy looks up its direction in O(1) however many enemies there are.
+
+    Positions are in screen coordinates and converted with the tile map's
+    ``offset_x``, like the tile map's own queries.
+
+    Attributes:
+        tilemap: Platforms the field is computed over
+        chase_range: Longest path, in pixels, over which enemies chase
+        goal: Node the player stands on or will land on
+        goal_x: Player's center in level pixels
+    """
+
+    def __init__(self, tilemap: Optional[TileMap] = None,
+                 chase_range: int = ENEMY_CHASE_RANGE):
+        """
+        Initialize an empty field.
+
+        Args:
+            tilemap: Platforms to navigate, the bare ground if None
+            chase_range: Longest path, in pixels, over which enemies chase
+        """
+        self.tilemap = tilemap
+        self.chase_range = chase_range
+        self.goal: Optional[Node] = None
+        self.goal_x = 0.0
+        self._directions: Dict[Node, int] = {}
+        self._predecessors: Optional[Dict[Node, List[Tuple[Node, int]]]] = None
+
+    def set_tilemap(self, tilemap: Optional[TileMap]) -> None:
+        """
+        Navigate a different tile map, e.g. after chunks were streamed in.
+
+        Args:
+            tilemap: New platforms
+        """
+        self.tilemap = tilemap
+        self._predecessors = None
+        self.goal = None
+
+    def _tile_size(self) -> int:
+        """Get the width of a node's column."""
+        return self.tilemap.tile_size if self.tilemap else 1
+
+    def _offset(self) -> float:
+        """Get the scroll offset that converts screen to level coordinates."""
+        return self.tilemap.offset_x if self.tilemap else 0
+
+    def _surfaces(self, column: int) -> Tuple[int, ...]:
+        """Get the tops of the surfaces in a level column, from the highest down."""
+        return self.tilemap.surface_tops(column - self.tilemap.origin_column) + (GROUND_Y,)
+
+    def _landing(self, column: int, top: int) -> int:
+        """Get the surface an enemy at height ``top`` reaches in a column."""
+        for surface in self._surfaces(column):
+            if surface >= top:
+                return surface
+        return GROUND_Y
+
+    def _build_graph(self) -> Dict[Node, List[Tuple[Node, int]]]:
+        """Map each node to the nodes that step onto it and the direction of that step."""
+        predecessors: Dict[Node, List[Tuple[Node, int]]] = {}
+        first = self.tilemap.origin_column
+        for column in range(first, first + self.tilemap.columns):
+            for top in self._surfaces(column):
+                for direction in (-1, 1):
+                    target = (column + direction, self._landing(column + direction, top))
+                    predecessors.setdefault(target, []).append(((column, top), direction))
+        return predecessors
+
+    def update(self, left: float, right: float, bottom: float) -> None:
+        """
+        Point the field at the player.
+
+        Args:
+            left: Left edge of the player in screen coordinates
+            right: Right edge of the player in screen coordinates
+            bottom: Feet of the player
+        """
+        center = (left + right) / 2
+        self.goal_x = center + self._offset()
+        if self.tilemap is None:
+            self.goal = (0, GROUND_Y)
+            return
+        size = self._tile_size()
+        column = int(self.goal_x) // size
+        goal = (column, int(self.tilemap.ground_below(center, center + 1, bottom)))
+        if goal == self.goal:
+            return
+        self.goal = goal
+        if self._predecessors is None:
+            self._predecessors = self._build_graph()
+
+        directions = {goal: 0}
+        queue = deque([(goal, 0)])
+        limit = self.chase_range // size
+        while queue:
+            node, distance = queue.popleft()
+            if distance >= limit:
+                continue
+            for previous, direction in self._predecessors.get(node, ()):
+                if previous not in directions:
+                    directions[previous] = direction
+                    queue.append((previous, distance + 1))
+        self._directions = directions
+
+    def direction(self, x: float, bottom: float) -> int:
+        """
+        Get the direction to walk from a standing position.
+
+        Args:
+            x: Center of the walker in screen coordinates
+            bottom: Feet of the walker
+
+        Returns:
+            -1 or 1 to walk towards the player, 0 if the player is out of
+            reach or the walker is already there
+        """
+        if self.goal is None:
+            return 0
+        level_x = x + self._offset()
+        if self.tilemap is None:
+            distance = self.goal_x - level_x
+            if abs(distance) > self.chase_range or abs(distance) < 1:
+                return 0
+            return 1 if distance > 0 else -1
+        column = int(level_x) // self._tile_size()
+        # A walker overhanging an edge navigates from where it is about to land
+        node = (column, self._landing(column, int(bottom)))
+        direction = self._directions.get(node)
+        if direction is None:
+            return 0
+        if direction == 0 and abs(self.goal_x - level_x) >= 1:
+            # Same column as the player: close the last few pixels
+            return 1 if self.goal_x > level_x else -1
+        return direction
@@ -0,0 +1,709 @@
+"""
+Client/server play for the Escape-WE-Project game.
+Runs the simulation as an authoritative server that streams delta-compressed
+snapshots to thin pygame clients, which send their input back.
+
+Usage:
+    python netplay.py serve [--port PORT | --unix PATH]
+    python netplay.py connect [--port PORT | --unix PATH]
+"""
+
+import argparse
+import json
+import logging
+import selectors
+import socket
+import struct
+import time
+from collections import deque
+from dataclasses import asdict
+from typing import Any, Deque, Dict, List, Optional, Tuple
+import pygame
+from config import (
+    SCREEN_WIDTH, SCREEN_HEIGHT, FPS, WHITE, RED, SERVER_HOST, SERVER_PORT,
+    SERVER_TICK_RATE, SERVER_MAX_OUTGOING_BYTES, MAX_MESSAGE_BYTES, INTERPOLATION_DELAY_TICKS,
+    LEVEL_WIDTH, ENEMY_SIZE, CHEST_SIZE, DOOR_SIZE, KEY_SIZE, load_image, ASSETS
+)
+from simulation import InputSnapshot, Simulation, Snapshot, init_headless
+from tilemap import TileMap
+from logs import setup_logging
+
+logger = logging.getLogger(__name__)
+
+_HEADER = struct.Struct("!I")
+
+
+def encode_message(message: Dict[str, Any]) -> bytes:
+    """
+    Frame a message as a length-prefixed compact JSON document.
+
+    Args:
+        message: JSON-serializable message
+
+    Returns:
+        Bytes ready to send
+    """
+    body = json.dumps(message, separators=(",", ":")).encode("utf-8")
+    return _HEADER.pack(len(body)) + body
+
+
+class MessageReader:
+    """Splits a byte stream back into framed messages."""
+
+    def __init__(self, max_length: int = MAX_MESSAGE_BYTES):
+        """
+        Initialize an empty reader.
+
+        Args:
+            max_length: Largest message body accepted, so a peer cannot make
+                the buffer grow without bound
+        """
+        self.max_length = max_length
+        self._buffer = bytearray()
+
+    def feed(self, data: bytes) -> List[Dict[str, Any]]:
+        """
+        Add received bytes and return every message completed by them.
+
+        Args:
+            data: Bytes read from the socket
+
+        Returns:
+            Decoded messages in arrival order
+
+        Raises:
+            ValueError: If a message is too long, not valid JSON or not an object
+        """
+        self._buffer += data
+        messages = []
+        while len(self._buffer) >= _HEADER.size:
+            (length,) = _HEADER.unpack_from(self._buffer)
+            if length > self.max_length:
+                raise ValueError(f"Message of {length} bytes exceeds {self.max_length}")
+            end = _HEADER.size + length
+            if len(self._buffer) < end:
+                break
+            message = json.loads(self._buffer[_HEADER.size:end])
+            if not isinstance(message, dict):
+                raise ValueError(f"Message is a {type(message).__name__}, not an object")
+            messages.append(message)
+            del self._buffer[:end]
+        return messages
+
+
+def read_input(fields: Dict[str, Any]) -> InputSnapshot:
+    """
+    Build an input snapshot from a client's input message.
+
+    Args:
+        fields: Decoded ``input`` object of the message
+
+    Returns:
+        Input snapshot
+
+    Raises:
+        TypeError: If a field is unknown or missing
+        ValueError: If the cursor is not a number
+    """
+    inputs = InputSnapshot(**fields)
+    for value in (inputs.cursor_x, inputs.cursor_y):
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError(f"Cursor coordinate {value!r} is not a number")
+    return inputs
+
+
+def diff_snapshots(base: Snapshot, current: Snapshot) -> Tuple[Snapshot, List[str]]:
+    """
+    Compute the entities that changed between two snapshots.
+
+    Args:
+        base: Snapshot the receiver already has
+        current: New snapshot
+
+    Returns:
+        Tuple of (changed or new entity states, removed entity ids)
+    """
+    changed = {entity_id: state for entity_id, state in current.items()
+               if base.get(entity_id) != state}
+    removed = [entity_id for entity_id in base if entity_id not in current]
+    return changed, removed
+
+
+def apply_delta(base: Snapshot, changed: Snapshot, removed: List[str]) -> Snapshot:
+    """
+    Rebuild a snapshot from its base and a delta.
+
+    Args:
+        base: Snapshot the delta was computed against
+        changed: Changed or new entity states
+        removed: Removed entity ids
+
+    Returns:
+        The new snapshot
+    """
+    state = {entity_id: values for entity_id, values in base.items() if entity_id not in removed}
+    state.update(changed)
+    return state
+
+
+class _Connection:
+    """Server-side state of one connected client."""
+
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self.reader = MessageReader()
+        self.baseline: Snapshot = {}
+        self.outgoing = bytearray()
+        # Sizes of the messages queued in outgoing; the first may be partly sent
+        self.queued: Deque[int] = deque()
+        self.partly_sent = False
+
+
+class SimulationServer:
+    """
+    Runs a ``Simulation`` at a fixed tick and streams snapshots to clients.
+
+    Each tick the server applies the latest input received from its clients,
+    steps the simulation and sends every client only the entities that
+    changed since the snapshot it was last sent. Sockets are non-blocking
+    and multiplexed with ``selectors``, so a slow client never stalls a tick.
+
+    Attributes:
+        simulation: Simulation being served
+        ticks: Number of ticks served
+        bytes_sent: Total snapshot bytes queued for clients
+        serialize_seconds: Total time spent diffing and encoding snapshots
+        max_outgoing: Bytes queued for a client before it is resynced
+    """
+
+    def __init__(self, simulation: Simulation, tick_rate: int = SERVER_TICK_RATE,
+                 max_outgoing: int = SERVER_MAX_OUTGOING_BYTES):
+        """
+        Initialize the server without opening a listening socket.
+
+        Args:
+            simulation: Simulation to serve
+            tick_rate: Ticks per second
+            max_outgoing: Bytes queued for a client before its unsent
+                snapshots are dropped for a full one
+        """
+        self.simulation = simulation
+        self.tick_rate = tick_rate
+        self.max_outgoing = max_outgoing
+        self.selector = selectors.DefaultSelector()
+        self.listener: Optional[socket.socket] = None
+        self.connections: List[_Connection] = []
+        self.pending_input = InputSnapshot()
+        self.ticks = 0
+        self.bytes_sent = 0
+        self.serialize_seconds = 0.0
+        self.max_serialize_seconds = 0.0
+
+    def listen(self, host: str = SERVER_HOST, port: int = SERVER_PORT,
+               unix_path: Optional[str] = None) -> Any:
+        """
+        Open a listening TCP or Unix socket.
+
+        Args:
+            host: Interface to bind to
+            port: TCP port (0 picks a free port)
+            unix_path: Unix socket path, used instead of TCP when given
+
+        Returns:
+            The bound address
+        """
+        if unix_path:
+            self.listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.listener.bind(unix_path)
+        else:
+            self.listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self.listener.bind((host, port))
+        self.listener.listen()
+        self.listener.setblocking(False)
+        self.selector.register(self.listener, selectors.EVENT_READ)
+        address = self.listener.getsockname()
+        logger.info("Simulation server listening on %s", address)
+        return address
+
+    def add_connection(self, sock: socket.socket) -> None:
+        """
+        Start serving an already connected socket.
+
+        Args:
+            sock: Connected socket
+        """
+        if sock.family in (socket.AF_INET, socket.AF_INET6):
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setblocking(False)
+        connection = _Connection(sock)
+        self.connections.append(connection)
+        self.selector.register(sock, selectors.EVENT_READ, connection)
+
+    def _drop_connection(self, connection: _Connection) -> None:
+        """Forget a disconnected client."""
+        self.selector.unregister(connection.sock)
+        connection.sock.close()
+        self.connections.remove(connection)
+
+    def _poll(self) -> None:
+        """Accept new clients and read pending input without blocking."""
+        for key, _ in self.selector.select(timeout=0):
+            if key.fileobj is self.listener:
+                sock, _ = self.listener.accept()
+                self.add_connection(sock)
+                continue
+            connection: _Connection = key.data
+            try:
+                data = connection.sock.recv(65536)
+            except (BlockingIOError, InterruptedError):
+                continue
+            except OSError:
+                data = b""
+            if not data:
+                self._drop_connection(connection)
+                continue
+            try:
+                for message in connection.reader.feed(data):
+                    if message.get("type") == "input":
+                        self.pending_input = self.pending_input.merge(read_input(message["input"]))
+            except (ValueError, TypeError, KeyError, AttributeError) as error:
+                # One bad client must not stop the tick loop for the others
+                logger.warning("Dropping client after a malformed message: %s", error)
+                self._drop_connection(connection)
+
+    def _send(self, connection: _Connection, snapshot: Snapshot) -> None:
+        """
+        Queue a delta snapshot for a client and write as much as the socket takes.
+
+        A client that falls more than ``max_outgoing`` bytes behind has its
+        unsent snapshots dropped and is sent the full state instead, so a
+        stalled client costs bounded memory and catches up in one message.
+        """
+        if len(connection.outgoing) > self.max_outgoing:
+            # Keep the rest of a partly sent message so the stream stays framed
+            keep = connection.queued[0] if connection.partly_sent else 0
+            logger.warning("Client fell behind, resending the full state",
+                           extra={"fields": {"dropped_bytes": len(connection.outgoing) - keep}})
+            del connection.outgoing[keep:]
+            connection.queued = deque([keep] if keep else [])
+            connection.baseline = {}
+        changed, removed = diff_snapshots(connection.baseline, snapshot)
+        message = {"type": "snapshot", "tick": self.simulation.tick,
+                   "set": changed, "del": removed}
+        if not connection.baseline:
+            message["full"] = True
+        data = encode_message(message)
+        connection.baseline = snapshot
+        connection.outgoing += data
+        connection.queued.append(len(data))
+        self.bytes_sent += len(data)
+        try:
+            sent = connection.sock.send(connection.outgoing)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            self._drop_connection(connection)
+            return
+        del connection.outgoing[:sent]
+        while sent:
+            if sent >= connection.queued[0]:
+                sent -= connection.queued.popleft()
+                connection.partly_sent = False
+            else:
+                connection.queued[0] -= sent
+                connection.partly_sent = True
+                sent = 0
+
+    def step(self) -> None:
+        """Run one tick: read input, advance the simulation and send snapshots."""
+        self._poll()
+        inputs, self.pending_input = self.pending_input, InputSnapshot(
+            self.pending_input.left, self.pending_input.right,
+            cursor_x=self.pending_input.cursor_x, cursor_y=self.pending_input.cursor_y
+        )
+        self.simulation.step(inputs)
+        self.ticks += 1
+
+        start = time.perf_counter()
+        snapshot = self.simulation.snapshot()
+        for connection in list(self.connections):
+            self._send(connection, snapshot)
+        elapsed = time.perf_counter() - start
+        self.serialize_seconds += elapsed
+        self.max_serialize_seconds = max(self.max_serialize_seconds, elapsed)
+
+    def serve(self, ticks: Optional[int] = None) -> None:
+        """
+        Step at the fixed tick rate until interrupted.
+
+        Args:
+            ticks: Number of ticks to serve (forever if None)
+        """
+        interval = 1 / self.tick_rate
+        next_tick = time.perf_counter()
+        served = 0
+        while ticks is None or served < ticks:
+            self.step()
+            served += 1
+            if served % (self.tick_rate * 10) == 0:
+                logger.info("Server stats", extra={"fields": self.stats()})
+            next_tick += interval
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_tick = time.perf_counter()
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Summarize bandwidth and serialization cost.
+
+        Returns:
+            Average bytes and serialization microseconds per tick
+        """
+        ticks = max(1, self.ticks)
+        return {
+            "ticks": self.ticks,
+            "bytes_per_tick": round(self.bytes_sent / ticks, 1),
+            "kbit_per_second": round(self.bytes_sent * 8 / 1000 / ticks * self.tick_rate, 1),
+            "serialize_us_per_tick": round(self.serialize_seconds / ticks * 1e6, 1),
+            "max_serialize_us": round(self.max_serialize_seconds * 1e6, 1),
+        }
+
+    def close(self) -> None:
+        """Close all sockets."""
+        for connection in list(self.connections):
+            self._drop_connection(connection)
+        if self.listener:
+            self.selector.unregister(self.listener)
+            self.listener.close()
+            self.listener = None
+
+
+class SimulationClient:
+    """
+    Receives snapshots from a server and interpolates between them.
+
+    Attributes:
+        state: Latest full snapshot
+        tick: Tick of the latest snapshot
+        bytes_received: Total bytes received
+        outgoing: Input bytes the socket has not taken yet
+        connected: False once the server closed the connection
+    """
+
+    def __init__(self, sock: socket.socket, tick_rate: int = SERVER_TICK_RATE,
+                 delay_ticks: int = INTERPOLATION_DELAY_TICKS):
+        """
+        Initialize the client on a connected socket.
+
+        Args:
+            sock: Socket connected to the server
+            tick_rate: Server ticks per second
+            delay_ticks: How far behind the latest snapshot to display
+        """
+        self.sock = sock
+        self.sock.setblocking(False)
+        self.tick_rate = tick_rate
+        self.delay = delay_ticks / tick_rate
+        self.reader = MessageReader()
+        self.state: Snapshot = {}
+        self.tick = 0
+        self.bytes_received = 0
+        self.outgoing = bytearray()
+        self.connected = True
+        # (arrival time, tick, snapshot), oldest first
+        self._history: List[Tuple[float, int, Snapshot]] = []
+
+    @classmethod
+    def connect(cls, host: str = SERVER_HOST, port: int = SERVER_PORT,
+                unix_path: Optional[str] = None) -> "SimulationClient":
+        """
+        Connect to a server.
+
+        Args:
+            host: Server host
+            port: Server TCP port
+            unix_path: Unix socket path, used instead of TCP when given
+
+        Returns:
+            Connected client
+        """
+        if unix_path:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.connect(unix_path)
+        else:
+            sock = socket.create_connection((host, port))
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return cls(sock)
+
+    def send_input(self, inputs: InputSnapshot) -> None:
+        """
+        Queue the player's input for the server and send what the socket takes.
+
+        Args:
+            inputs: Input snapshot
+        """
+        self.outgoing += encode_message({"type": "input", "input": asdict(inputs)})
+        self._flush()
+
+    def _flush(self) -> None:
+        """Write as much queued input as the socket takes without blocking."""
+        if not self.outgoing or not self.connected:
+            return
+        try:
+            sent = self.sock.send(self.outgoing)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            self._disconnect()
+            return
+        del self.outgoing[:sent]
+
+    def _disconnect(self) -> None:
+        """Close the socket after the server went away."""
+        if self.connected:
+            logger.info("Disconnected from the server")
+        self.connected = False
+        self.outgoing.clear()
+        self.sock.close()
+
+    def poll(self, now: Optional[float] = None) -> int:
+        """
+        Read and apply every snapshot that has arrived.
+
+        Sets ``connected`` to False and closes the socket once the server
+        has closed the connection.
+
+        Args:
+            now: Arrival timestamp (defaults to the current time)
+
+        Returns:
+            Number of snapshots applied
+        """
+        now = time.perf_counter() if now is None else now
+        self._flush()
+        applied = 0
+        while self.connected:
+            try:
+                data = self.sock.recv(65536)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError:
+                data = b""
+            if not data:
+                self._disconnect()
+                break
+            self.bytes_received += len(data)
+            for message in self.reader.feed(data):
+                if message.get("type") != "snapshot":
+                    continue
+                # A full snapshot replaces the state after the server dropped deltas
+                base = {} if message.get("full") else self.state
+                self.state = apply_delta(base, message["set"], message["del"])
+                self.tick = message["tick"]
+                self._history.append((now, self.tick, self.state))
+                applied += 1
+        # Two snapshots bracketing the display time are all interpolation needs
+        del self._history[:-8]
+        return applied
+
+    def interpolated(self, now: Optional[float] = None) -> Snapshot:
+        """
+        Get entity states at the display time, ``delay`` behind the newest snapshot.
+
+        Positions (the first two values of each entity) are interpolated
+        linearly between the two snapshots around the display time; other
+        values come from the older one.
+
+        Args:
+            now: Current time (defaults to the current time)
+
+        Returns:
+            Interpolated snapshot
+        """
+        if not self._history:
+            return {}
+        now = time.perf_counter() if now is None else now
+        newest_time, newest_tick, _ = self._history[-1]
+        display_tick = newest_tick + (now - newest_time) * self.tick_rate - self.delay * self.tick_rate
+        older = self._history[0]
+        newer = self._history[-1]
+        for entry in self._history:
+            if entry[1] <= display_tick:
+                older = entry
+            else:
+                newer = entry
+                break
+        if newer[1] <= older[1]:
+            return older[2]
+        t = min(1.0, max(0.0, (display_tick - older[1]) / (newer[1] - older[1])))
+        result: Snapshot = {}
+        for entity_id, values in older[2].items():
+            target = newer[2].get(entity_id)
+            if target is None or len(values) < 2 or len(target) < 2 or entity_id in ("level", "tiles"):
+                result[entity_id] = values
+            else:
+                result[entity_id] = [values[0] + (target[0] - values[0]) * t,
+                                     values[1] + (target[1] - values[1]) * t] + values[2:]
+        return result
+
+    def close(self) -> None:
+        """Close the connection."""
+        self.sock.close()
+
+
+def loopback_client(server: SimulationServer) -> SimulationClient:
+    """
+    Connect an in-process stand-in client to a server over a socket pair.
+
+    Useful for tests and measurements: no listening socket is needed and
+    both ends are driven from the calling thread.
+
+    Args:
+        server: Server to connect to
+
+    Returns:
+        Client connected to the server
+    """
+    server_end, client_end = socket.socketpair()
+    server.add_connection(server_end)
+    return SimulationClient(client_end, server.tick_rate)
+
+
+class DisplayClient:
+    """Thin pygame front end that draws interpolated server snapshots."""
+
+    def __init__(self, client: SimulationClient):
+        """
+        Initialize the window and sprites.
+
+        Args:
+            client: Connected simulation client
+        """
+        pygame.init()
+        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        pygame.display.set_caption('Escape (client)')
+        self.client = client
+        self.clock = pygame.time.Clock()
+        self.font = pygame.font.SysFont(None, 36)
+        self.background = load_image(ASSETS['background'], (SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.player_image = load_image(ASSETS['player_sprite'], (200, 200))
+        self.player_flipped = pygame.transform.flip(self.player_image, True, False)
+        self.enemy_images = {
+            kind: load_image(ASSETS[f'enemy{kind}'], (ENEMY_SIZE, ENEMY_SIZE)) for kind in (1, 2, 3)
+        }
+        self.chest_images = (load_image(ASSETS['chest_closed'], CHEST_SIZE),
+                             load_image(ASSETS['chest_open'], CHEST_SIZE))
+        self.door_image = load_image(ASSETS['door'], DOOR_SIZE)
+        self.key_image = load_image(ASSETS['key'], KEY_SIZE)
+        self.tilemap: Optional[TileMap] = None
+        self.level_width = LEVEL_WIDTH
+        self.inputs = InputSnapshot()
+
+    def run(self) -> None:
+        """Run the display loop until the window is closed."""
+        running = True
+        camera = 0.0
+        while running:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
+                    self.inputs.jump = True
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_e:
+                    self.inputs.interact = True
+                elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                    self.inputs.attack = True
+            keys = pygame.key.get_pressed()
+            mouse_x, mouse_y = pygame.mouse.get_pos()
+            self.inputs.left = keys[pygame.K_a]
+            self.inputs.right = keys[pygame.K_d]
+            self.inputs.cursor_x = mouse_x + camera
+            self.inputs.cursor_y = mouse_y
+            self.client.send_input(self.inputs)
+            self.inputs = InputSnapshot()
+
+            self.client.poll()
+            if not self.client.connected:
+                running = False
+            state = self.client.interpolated()
+            level = state.get("level")
+            if level and len(level) > 1:
+                self.level_width = level[1]
+            player = state.get("player")
+            if player:
+                camera = min(max(0.0, player[0] - SCREEN_WIDTH / 2), self.level_width - SCREEN_WIDTH)
+            self._draw(state, camera)
+            pygame.display.flip()
+            self.clock.tick(FPS)
+        self.client.close()
+        pygame.quit()
+
+    def _draw(self, state: Snapshot, camera: float) -> None:
+        """Draw one interpolated snapshot with the camera at the given x offset."""
+        self.screen.fill(WHITE)
+        offset = -(int(camera) % SCREEN_WIDTH)
+        self.screen.blit(self.background, (offset, 0))
+        self.screen.blit(self.background, (offset + SCREEN_WIDTH, 0))
+        tiles = state.get("tiles")
+        if tiles is not None:
+            platforms = [tuple(tiles[i:i + 3]) for i in range(0, len(tiles), 3)]
+            if self.tilemap is None or self.tilemap.platforms != platforms:
+                # The server only sends the platforms of its loaded chunks
+                origin = min((platform[0] for platform in platforms), default=0)
+                columns = max((column + length for column, _, length in platforms), default=0)
+                self.tilemap = TileMap(columns - origin, platforms, origin_column=origin)
+            self.tilemap.offset_x = camera
+            self.tilemap.draw(self.screen)
+        for entity_id, values in state.items():
+            x, y = values[0] - camera, values[1] if len(values) > 1 else 0
+            if entity_id == "door" and not values[2]:
+                self.screen.blit(self.door_image, (x, y))
+            elif entity_id == "chest":
+                self.screen.blit(self.chest_images[int(values[2])], (x, y))
+            elif entity_id == "key":
+                self.screen.blit(self.key_image, (x, y))
+            elif entity_id.startswith("e"):
+                image = self.enemy_images.get(int(values[3]), self.enemy_images[1])
+                if values[2] < 0:
+                    image = pygame.transform.flip(image, True, False)
+                self.screen.blit(image, (x, y))
+        player = state.get("player")
+        if player:
+            image = self.player_flipped if player[2] else self.player_image
+            self.screen.blit(image, (player[0] - camera, player[1]))
+            health = self.font.render(f"Health: {player[3]:g}  Lives: {player[4]}", True, RED)
+            self.screen.blit(health, (10, 10))
+
+
+def main() -> None:
+    """Run a server or a display client from the command line."""
+    parser = argparse.ArgumentParser(description="Escape client/server play")
+    parser.add_argument("mode", choices=["serve", "connect"])
+    parser.add_argument("--host", default=SERVER_HOST)
+    parser.add_argument("--port", type=int, default=SERVER_PORT)
+    parser.add_argument("--unix", default=None, metavar="PATH", help="use a Unix socket instead of TCP")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    setup_logging()
+
+    if args.mode == "serve":
+        init_headless()
+        server = SimulationServer(Simulation(args.seed))
+        server.listen(args.host, args.port, args.unix)
+        try:
+            server.serve()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            logger.info("Server stats", extra={"fields": server.stats()})
+            server.close()
+    else:
+        client = SimulationClient.connect(args.host, args.port, args.unix)
+        DisplayClient(client).run()
+
+
+if __name__ == "__main__":
+    main()
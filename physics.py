@@ -0,0 +1,266 @@
+"""
+Rigid-body physics for the Escape-WE-Project game.
+Advances the vertical motion of the player, keys and dropped items in one batched step.
+"""
+
+from array import array
+from typing import List, Optional, Set
+import pygame
+from config import GROUND_Y, CEILING_Y
+from tilemap import TileMap
+
+
+def ground_top(height: float, offset: float = 0) -> float:
+    """
+    Get the y coordinate at which an object rests on the ground.
+
+    Args:
+        height: Height of the object
+        offset: Distance kept between the object and the ground
+
+    Returns:
+        Top edge of the resting object
+    """
+    return GROUND_Y - height - offset
+
+
+class PhysicsWorld:
+    """
+    Falling bodies stored in contiguous arrays and stepped together.
+
+    Each body is a slot in parallel ``array`` columns (top, velocity,
+    gravity, height and resting top on the ground), so a step is one tight loop over the awake
+    slots instead of a method call per object. A body that lands is put to
+    sleep and costs nothing until it is woken, either explicitly (a jump, a
+    drop) or by a falling body touching it, so hundreds of items lying on
+    the ground keep the step cost flat. With a ``tilemap``, bodies land on
+    its platforms, looked up in the columns under each falling body.
+
+    Bodies are any objects with a ``rect`` and an
+    ``on_physics_step(top, velocity, resting)`` method, which the world
+    calls after each step the body was awake for. The world stores the
+    body's slot in its ``physics_handle`` attribute.
+
+    Attributes:
+        tilemap: Platforms bodies can land on, if any
+        body_count: Number of bodies in the world
+        awake_count: Number of bodies that are currently simulated
+    """
+
+    def __init__(self, tilemap: Optional[TileMap] = None):
+        """
+        Initialize an empty world.
+
+        Args:
+            tilemap: Platforms bodies can land on
+        """
+        self.tilemap = tilemap
+        self._top = array("d")
+        self._height = array("d")
+        self._velocity = array("d")
+        self._gravity = array("d")
+        self._rest = array("d")
+        self._bodies: List[Optional[object]] = []
+        self._free: List[int] = []
+        self._awake: Set[int] = set()
+        self._sleeping_rects: Optional[List[pygame.Rect]] = None
+        self._sleeping_handles: List[int] = []
+
+    @property
+    def body_count(self) -> int:
+        """Number of bodies in the world."""
+        return len(self._bodies) - len(self._free)
+
+    @property
+    def awake_count(self) -> int:
+        """Number of bodies that are currently simulated."""
+        return len(self._awake)
+
+    def add(self, body, top: float, height: float, gravity: float,
+            rest_offset: float = 0, awake: bool = True) -> int:
+        """
+        Add a body to the world.
+
+        Args:
+            body: Object moved by the world
+            top: Current top edge of the body
+            height: Height of the body
+            gravity: Downward acceleration in pixels per second squared
+            rest_offset: Distance kept between the body and the ground
+            awake: Whether the body starts falling immediately
+
+        Returns:
+            Handle of the body
+        """
+        rest = ground_top(height, rest_offset)
+        if self._free:
+            handle = self._free.pop()
+            self._top[handle] = top
+            self._velocity[handle] = 0.0
+            self._gravity[handle] = gravity
+            self._height[handle] = height
+            self._rest[handle] = rest
+            self._bodies[handle] = body
+        else:
+            handle = len(self._bodies)
+            self._top.append(top)
+            self._velocity.append(0.0)
+            self._gravity.append(gravity)
+            self._height.append(height)
+            self._rest.append(rest)
+            self._bodies.append(body)
+        body.physics_handle = handle
+        if awake:
+            self._awake.add(handle)
+        else:
+            self._sleeping_rects = None
+        return handle
+
+    def remove(self, body) -> None:
+        """
+        Remove a body from the world.
+
+        Args:
+            body: Body previously added with ``add``
+        """
+        handle = getattr(body, "physics_handle", None)
+        if handle is None or self._bodies[handle] is not body:
+            return
+        self._bodies[handle] = None
+        self._awake.discard(handle)
+        self._free.append(handle)
+        self._sleeping_rects = None
+        body.physics_handle = None
+
+    def clear(self) -> None:
+        """Remove every body."""
+        for body in self._bodies:
+            if body is not None:
+                body.physics_handle = None
+        self.__init__(self.tilemap)
+
+    def place(self, body, top: float) -> None:
+        """
+        Move a body to a new height and let it fall from there.
+
+        Args:
+            body: Body in the world
+            top: New top edge
+        """
+        handle = body.physics_handle
+        self._top[handle] = top
+        self.wake(body, 0.0)
+
+    def wake(self, body, velocity: Optional[float] = None) -> None:
+        """
+        Resume simulating a body.
+
+        Args:
+            body: Body in the world
+            velocity: New vertical velocity in pixels per second (keeps the current one if None)
+        """
+        handle = body.physics_handle
+        if velocity is not None:
+            self._velocity[handle] = velocity
+        if handle not in self._awake:
+            self._awake.add(handle)
+            self._sleeping_rects = None
+
+    def check_support(self, body) -> None:
+        """
+        Wake a resting body if nothing holds it up any more, e.g. after it
+        walked off a platform.
+
+        Args:
+            body: Body in the world
+        """
+        handle = body.physics_handle
+        if self.tilemap is None or handle in self._awake:
+            return
+        if self._rest_top(handle, self._top[handle]) > self._top[handle]:
+            self.wake(body, 0.0)
+
+    def _rest_top(self, handle: int, top: float) -> float:
+        """Get the top a body would rest at below its current position."""
+        rest = self._rest[handle]
+        height = self._height[handle]
+        rect = self._bodies[handle].rect
+        platform = self.tilemap.ground_below(rect.left, rect.right, top + height) - height
+        return platform if platform < rest else rest
+
+    def is_awake(self, body) -> bool:
+        """
+        Check whether a body is being simulated.
+
+        Args:
+            body: Body in the world
+
+        Returns:
+            True if the body is awake
+        """
+        return body.physics_handle in self._awake
+
+    def step(self, dt: float) -> int:
+        """
+        Advance every awake body by a time step.
+
+        Velocities are integrated before positions (semi-implicit Euler),
+        which stays stable when the step length varies from frame to frame.
+
+        Args:
+            dt: Seconds to advance
+
+        Returns:
+            Number of bodies that were simulated
+        """
+        awake = self._awake
+        if not awake:
+            return 0
+        top, velocity, gravity, rest = self._top, self._velocity, self._gravity, self._rest
+        tilemap = self.tilemap
+        handles = list(awake)
+        landed = []
+        falling = []
+        for handle in handles:
+            v = velocity[handle] + gravity[handle] * dt
+            y = top[handle] + v * dt
+            ground = rest[handle] if tilemap is None else self._rest_top(handle, top[handle])
+            if y >= ground:
+                y = ground
+                v = 0.0
+                landed.append(handle)
+            else:
+                if y < CEILING_Y:
+                    y = CEILING_Y
+                falling.append(handle)
+            top[handle] = y
+            velocity[handle] = v
+
+        if landed:
+            awake.difference_update(landed)
+            self._sleeping_rects = None
+
+        bodies = self._bodies
+        for handle in handles:
+            bodies[handle].on_physics_step(top[handle], velocity[handle], handle not in awake)
+
+        if falling:
+            self._wake_touched(falling)
+        return len(handles)
+
+    def _wake_touched(self, falling: List[int]) -> None:
+        """Wake sleeping bodies that a falling body now overlaps."""
+        if self._sleeping_rects is None:
+            self._sleeping_handles = [
+                handle for handle, body in enumerate(self._bodies)
+                if body is not None and handle not in self._awake
+            ]
+            self._sleeping_rects = [self._bodies[handle].rect for handle in self._sleeping_handles]
+        if not self._sleeping_rects:
+            return
+        touched = set()
+        for handle in falling:
+            touched.update(self._bodies[handle].rect.collidelistall(self._sleeping_rects))
+        if touched:
+            self._awake.update(self._sleeping_handles[index] for index in touched)
+            self._sleeping_rects = None
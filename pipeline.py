@@ -0,0 +1,244 @@
+"""
+Pipelined rendering for the Escape-WE-Project game.
+Records each frame's draw calls as an immutable description and draws it on a
+render thread while the next frame is simulated.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+import pygame
+from config import WHITE
+
+logger = logging.getLogger(__name__)
+
+# One recorded blit: (source, (x, y), area or None)
+Blit = Tuple[pygame.Surface, Tuple[int, int], Optional[Tuple[int, int, int, int]]]
+
+
+class DrawList:
+    """
+    Stand-in for a surface that records blits instead of drawing them.
+
+    Entities draw onto it exactly as they would onto the display surface
+    (``blit``, ``get_width``, ``get_height``). Positions and areas are
+    copied when recorded, so rects moved later do not change the frame;
+    sources are kept by reference, which is safe because sprites, atlases
+    and rendered text are never drawn on after they are created.
+
+    Attributes:
+        size: Size of the surface the list stands in for
+        blits: Recorded blits in drawing order
+    """
+
+    def __init__(self, size: Tuple[int, int]):
+        """
+        Initialize an empty list.
+
+        Args:
+            size: Size of the surface the list stands in for
+        """
+        self.size = size
+        self.blits: List[Blit] = []
+
+    def get_width(self) -> int:
+        """Return the width of the surface stood in for."""
+        return self.size[0]
+
+    def get_height(self) -> int:
+        """Return the height of the surface stood in for."""
+        return self.size[1]
+
+    def get_size(self) -> Tuple[int, int]:
+        """Return the size of the surface stood in for."""
+        return self.size
+
+    def blit(self, source: pygame.Surface, dest, area=None) -> None:
+        """
+        Record a blit.
+
+        Args:
+            source: Surface to draw
+            dest: (x, y) position or rect
+            area: Part of the source to draw (defaults to all of it)
+        """
+        self.blits.append((source, (dest[0], dest[1]), None if area is None else tuple(area)))
+
+
+class FrameRecorder(DrawList):
+    """
+    Records one frame: the world layer in ``world`` and the UI on top.
+
+    The game's draw code uses it in place of the display surface and asks
+    for ``world`` where it would otherwise begin the scaled world layer.
+
+    Attributes:
+        world: Blits of the world layer, drawn at the render scale
+    """
+
+    def __init__(self, size: Tuple[int, int]):
+        """
+        Initialize an empty frame.
+
+        Args:
+            size: Size of the display surface
+        """
+        super().__init__(size)
+        self.world = DrawList(size)
+
+    def finish(self, polls: List[tuple], sim_seconds: float) -> "Frame":
+        """
+        Freeze the recording into a frame description.
+
+        Args:
+            polls: Input polls the frame is the first to show
+            sim_seconds: Time spent updating and recording the frame
+
+        Returns:
+            Immutable frame
+        """
+        return Frame(tuple(self.world.blits), tuple(self.blits), tuple(polls), sim_seconds)
+
+
+@dataclass(frozen=True)
+class Frame:
+    """
+    Everything the render thread needs to draw and present one frame.
+
+    Attributes:
+        world: Blits of the world layer
+        ui: Blits drawn at full resolution on top of the world
+        polls: Input polls, as stamped by ``InputLatencyTracker``, first shown by the frame
+        sim_seconds: Time the simulation spent on the frame
+    """
+
+    world: Tuple[Blit, ...]
+    ui: Tuple[Blit, ...]
+    polls: Tuple[tuple, ...]
+    sim_seconds: float
+
+
+def replay(blits: Tuple[Blit, ...], target) -> None:
+    """
+    Draw recorded blits onto a surface or a ``ScaledCanvas``.
+
+    Args:
+        blits: Recorded blits
+        target: Surface or canvas to draw on
+    """
+    if isinstance(target, pygame.Surface):
+        target.blits(blits, doreturn=False)
+    else:
+        for source, dest, area in blits:
+            target.blit(source, dest, area)
+
+
+class RenderThread:
+    """
+    Draws and presents frames on a background thread, one frame behind.
+
+    ``submit`` hands over frame N once frame N-1 has been drawn and
+    presented, so the simulation of the next frame overlaps with drawing
+    this one and at most one frame is in flight. pygame releases the GIL
+    while blitting and flipping, so on several cores a frame takes about
+    as long as the slower of simulating and drawing it rather than both.
+
+    Attributes:
+        screen: Display surface drawn on
+        frames: Number of frames presented
+    """
+
+    def __init__(self, screen: pygame.Surface, draw: Callable[[pygame.Surface, Frame], None],
+                 present: Callable[[Frame, float], None]):
+        """
+        Initialize the thread without starting it.
+
+        Args:
+            screen: Display surface to draw on
+            draw: Draws a frame's blits onto the screen
+            present: Shows the drawn screen, given the frame and the seconds it took to draw
+        """
+        self.screen = screen
+        self.frames = 0
+        self._draw = draw
+        self._present = present
+        self._frame: Optional[Frame] = None
+        self._stopping = False
+        self._changed = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start drawing submitted frames."""
+        if self._thread is not None:
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="render", daemon=True)
+        self._thread.start()
+
+    def submit(self, frame: Frame) -> None:
+        """
+        Hand a frame to the render thread, waiting for the previous one to be presented.
+
+        Args:
+            frame: Frame to draw
+        """
+        with self._changed:
+            while self._frame is not None:
+                self._changed.wait()
+            self._frame = frame
+            self._changed.notify_all()
+
+    def wait(self) -> None:
+        """Wait until the submitted frame has been presented, e.g. before changing render settings."""
+        with self._changed:
+            while self._frame is not None:
+                self._changed.wait()
+
+    def stop(self) -> None:
+        """Present the submitted frame and stop the thread."""
+        if self._thread is None:
+            return
+        with self._changed:
+            self._stopping = True
+            self._changed.notify_all()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self) -> None:
+        """Draw and present frames until stopped."""
+        while True:
+            with self._changed:
+                while self._frame is None and not self._stopping:
+                    self._changed.wait()
+                frame = self._frame
+            if frame is None:
+                return
+            try:
+                start = time.perf_counter()
+                self._draw(self.screen, frame)
+                self._present(frame, time.perf_counter() - start)
+                self.frames += 1
+            except Exception:
+                logger.exception("Render thread failed to draw a frame")
+            finally:
+                with self._changed:
+                    self._frame = None
+                    self._changed.notify_all()
+
+
+def draw_frame(screen: pygame.Surface, frame: Frame, render_target) -> None:
+    """
+    Draw a frame: the world layer through the render target, then the UI.
+
+    Args:
+        screen: Display surface
+        frame: Frame to draw
+        render_target: ``RenderTarget`` choosing the world layer's resolution
+    """
+    screen.fill(WHITE)
+    if frame.world:
+        replay(frame.world, render_target.begin(screen))
+        render_target.present(screen)
+    replay(frame.ui, screen)
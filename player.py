@@ -3,15 +3,21 @@ Player class for the Escape-WE-Project game.
 Handles player movement, combat, inventory, and interactions.
 """
 
+import logging
 import pygame
 import math
 import time
 from typing import Optional, Tuple
 from config import (
     SCREEN_WIDTH, SCREEN_HEIGHT, PLAYER_SIZE, PLAYER_SPEED, 
-    GRAVITY, JUMP_VELOCITY, PLAYER_LIVES, PLAYER_MAX_HEALTH,
-    WHITE, BLACK, load_image, ASSETS
+    GRAVITY, JUMP_VELOCITY, PLAYER_LIVES, PLAYER_MAX_HEALTH, PLAYER_INVULNERABILITY,
+    WHITE, BLACK, ASSETS
 )
+from physics import PhysicsWorld
+from audio import audio
+from animation import Animator, load_atlas
+
+logger = logging.getLogger(__name__)
 
 
 class Player(pygame.sprite.Sprite):
@@ -23,12 +29,15 @@ class Player(pygame.sprite.Sprite):
         position: Current position as pygame.Vector2
         health: Current health points
         lives: Remaining lives
+        invulnerable: Seconds left during which hits do no damage
         equipped_item: Currently equipped item
         has_key: Whether player has a key
         inventory: List of items in inventory
+        physics: Physics world the player falls in
     """
     
-    def __init__(self, name: str, position: Tuple[int, int], size: int = PLAYER_SIZE):
+    def __init__(self, name: str, position: Tuple[int, int], size: int = PLAYER_SIZE,
+                 physics: Optional[PhysicsWorld] = None):
         """
         Initialize the player.
         
@@ -36,19 +45,24 @@ class Player(pygame.sprite.Sprite):
             name: Player's name
             position: Starting position (x, y)
             size: Player size (defaults to PLAYER_SIZE)
+            physics: Shared physics world; without one the player gets a private
+                world that is stepped by ``update``
         """
         super().__init__()
         self.name = name
         self.size = size
         
         # Load and scale player sprite
-        self.image = load_image(ASSETS['player_sprite'], (200, 200))
+        self.load_sprites()
         self.rect = self.image.get_rect(topleft=position)
         
         # Position and movement
         self.position = pygame.Vector2(position)
         self.velocity_y = 0
         self.speed = PLAYER_SPEED
+        self._owns_physics = physics is None
+        self.physics = PhysicsWorld() if physics is None else physics
+        self.physics.add(self, self.position.y, self.rect.height, GRAVITY)
         
         # State flags
         self.is_jumping = False
@@ -59,6 +73,7 @@ class Player(pygame.sprite.Sprite):
         # Health and lives
         self.health = PLAYER_MAX_HEALTH
         self.lives = PLAYER_LIVES
+        self.invulnerable = 0.0
         
         # Inventory and equipment
         self.equipped_item = None
@@ -74,6 +89,17 @@ class Player(pygame.sprite.Sprite):
         # Mouse tracking
         self.cursor_pos = pygame.Vector2(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
 
+        # Width of the area the player is kept in when not scrolling
+        self.bounds_width = SCREEN_WIDTH
+
+    def load_sprites(self) -> None:
+        """Load the player's idle, walk and attack animations."""
+        # The sprite is drawn facing left
+        atlas = load_atlas({'player': (ASSETS['player_sprite'], (200, 200))},
+                           ('idle', 'walk', 'attack'), faces_right=False)
+        self.animator = Animator(atlas, 'player', 'idle')
+        self.image = self.animator.frame()
+
     def pick_up_key(self, key) -> None:
         """
         Pick up a key item.
@@ -82,13 +108,38 @@ class Player(pygame.sprite.Sprite):
             key: The key item to pick up.
         """
         self.has_key = True
-        print(f"{self.name} picked up the key!")
+        logger.info("%s picked up the key!", self.name)
 
     def jump(self) -> None:
         """Make the player jump if not already jumping."""
         if not self.is_jumping:
             self.is_jumping = True
             self.velocity_y = JUMP_VELOCITY
+            self.physics.wake(self, JUMP_VELOCITY)
+
+    def set_position(self, position: Tuple[float, float]) -> None:
+        """
+        Move the player, letting it fall from the new position.
+        
+        Args:
+            position: New position (x, y)
+        """
+        self.position = pygame.Vector2(position)
+        self.rect.topleft = (int(self.position.x), int(self.position.y))
+        self.physics.place(self, self.position.y)
+
+    def on_physics_step(self, top: float, velocity: float, resting: bool) -> None:
+        """
+        Take the vertical position computed by the physics world.
+        
+        Args:
+            top: New top edge
+            velocity: New vertical velocity
+            resting: Whether the player landed on the ground
+        """
+        self.position.y = top
+        self.velocity_y = velocity
+        self.is_jumping = not resting
 
     def move_right(self) -> None:
         """Start moving right."""
@@ -108,29 +159,24 @@ class Player(pygame.sprite.Sprite):
         """Stop moving left."""
         self.is_moving_left = False
 
-    def update(self, is_scrolling: bool = False) -> None:
+    def update(self, is_scrolling: bool = False, dt: float = 0.0) -> None:
         """
         Update player position and state.
         
         Args:
             is_scrolling: Whether the screen is currently scrolling
+            dt: Seconds to advance; 0 only refreshes the rect and equipped item
         """
-        # Handle jumping and gravity
-        if self.is_jumping:
-            self.velocity_y += GRAVITY
-            self.position.y += self.velocity_y
-            
-            # Check if landed
-            if self.position.y >= SCREEN_HEIGHT - self.rect.height:
-                self.position.y = SCREEN_HEIGHT - self.rect.height
-                self.is_jumping = False
-                self.velocity_y = 0
+        # Jumping and gravity are stepped by the physics world
+        if self._owns_physics and dt:
+            self.physics.step(dt)
+        self.invulnerable = max(0.0, self.invulnerable - dt)
 
         # Handle horizontal movement
         if self.is_moving_right:
-            self.position.x += self.speed
+            self.position.x += self.speed * dt
         elif self.is_moving_left:
-            self.position.x -= self.speed
+            self.position.x -= self.speed * dt
 
         # Handle boundary constraints
         self._constrain_position(is_scrolling)
@@ -138,13 +184,29 @@ class Player(pygame.sprite.Sprite):
         # Update rect position
         self.rect.topleft = (int(self.position.x), int(self.position.y))
 
+        # Start falling when walking off a platform
+        self.physics.check_support(self)
+
         # Update equipped item position
         if self.equipped_item:
             self._update_equipped_item_position()
 
+        self._update_animation(dt)
+
+    def _update_animation(self, dt: float) -> None:
+        """Pick the clip matching what the player is doing and advance it."""
+        if self.equipped_item and self.equipped_item.attack_animation:
+            self.animator.play('attack')
+        elif (self.is_moving_left or self.is_moving_right) and not self.is_jumping:
+            self.animator.play('walk')
+        else:
+            self.animator.play('idle')
+        self.animator.update(dt)
+
     def _constrain_position(self, is_scrolling: bool) -> None:
         """
-        Constrain player position within screen boundaries.
+        Constrain player position within the horizontal screen boundaries.
+        The ground and ceiling are enforced by the physics world.
         
         Args:
             is_scrolling: Whether the screen is currently scrolling
@@ -162,14 +224,8 @@ class Player(pygame.sprite.Sprite):
             # Normal boundary constraints
             if self.position.x < 0:
                 self.position.x = 0
-            elif self.position.x > SCREEN_WIDTH - self.rect.width:
-                self.position.x = SCREEN_WIDTH - self.rect.width
-
-        # Vertical boundaries
-        if self.position.y < 0:
-            self.position.y = 0
-        elif self.position.y > SCREEN_HEIGHT - self.rect.height:
-            self.position.y = SCREEN_HEIGHT - self.rect.height
+            elif self.position.x > self.bounds_width - self.rect.width:
+                self.position.x = self.bounds_width - self.rect.width
 
     def _update_equipped_item_position(self) -> None:
         """Update the position of the equipped item based on cursor position."""
@@ -183,6 +239,8 @@ class Player(pygame.sprite.Sprite):
         distance = min(math.hypot(dx, dy), self.equipped_item_distance)
 
         self.equipped_item_angle = angle
+        # An attack swings the item through an arc that ends on the aim
+        angle += self.equipped_item.swing_offset()
         self.equipped_item.rect.center = (
             player_center.x + distance * math.cos(angle),
             player_center.y + distance * math.sin(angle)
@@ -200,18 +258,35 @@ class Player(pygame.sprite.Sprite):
             True if player died, False otherwise
         """
         self.health -= damage
+        audio.play('damage')
         if self.health <= 0:
             self.lives -= 1
             self.health = PLAYER_MAX_HEALTH
-            print(f"Lost a life! Lives left: {self.lives}")
+            logger.info("Lost a life!", extra={"fields": {"lives": self.lives}})
             
             if self.lives <= 0:
-                print("Game Over! You have lost.")
+                logger.info("Game Over! You have lost.")
                 self.lives = PLAYER_LIVES
                 self.health = PLAYER_MAX_HEALTH
                 return True
         return False
 
+    def take_hit(self, damage: float, invulnerability: float = PLAYER_INVULNERABILITY) -> bool:
+        """
+        Apply a hit's damage unless the player is still invulnerable from the last one.
+        
+        Args:
+            damage: Amount of damage to apply
+            invulnerability: Seconds after the hit during which further hits do nothing
+            
+        Returns:
+            True if player died, False otherwise
+        """
+        if self.invulnerable > 0:
+            return False
+        self.invulnerable = invulnerability
+        return self.take_damage(damage)
+
     def equip_item(self, item) -> None:
         """
         Equip an item.
@@ -221,7 +296,7 @@ class Player(pygame.sprite.Sprite):
         """
         self.equipped_item = item
         if item:
-            print(f"{self.name} equipped {item.item_type}")
+            logger.info("%s equipped %s", self.name, item.item_type)
 
     def unequip_item(self):
         """
@@ -232,7 +307,7 @@ class Player(pygame.sprite.Sprite):
         """
         if self.equipped_item:
             item = self.equipped_item
-            print(f"{self.name} unequipped {item.item_type}")
+            logger.info("%s unequipped %s", self.name, item.item_type)
             self.equipped_item = None
             return item
         return None
@@ -297,13 +372,7 @@ class Player(pygame.sprite.Sprite):
             screen: Pygame surface to draw on
         """
         # Draw player sprite with proper facing direction
-        if self.is_moving_right:
-            flipped_image = pygame.transform.flip(self.image, True, False)
-            flipped_rect = flipped_image.get_rect()
-            flipped_rect.topleft = self.rect.topleft
-            screen.blit(flipped_image, flipped_rect)
-        else:
-            screen.blit(self.image, self.rect)
+        self.animator.draw(screen, self.rect.topleft, mirrored=self.facing_right)
 
         # Draw equipped item
         if self.equipped_item:
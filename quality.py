@@ -0,0 +1,131 @@
+"""
+Quality profiles for the Escape-WE-Project game.
+Loads low/medium/high presets that scale the per-frame cost of rendering and simulation.
+"""
+
+import json
+import logging
+from dataclasses import dataclass, fields
+from typing import Dict, Optional
+from config import (
+    FPS, RENDER_SCALE, MAX_BACKGROUND_DUPLICATES, LOD_FAR_INTERVAL, QUALITY_CONFIG_PATH
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class QualityProfile:
+    """
+    Set of performance-sensitive settings.
+
+    There is no separate sprite resolution setting: sprites keep their
+    configured sizes (e.g. the 200x200 player) because their rects and
+    collision masks come from them. ``render_scale`` lowers sprite
+    resolution instead, since the world canvas draws every sprite from a
+    copy scaled to the internal resolution.
+
+    Attributes:
+        name: Profile name
+        target_fps: Frame rate the game loop is capped at
+        render_scale: Internal resolution of the game world relative to the window
+        smooth_scaling: Resample loaded sprites with ``smoothscale`` instead of ``scale``
+        rotation_step: Weapon rotation precision in degrees (0 rotates to the exact angle)
+        background_layers: Number of background tiles kept for scrolling
+        lod_far_interval: Ticks between updates of far-away enemies
+    """
+
+    name: str = "default"
+    target_fps: int = FPS
+    render_scale: float = RENDER_SCALE
+    smooth_scaling: bool = False
+    rotation_step: float = 0
+    background_layers: int = MAX_BACKGROUND_DUPLICATES
+    lod_far_interval: int = LOD_FAR_INTERVAL
+
+
+DEFAULT_PROFILE = QualityProfile()
+
+_profiles: Dict[str, QualityProfile] = {}
+_default_name: Optional[str] = None
+_active = DEFAULT_PROFILE
+
+
+def load_profiles(path: str = QUALITY_CONFIG_PATH) -> Dict[str, QualityProfile]:
+    """
+    Load quality profiles from a JSON config file.
+
+    The file holds a ``profiles`` object mapping names to settings and an
+    optional ``default`` profile name. Settings missing from a profile keep
+    the values from ``config.py``.
+
+    Args:
+        path: Path to the config file
+
+    Returns:
+        Profiles by name, empty if the file could not be read
+    """
+    global _default_name
+    try:
+        with open(path, encoding="utf-8") as config_file:
+            data = json.load(config_file)
+    except (OSError, ValueError) as e:
+        logger.error("Error loading quality profiles %s: %s", path, e)
+        return {}
+
+    known = {field.name for field in fields(QualityProfile)}
+    _profiles.clear()
+    for name, settings in data.get("profiles", {}).items():
+        values = {key: value for key, value in settings.items() if key in known}
+        values["name"] = name
+        _profiles[name] = QualityProfile(**values)
+    _default_name = data.get("default")
+    return dict(_profiles)
+
+
+def get_profile() -> QualityProfile:
+    """
+    Get the active quality profile.
+
+    Returns:
+        Active profile
+    """
+    return _active
+
+
+def set_profile(name: Optional[str] = None) -> QualityProfile:
+    """
+    Make a profile active, loading the config file on first use.
+
+    Args:
+        name: Profile name (defaults to the config file's default profile)
+
+    Returns:
+        The newly active profile, or the built-in default if the name is unknown
+    """
+    global _active
+    if not _profiles:
+        load_profiles()
+    name = name or _default_name
+    profile = _profiles.get(name) if name else None
+    if profile is None:
+        if name:
+            logger.warning("Unknown quality profile %s, using defaults", name)
+        profile = DEFAULT_PROFILE
+    _active = profile
+    return profile
+
+
+def next_profile_name() -> Optional[str]:
+    """
+    Get the name of the profile after the active one, wrapping around.
+
+    Returns:
+        Next profile name or None if no profiles are loaded
+    """
+    names = list(_profiles)
+    if not names:
+        return None
+    if _active.name not in names:
+        return names[0]
+    return names[(names.index(_active.name) + 1) % len(names)]
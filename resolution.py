@@ -0,0 +1,187 @@
+"""
+Render-target scaling for the Escape-WE-Project game.
+Draws the game world at a reduced internal resolution and upscales it to the window.
+"""
+
+import weakref
+import pygame
+from typing import Optional, Tuple
+from config import (
+    SCREEN_WIDTH, SCREEN_HEIGHT, FPS, WHITE, RENDER_SCALE, RENDER_SCALE_MIN,
+    RENDER_SCALE_STEP, RENDER_BUDGET_HIGH, RENDER_BUDGET_LOW, RENDER_SCALE_COOLDOWN
+)
+
+
+class ScaledCanvas:
+    """
+    Low-resolution drawing surface addressed in full-screen coordinates.
+
+    Entities draw onto it exactly as they would onto the display surface
+    (``blit``, ``fill``, ``get_width``); positions are scaled down and
+    sources are replaced by scaled copies that are cached per source surface.
+
+    Attributes:
+        size: Logical (full-resolution) size in pixels
+        scale: Ratio of internal to logical resolution
+        surface: Internal surface that is actually drawn on
+    """
+
+    def __init__(self, size: Tuple[int, int], scale: float):
+        """
+        Initialize the canvas.
+
+        Args:
+            size: Logical (full-resolution) size in pixels
+            scale: Ratio of internal to logical resolution
+        """
+        self.size = size
+        self.scale = 0.0
+        self.surface = pygame.Surface((1, 1))
+        self._scaled: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self.set_scale(scale)
+
+    def set_scale(self, scale: float) -> None:
+        """
+        Resize the internal surface.
+
+        Args:
+            scale: Ratio of internal to logical resolution
+        """
+        if scale == self.scale:
+            return
+        self.scale = scale
+        self.surface = pygame.Surface(
+            (max(1, round(self.size[0] * scale)), max(1, round(self.size[1] * scale)))
+        ).convert()
+        self._scaled.clear()
+
+    def get_width(self) -> int:
+        """Return the logical width."""
+        return self.size[0]
+
+    def get_height(self) -> int:
+        """Return the logical height."""
+        return self.size[1]
+
+    def fill(self, color: Tuple[int, int, int]) -> None:
+        """
+        Fill the whole canvas.
+
+        Args:
+            color: Fill color
+        """
+        self.surface.fill(color)
+
+    def blit(self, source: pygame.Surface, dest, area: Optional[pygame.Rect] = None) -> pygame.Rect:
+        """
+        Draw a surface, or part of it, at a logical position.
+
+        Args:
+            source: Full-resolution surface to draw
+            dest: Logical (x, y) position or rect
+            area: Full-resolution part of the source to draw, e.g. a frame
+                of an animation atlas (defaults to all of it)
+
+        Returns:
+            Affected area of the internal surface
+        """
+        scaled = self._scaled.get(source)
+        if scaled is None:
+            width, height = source.get_size()
+            scaled = pygame.transform.scale(
+                source, (max(1, round(width * self.scale)), max(1, round(height * self.scale)))
+            )
+            self._scaled[source] = scaled
+        x, y = dest[0], dest[1]
+        position = (int(x * self.scale), int(y * self.scale))
+        if area is None:
+            return self.surface.blit(scaled, position)
+        return self.surface.blit(scaled, position, (
+            round(area[0] * self.scale), round(area[1] * self.scale),
+            round(area[2] * self.scale), round(area[3] * self.scale)
+        ))
+
+
+class RenderTarget:
+    """
+    Chooses where the game world is drawn and adapts its resolution to load.
+
+    At scale 1.0 the world is drawn straight to the display surface. Below
+    that it is drawn to a ``ScaledCanvas`` and upscaled by ``present``. With
+    ``dynamic`` enabled, ``record_frame`` lowers the scale one step when the
+    smoothed frame work exceeds the budget and raises it again when there is
+    headroom.
+
+    Attributes:
+        scale: Current render scale
+        dynamic: Whether the scale follows frame time
+        budget: Frame time budget in seconds
+        average: Smoothed frame work time in seconds
+    """
+
+    def __init__(self, scale: float = RENDER_SCALE, dynamic: bool = False,
+                 budget: float = 1 / FPS):
+        """
+        Initialize the render target.
+
+        Args:
+            scale: Initial render scale between RENDER_SCALE_MIN and 1.0
+            dynamic: Whether the scale follows frame time
+            budget: Frame time budget in seconds
+        """
+        self.scale = min(1.0, max(RENDER_SCALE_MIN, scale))
+        self.dynamic = dynamic
+        self.budget = budget
+        # Start between the thresholds so the first frames don't trigger a change
+        self.average = budget * (RENDER_BUDGET_HIGH + RENDER_BUDGET_LOW) / 2
+        self._cooldown = RENDER_SCALE_COOLDOWN
+        # Created on the first scaled frame; at full scale the screen is drawn to directly
+        self._canvas: ScaledCanvas | None = None
+
+    def begin(self, screen: pygame.Surface) -> pygame.Surface | ScaledCanvas:
+        """
+        Get the surface the world should be drawn on this frame.
+
+        Args:
+            screen: Display surface
+
+        Returns:
+            The display surface at full scale, otherwise the scaled canvas
+        """
+        if self.scale >= 1.0:
+            return screen
+        if self._canvas is None:
+            self._canvas = ScaledCanvas((SCREEN_WIDTH, SCREEN_HEIGHT), self.scale)
+        self._canvas.set_scale(self.scale)
+        self._canvas.fill(WHITE)
+        return self._canvas
+
+    def present(self, screen: pygame.Surface) -> None:
+        """
+        Upscale the world to the display surface if it was drawn scaled.
+
+        Args:
+            screen: Display surface
+        """
+        if self.scale < 1.0 and self._canvas is not None:
+            pygame.transform.scale(self._canvas.surface, screen.get_size(), screen)
+
+    def record_frame(self, work_seconds: float) -> None:
+        """
+        Feed the time spent on a frame's update and draw into the controller.
+
+        Args:
+            work_seconds: Frame time excluding the frame-rate sleep
+        """
+        if not self.dynamic:
+            return
+        self.average += (work_seconds - self.average) * 0.1
+        if self._cooldown > 0:
+            self._cooldown -= 1
+            return
+        if self.average > self.budget * RENDER_BUDGET_HIGH and self.scale > RENDER_SCALE_MIN:
+            self.scale = max(RENDER_SCALE_MIN, self.scale - RENDER_SCALE_STEP)
+            self._cooldown = RENDER_SCALE_COOLDOWN
+        elif self.average < self.budget * RENDER_BUDGET_LOW and self.scale < 1.0:
+            self.scale = min(1.0, self.scale + RENDER_SCALE_STEP)
+            self._cooldown = RENDER_SCALE_COOLDOWN
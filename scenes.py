@@ -0,0 +1,307 @@
+"""
+Scene management for the Escape-WE-Project game.
+Runs the menu, level and win screens as states of a single frame loop.
+"""
+
+import time
+import pygame
+from typing import TYPE_CHECKING, Dict, List, Optional
+from config import SCREEN_WIDTH, SCREEN_HEIGHT, load_image, ASSETS
+from enemy import Enemy
+from chest import Chest
+from door import Door
+from item import Item
+from tilemap import TileMap
+from streaming import LevelStream
+from tracing import tracer
+from metrics import metrics
+
+if TYPE_CHECKING:
+    from game import Game
+
+
+class Scene:
+    """
+    Base class for a game screen.
+
+    Scenes are driven by the ``SceneManager``: ``enter`` runs once before
+    the first frame of the scene, ``exit`` once after its last frame, and
+    ``handle_event``/``update``/``draw`` run every frame in between.
+
+    Attributes:
+        game: Game instance the scene belongs to
+    """
+
+    name = ""
+
+    def __init__(self, game: "Game"):
+        """
+        Initialize the scene.
+
+        Args:
+            game: Game instance the scene belongs to
+        """
+        self.game = game
+
+    def enter(self) -> None:
+        """Prepare assets and state before the scene's first frame."""
+
+    def exit(self) -> None:
+        """Tear down state after the scene's last frame."""
+
+    def handle_event(self, event: pygame.event.Event) -> bool:
+        """
+        Handle a single event.
+
+        Args:
+            event: Pygame event
+
+        Returns:
+            True if game should continue, False to quit
+        """
+        return True
+
+    def reload_sprites(self) -> None:
+        """Reload the sprites of the scene's objects after the image cache was cleared."""
+
+    def update(self) -> None:
+        """Advance the scene by one frame."""
+
+    def draw(self, screen: pygame.Surface) -> None:
+        """
+        Draw the scene.
+
+        Args:
+            screen: Pygame surface to draw on
+        """
+
+
+class MenuScene(Scene):
+    """Main menu with start and exit buttons."""
+
+    name = "menu"
+
+    def handle_event(self, event: pygame.event.Event) -> bool:
+        """Handle menu button clicks."""
+        return self.game._handle_menu_events(event)
+
+    def draw(self, screen: pygame.Surface) -> None:
+        """Draw the menu screen."""
+        self.game._draw_menu(screen)
+
+
+class WinScene(Scene):
+    """Win screen shown after the last level."""
+
+    name = "win"
+
+    def handle_event(self, event: pygame.event.Event) -> bool:
+        """Handle the main menu button."""
+        return self.game._handle_win_events(event)
+
+    def draw(self, screen: pygame.Surface) -> None:
+        """Draw the win screen."""
+        self.game._draw_win_screen(screen)
+
+
+class LevelScene(Scene):
+    """
+    A single playable level.
+
+    Attributes:
+        chest: Chest instance
+        door: Door instance
+        key: Key item
+        enemies: List of loaded enemies
+        tilemap: Platforms of the loaded chunks
+        stream: Loaded part of the level
+        total_scroll: Current scroll offset
+        max_scroll: Maximum scroll offset
+    """
+
+    name = "game"
+
+    def __init__(self, game: "Game"):
+        """
+        Initialize the level scene.
+
+        Args:
+            game: Game instance the scene belongs to
+        """
+        super().__init__(game)
+        self.chest: Optional[Chest] = None
+        self.door: Optional[Door] = None
+        self.key: Optional[Item] = None
+        self.enemies: List[Enemy] = []
+        self.tilemap: Optional[TileMap] = None
+        self.stream: Optional[LevelStream] = None
+        self.total_scroll = 0
+        self.max_scroll = SCREEN_WIDTH * 3 - SCREEN_WIDTH
+
+    def enter(self) -> None:
+        """Build the level's objects and load their sprites."""
+        start = time.perf_counter()
+        with tracer.span(f"level setup {self.game.current_level}", "level"):
+            self.stream = LevelStream(self.game.levels, self.game.current_level, self.game.physics)
+            level = self.stream
+            self.tilemap = level.tilemap
+            self.chest = level.chest
+            self.door = level.door
+            self.key = level.key
+            self.enemies = level.enemies
+            self.total_scroll = 0
+            self.max_scroll = level.data.width - SCREEN_WIDTH
+            self.game.game_background = load_image(
+                ASSETS[level.data.background], (SCREEN_WIDTH, SCREEN_HEIGHT)
+            )
+            self.game._reset_backgrounds()
+        metrics.record_level_transition(time.perf_counter() - start)
+
+    def exit(self) -> None:
+        """Release the level's objects and anything left lying in it."""
+        if self.key:
+            self.key.leave_world()
+        for item in self.game.dropped_items:
+            item.leave_world()
+        self.chest = None
+        self.door = None
+        self.key = None
+        self.enemies = []
+        self.tilemap = None
+        self.stream = None
+        self.game.physics.tilemap = None
+        self.game.dropped_items.clear()
+        self.game.contacts.clear()
+
+    def reload_sprites(self) -> None:
+        """Reload the chest, door and enemy sprites."""
+        if self.chest:
+            self.chest.load_sprites()
+        if self.door:
+            self.door.load_sprites()
+        for enemy in self.enemies:
+            enemy.load_sprites()
+
+    def handle_event(self, event: pygame.event.Event) -> bool:
+        """Handle gameplay input."""
+        return self.game._handle_game_events(
+            event, self.enemies, self.chest, self.door, self.key, self.total_scroll
+        )
+
+    def update(self) -> None:
+        """Scroll the level, move the player and check for level completion."""
+        game = self.game
+        player = game.player
+        keys = game.input.get_pressed()
+        with tracer.span("_update_scrolling"):
+            self.total_scroll, move_amount, is_scrolling = game._update_scrolling(
+                keys, self.total_scroll, self.max_scroll,
+                self.chest, self.key, self.enemies, self.door
+            )
+        self.tilemap.offset_x = self.total_scroll
+        with tracer.span("LevelStream.update"):
+            if self.stream.update(self.total_scroll):
+                self.tilemap = self.stream.tilemap
+        if not is_scrolling:
+            new_x = player.rect.x + move_amount
+            if 0 <= new_x <= SCREEN_WIDTH - player.rect.width:
+                player.rect.x = new_x
+            elif new_x < 0:
+                player.rect.left = 0
+            elif new_x > SCREEN_WIDTH - player.rect.width:
+                player.rect.right = SCREEN_WIDTH
+        with tracer.span("physics"):
+            game.physics.step(game.dt)
+        with tracer.span("Player.update"):
+            player.update(is_scrolling, game.dt)
+            if player.equipped_item:
+                player.update_cursor_pos(game.input.get_mouse_pos())
+                player.update(is_scrolling)
+                swept = player.equipped_item.advance_attack(game.dt)
+                if swept:
+                    game._resolve_swing(swept, self.enemies)
+        with tracer.span("navigation"):
+            self.stream.navigation.update(player.rect.left, player.rect.right, player.rect.bottom)
+
+        metrics.enemies = len(self.enemies)
+        metrics.dropped_items = len(game.dropped_items)
+
+        if self.door.is_open:
+            if game.current_level == game.levels.count:
+                game.scenes.change("win")
+            else:
+                game.current_level += 1
+                game.scenes.change("game")
+
+    def draw(self, screen: pygame.Surface) -> None:
+        """Draw the level."""
+        self.game._draw_game(screen, self.enemies, self.chest, self.door, self.key, self.total_scroll,
+                             self.tilemap)
+
+
+class SceneManager:
+    """
+    Owns the active scene and switches between scenes at frame boundaries.
+
+    Scene changes requested during a frame are deferred until the next call
+    to ``apply_pending``, so a scene never exits while its own event handling
+    or update is still running.
+
+    Attributes:
+        scenes: Registered scenes by name
+        current: Active scene or None before the first change
+    """
+
+    def __init__(self, scenes: List[Scene]):
+        """
+        Initialize the scene manager.
+
+        Args:
+            scenes: Scenes to register, keyed by their ``name``
+        """
+        self.scenes: Dict[str, Scene] = {scene.name: scene for scene in scenes}
+        self.current: Optional[Scene] = None
+        self._pending: Optional[str] = None
+
+    @property
+    def current_name(self) -> str:
+        """Name of the active scene, or an empty string if none is active."""
+        return self.current.name if self.current else ""
+
+    def change(self, name: str) -> None:
+        """
+        Request a switch to another scene at the start of the next frame.
+
+        Changing to the active scene's name restarts it.
+
+        Args:
+            name: Name of the scene to switch to
+
+        Raises:
+            KeyError: If no scene with that name is registered
+        """
+        if name not in self.scenes:
+            raise KeyError(f"Unknown scene: {name}")
+        self._pending = name
+
+    def apply_pending(self) -> bool:
+        """
+        Perform a requested scene change.
+
+        Returns:
+            True if the active scene changed
+        """
+        if self._pending is None:
+            return False
+        name, self._pending = self._pending, None
+        if self.current:
+            self.current.exit()
+        self.current = self.scenes[name]
+        self.current.enter()
+        return True
+
+    def shutdown(self) -> None:
+        """Exit the active scene."""
+        if self.current:
+            self.current.exit()
+            self.current = None
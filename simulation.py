@@ -0,0 +1,300 @@
+"""
+Headless game simulation for the Escape-WE-Project game.
+Advances player, enemies, items, chest and door at a fixed tick without drawing.
+"""
+
+import os
+import random
+import logging
+import pygame
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from config import (
+    SCREEN_WIDTH, SCREEN_HEIGHT, SERVER_TICK_RATE, LEVEL_WIDTH,
+    WEAPON_SIZE, PLAYER_MAX_HEALTH, PLAYER_LIVES, ENEMY_CONTACT_DAMAGE, load_image, ASSETS
+)
+from player import Player
+from enemy import Enemy
+from item import Item
+from physics import PhysicsWorld
+from tilemap import TileMap
+from levels import load_levels
+from streaming import LevelStream
+from contacts import ContactManager
+from weapons import SwingHitDetector
+
+logger = logging.getLogger(__name__)
+
+# Entity state as a flat list of numbers, keyed by entity id in snapshots
+EntityState = List[float]
+Snapshot = Dict[str, EntityState]
+
+
+def init_headless() -> None:
+    """Initialize pygame without a visible window so sprites can still be loaded."""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.init()
+    if pygame.display.get_surface() is None:
+        pygame.display.set_mode((1, 1))
+
+
+@dataclass
+class InputSnapshot:
+    """
+    Player input for one simulation tick.
+
+    ``jump``, ``interact`` and ``attack`` are presses since the previous
+    input snapshot; ``left`` and ``right`` are held keys. The cursor is in
+    world coordinates.
+    """
+
+    left: bool = False
+    right: bool = False
+    jump: bool = False
+    interact: bool = False
+    attack: bool = False
+    cursor_x: float = 0.0
+    cursor_y: float = 0.0
+
+    def merge(self, newer: "InputSnapshot") -> "InputSnapshot":
+        """
+        Combine with a newer snapshot so presses between ticks are not lost.
+
+        Args:
+            newer: Snapshot received after this one
+
+        Returns:
+            Held keys and cursor from ``newer`` with presses from both
+        """
+        return InputSnapshot(
+            newer.left, newer.right,
+            self.jump or newer.jump, self.interact or newer.interact,
+            self.attack or newer.attack, newer.cursor_x, newer.cursor_y
+        )
+
+
+class Simulation:
+    """
+    Authoritative game state advanced at a fixed tick.
+
+    Unlike ``Game``, positions are kept in world coordinates; scrolling is
+    left to whoever displays the state.
+
+    Attributes:
+        tick: Number of ticks simulated
+        level: Current level number
+        levels: Compiled level library
+        width: Width of the current level
+        player: Player instance
+        physics: Physics world stepping the player and key
+        contacts: Player's contacts with enemies
+        swing: Hit detection along the weapon's swing
+        stream: Loaded part of the current level
+        tilemap: Platforms of the loaded chunks
+        enemies: Loaded enemies by id
+        chest: Chest instance
+        door: Door instance
+        key: Key item
+        weapon: Weapon the player took from the chest, if any
+    """
+
+    def __init__(self, seed: Optional[int] = None, tick_rate: int = SERVER_TICK_RATE):
+        """
+        Initialize the simulation and build the first level.
+
+        Args:
+            seed: Random seed for reproducible levels
+            tick_rate: Ticks per simulated second
+        """
+        self.random = random.Random(seed)
+        self.levels = load_levels()
+        self.width = LEVEL_WIDTH
+        self.tick_rate = tick_rate
+        self.tick = 0
+        self.level = 1
+        self.physics = PhysicsWorld()
+        self.player = Player("Hero", (100, SCREEN_HEIGHT - 250), physics=self.physics)
+        self.weapon: Optional[Item] = None
+        self.key: Optional[Item] = None
+        self.tilemap: Optional[TileMap] = None
+        self.stream: Optional[LevelStream] = None
+        self.enemies: Dict[str, Enemy] = {}
+        self.contacts = ContactManager()
+        self.contacts.listen("enemy", enter=self._on_enemy_contact, stay=self._on_enemy_contact)
+        self._died = False
+        self.swing = SwingHitDetector()
+        self._level_serial = 0
+        self._build_level()
+
+    def start_level(self, level: int, seed: Optional[int] = None) -> None:
+        """
+        Restart play at the beginning of a level with a fresh player.
+
+        Args:
+            level: Level number, starting at 1
+            seed: Seed for the positions the level leaves to chance, drawn
+                from the simulation's own random if None
+        """
+        if seed is not None:
+            self.random = random.Random(seed)
+        self.level = level
+        self.tick = 0
+        player = self.player
+        player.set_position((100, SCREEN_HEIGHT - 250))
+        player.health = PLAYER_MAX_HEALTH
+        player.lives = PLAYER_LIVES
+        player.invulnerable = 0.0
+        player.has_key = False
+        player.last_attack_time = 0
+        player.equip_item(None)
+        self.weapon = None
+        self._build_level()
+
+    def _restart_level(self, level: int) -> None:
+        """
+        Start a level during play, keeping the tick count and the player's lives and health.
+
+        Args:
+            level: Level number, starting at 1
+        """
+        player = self.player
+        tick, lives, health = self.tick, player.lives, player.health
+        self.start_level(level)
+        self.tick = tick
+        player.lives, player.health = lives, health
+
+    def _build_level(self) -> None:
+        """Create the chest, door, key and enemies of the current level."""
+        if self.key:
+            self.key.leave_world()
+        # Positions the level leaves to chance vary with the simulation's own seed
+        self.stream = LevelStream(self.levels, self.level, self.physics, self.random.getrandbits(32))
+        self.width = self.stream.data.width
+        self.player.bounds_width = self.width
+        self.tilemap = self.stream.tilemap
+        self.chest = self.stream.chest
+        self.door = self.stream.door
+        self.key = self.stream.key
+        self.contacts.clear()
+        # Ids are unique across level builds so clients never blend two levels' enemies
+        self._level_serial += 1
+        self._stream_enemies(force=True)
+
+    def _stream_enemies(self, force: bool = False) -> None:
+        """
+        Load the chunks around the player and refresh the enemy ids.
+
+        Args:
+            force: Refresh the ids even if no chunk changed
+        """
+        if self.stream.update(self.player.position.x - SCREEN_WIDTH / 2) or force:
+            self.tilemap = self.stream.tilemap
+            self.enemies = {f"e{self._level_serial}.{self.stream.enemy_ids[enemy]}": enemy
+                            for enemy in self.stream.enemies}
+
+    def step(self, inputs: InputSnapshot) -> None:
+        """
+        Advance the simulation by one tick.
+
+        Args:
+            inputs: Player input for this tick
+        """
+        self.tick += 1
+        now = self.tick / self.tick_rate
+        player = self.player
+
+        # Movement
+        player.is_moving_right = inputs.right
+        player.is_moving_left = inputs.left and not inputs.right
+        if inputs.right:
+            player.facing_right = True
+        elif inputs.left:
+            player.facing_right = False
+        if inputs.jump:
+            player.jump()
+        player.update_cursor_pos((inputs.cursor_x, inputs.cursor_y))
+        dt = 1 / self.tick_rate
+        self.physics.step(dt)
+        player.update(dt=dt)
+        self._stream_enemies()
+        self.stream.navigation.update(player.rect.left, player.rect.right, player.rect.bottom)
+
+        # Enemies
+        for enemy in self.enemies.values():
+            enemy.update(dt)
+        if self.weapon:
+            swept = self.weapon.advance_attack(dt)
+            if swept:
+                self._resolve_swing(swept)
+        self._died = False
+        self.contacts.update(player.rect, {"enemy": list(self.enemies.values())}, dt)
+        if self._died:
+            logger.info("Player died, restarting level", extra={"fields": {"level": self.level}})
+            self._restart_level(self.level)
+            return
+
+        if inputs.interact:
+            self._interact()
+
+        # Hits are found as the swing sweeps in the following ticks
+        if inputs.attack and self.weapon:
+            player.attack(now)
+
+        if self.door.is_open:
+            self._restart_level(1 if self.level == self.levels.count else self.level + 1)
+
+    def _resolve_swing(self, swept: tuple) -> None:
+        """Remove the enemies the weapon hit in this tick's part of its swing."""
+        player = self.player
+        hits = set(self.swing.sweep(self.weapon, player.rect.center, player.equipped_item_angle,
+                                    swept, list(self.enemies.values())))
+        for enemy_id, enemy in list(self.enemies.items()):
+            if enemy in hits:
+                del self.enemies[enemy_id]
+                self.stream.enemies.remove(enemy)
+
+    def _on_enemy_contact(self, enemy: Enemy, seconds: float = 0.0) -> None:
+        """Hurt the player while touching an enemy, at most once per invulnerability window."""
+        if self.player.take_hit(ENEMY_CONTACT_DAMAGE):
+            self._died = True
+
+    def _interact(self) -> None:
+        """Pick up the key, use the door or open the chest, like the E key in game."""
+        player = self.player
+        if not player.has_key and not self.key.is_picked_up and self.key.is_collision(player):
+            self.key.interact(player)
+        elif self.door.is_near(player, 0):
+            self.door.use(player)
+        elif self.chest.rect.colliderect(player.rect):
+            item_name = self.chest.open_chest()
+            if item_name:
+                self.chest.remove_item()
+                self.weapon = Item(item_name, "Weapon", player.rect.center,
+                                   WEAPON_SIZE, load_image(ASSETS['sword'], WEAPON_SIZE))
+                player.equip_item(self.weapon)
+
+    def snapshot(self) -> Snapshot:
+        """
+        Capture the state a client needs to display the world.
+
+        Returns:
+            Entity states by id; positions are rounded to whole pixels
+        """
+        player = self.player
+        state: Snapshot = {
+            "level": [self.level, self.width],
+            "tiles": [value for platform in self.tilemap.platforms for value in platform],
+            "player": [
+                round(player.position.x), round(player.position.y), int(player.facing_right),
+                player.health, player.lives, int(player.has_key),
+                round(player.equipped_item_angle, 2) if self.weapon else -999,
+            ],
+            "door": [self.door.rect.x, self.door.rect.y, int(self.door.is_open)],
+            "chest": [self.chest.rect.x, self.chest.rect.y, int(self.chest.opened)],
+        }
+        if not self.key.is_picked_up:
+            state["key"] = [self.key.rect.x, self.key.rect.y]
+        for enemy_id, enemy in self.enemies.items():
+            state[enemy_id] = [round(enemy.x), round(enemy.y), enemy.current_direction, enemy.enemy_type]
+        return state
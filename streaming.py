@@ -0,0 +1,206 @@
+"""
+Level streaming for the Escape-WE-Project game.
+Loads the chunks of a level around the camera and unloads the ones left behind.
+"""
+
+import logging
+import random
+from typing import Dict, List, Optional, Set, Tuple
+from config import SCREEN_WIDTH, DOOR_SIZE, TILE_SIZE, TILE_CHUNK_WIDTH, STREAM_RADIUS
+from levels import LevelLibrary, AUTO, CHEST, DOOR, KEY, ENEMY, PLATFORM
+from tilemap import TileMap, Platform
+from navigation import FlowField
+from chest import Chest
+from door import Door
+from enemy import Enemy
+from item import spawn_key
+
+logger = logging.getLogger(__name__)
+
+
+class LevelStream:
+    """
+    The part of a level that is currently loaded.
+
+    A level is divided into chunks of ``LevelData.chunk_width`` pixels.
+    Only the chunks the camera covers, plus ``radius`` chunks on each side,
+    have their platforms in the tile map and their enemies in ``enemies``;
+    chunks further away are unloaded, so memory and per-frame cost depend on
+    the screen size rather than the level length. The chest, door and key
+    are created once and stay loaded for the whole level.
+
+    An enemy is unloaded when its chunk is unloaded or when it wanders out
+    of the loaded chunks, and comes back at its spawn point when its chunk
+    is loaded again. Enemies removed from ``enemies`` by the game while
+    loaded are remembered as defeated and do not come back.
+
+    Enemy positions follow the game's screen coordinates: new enemies are
+    placed relative to the tile map's ``offset_x``, which the caller keeps
+    at the current scroll offset.
+
+    Attributes:
+        data: Header of the streamed level
+        tilemap: Platforms of the loaded chunks
+        chest: Chest instance
+        door: Door instance
+        key: Key item
+        enemies: Loaded enemies, updated in place
+        enemy_ids: Stable id of each loaded enemy as "chunk.index"
+        navigation: Flow field towards the player shared by the loaded enemies
+        loaded: Indices of the loaded chunks
+    """
+
+    def __init__(self, library: LevelLibrary, number: int, physics=None,
+                 seed: Optional[int] = None, radius: int = STREAM_RADIUS):
+        """
+        Create the level's resident objects and load the chunks at the start.
+
+        Positions left to chance are drawn from the level's seed, so a level
+        looks the same every time it is entered unless ``seed`` overrides it.
+
+        Args:
+            library: Compiled levels
+            number: Level number, starting at 1
+            physics: Physics world the key and platforms are added to
+            seed: Seed to use instead of the level's own
+            radius: Chunks kept loaded on each side of the visible ones
+        """
+        self.library = library
+        self.data = library.load(number)
+        self.physics = physics
+        self.radius = radius
+        self.seed = self.data.seed if seed is None else seed
+        self._columns = self.data.width // TILE_SIZE
+        self._chunk_columns = self.data.chunk_width // TILE_SIZE
+        self.tilemap = TileMap(0, [])
+        self.navigation = FlowField(self.tilemap)
+        self.enemies: List[Enemy] = []
+        self.enemy_ids: Dict[Enemy, str] = {}
+        self.loaded: Set[int] = set()
+        self._platforms: Dict[int, List[Platform]] = {}
+        self._defeated: Set[str] = set()
+        self._window: Optional[Tuple[int, int]] = None
+
+        rng = random.Random(self.seed)
+        self.chest = self.door = self.key = None
+        for spec in self.data.globals:
+            if spec.kind == CHEST:
+                self.chest = Chest((50 if spec.x == AUTO else spec.x,
+                                    None if spec.y == AUTO else spec.y))
+            elif spec.kind == DOOR:
+                x = rng.randint(0, self.data.width - DOOR_SIZE[0]) if spec.x == AUTO else spec.x
+                self.door = Door(DOOR_SIZE, self.data.width, x)
+            elif spec.kind == KEY:
+                self.key = spawn_key()
+                self.key.rect.x = rng.randint(100, self.data.width - 100) if spec.x == AUTO else spec.x
+                if physics is not None:
+                    self.key.enter_world(physics, falling=False)
+        self.update(0)
+
+    def update(self, view_left: float) -> bool:
+        """
+        Load and unload chunks for the camera's position.
+
+        Does nothing until the camera crosses into another chunk.
+
+        Args:
+            view_left: Left edge of the visible area in level pixels
+
+        Returns:
+            True if any chunk was loaded or unloaded
+        """
+        width = self.data.chunk_width
+        first = max(0, int(view_left) // width - self.radius)
+        last = min(self.data.chunk_count - 1,
+                   int(view_left + SCREEN_WIDTH - 1) // width + self.radius)
+        if self._window == (first, last):
+            return False
+        self._window = (first, last)
+        wanted = set(range(first, last + 1))
+        unloading = self.loaded - wanted
+        loading = sorted(wanted - self.loaded)
+
+        self._unload_enemies(first * width, (last + 1) * width, unloading)
+        for index in unloading:
+            self.loaded.discard(index)
+            del self._platforms[index]
+            self._evict_tiles(index * width, (index + 1) * width)
+        for index in loading:
+            self.loaded.add(index)
+            self._platforms[index] = self._read_platforms(index)
+            # A chunk's platforms may reach into the next one
+            self._evict_tiles(index * width, (index + 2) * width)
+        self._rebuild_tilemap(first, last)
+        for index in loading:
+            self._load_enemies(index)
+
+        logger.debug("Streamed level chunks", extra={"fields": {
+            "level": self.data.number, "first": first, "last": last,
+            "loaded": loading, "unloaded": sorted(unloading), "enemies": len(self.enemies)
+        }})
+        return True
+
+    def _read_platforms(self, index: int) -> List[Platform]:
+        """Get the platforms of one chunk, generating them from the seed if the level has none."""
+        if self.data.generate_platforms:
+            rng = random.Random(self.seed * 100003 + index)
+            return TileMap.layout(index * self._chunk_columns, self._chunk_columns, rng)
+        return [(spec.x, spec.y, spec.extra)
+                for spec in self.library.chunk(self.data, index) if spec.kind == PLATFORM]
+
+    def _rebuild_tilemap(self, first: int, last: int) -> None:
+        """Replace the tile map with one covering the loaded chunks."""
+        origin = first * self._chunk_columns
+        end = min(self._columns, (last + 1) * self._chunk_columns)
+        platforms = [platform for index in sorted(self.loaded) for platform in self._platforms[index]]
+        tilemap = TileMap(max(0, end - origin), platforms, origin_column=origin,
+                          chunk_cache=self.tilemap.chunk_cache)
+        tilemap.offset_x = self.tilemap.offset_x
+        self.tilemap = tilemap
+        if self.physics is not None:
+            self.physics.tilemap = tilemap
+        self.navigation.set_tilemap(tilemap)
+        for enemy in self.enemies:
+            enemy.tilemap = tilemap
+
+    def _evict_tiles(self, left: int, right: int) -> None:
+        """Drop rendered tile chunks that overlap a range of level pixels."""
+        for index in range(left // TILE_CHUNK_WIDTH, (right - 1) // TILE_CHUNK_WIDTH + 1):
+            self.tilemap.chunk_cache.pop(index, None)
+
+    def _unload_enemies(self, left: int, right: int, unloading: Set[int]) -> None:
+        """Drop enemies of unloaded chunks or outside the loaded range, noting the defeated ones."""
+        present = set(self.enemies)
+        for enemy, enemy_id in list(self.enemy_ids.items()):
+            if enemy not in present:
+                self._defeated.add(enemy_id)
+                del self.enemy_ids[enemy]
+        offset = self.tilemap.offset_x
+        kept = []
+        for enemy in self.enemies:
+            enemy_id = self.enemy_ids.get(enemy)
+            chunk = int(enemy_id.split(".")[0]) if enemy_id else None
+            if chunk in unloading or not left <= enemy.x + offset < right:
+                self.enemy_ids.pop(enemy, None)
+            else:
+                kept.append(enemy)
+        self.enemies[:] = kept
+
+    def _load_enemies(self, index: int) -> None:
+        """Create the enemies of a newly loaded chunk that are not defeated or still around."""
+        alive = set(self.enemy_ids.values())
+        enemy_index = 0
+        for spec in self.library.chunk(self.data, index):
+            if spec.kind != ENEMY:
+                continue
+            enemy_id = f"{index}.{enemy_index}"
+            enemy_index += 1
+            if enemy_id in self._defeated or enemy_id in alive:
+                continue
+            enemy_type = int(spec.asset[-1]) if spec.asset.startswith("enemy") else None
+            # Seeded by id, so an enemy loaded again has the same traits
+            enemy = Enemy(spec.x - self.tilemap.offset_x, None if spec.y == AUTO else spec.y,
+                          self.tilemap, enemy_type, random.Random(f"{self.seed}.{enemy_id}"))
+            enemy.navigation = self.navigation
+            self.enemies.append(enemy)
+            self.enemy_ids[enemy] = enemy_id
@@ -0,0 +1,324 @@
+"""
+Macro stress test for the Escape-WE-Project game.
+Fills a level with growing numbers of entities, runs each scenario headlessly
+and reports frame-time percentiles, memory and per-subsystem cost against
+entity count.
+
+Usage:
+    python stress.py [--counts 10,100,1000,10000] [--kinds enemy,item,chest,door]
+                     [--separate] [--frames N] [--json PATH]
+"""
+
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import random
+import time
+from collections import defaultdict
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Tuple
+import pygame
+from config import (
+    SCREEN_WIDTH, GROUND_Y, FPS, WHITE, DOOR_SIZE, ENEMY_SIZE, STRESS_COUNTS, STRESS_FRAMES,
+    STRESS_SUPERLINEAR_FACTOR, STRESS_NOISE_FLOOR_MS
+)
+from simulation import init_headless
+from tracing import tracer
+
+KINDS = ("enemy", "item", "chest", "door")
+
+
+@dataclass
+class Scenario:
+    """
+    Entity counts of one stress-test run.
+
+    Attributes:
+        enemies: Enemies added to the level
+        items: Dropped items falling into the level
+        chests: Extra chests
+        doors: Extra doors
+        frames: Frames to run
+        seed: Seed for entity placement
+    """
+
+    enemies: int = 0
+    items: int = 0
+    chests: int = 0
+    doors: int = 0
+    frames: int = STRESS_FRAMES
+    seed: int = 0
+
+    @property
+    def total(self) -> int:
+        """Number of entities added."""
+        return self.enemies + self.items + self.chests + self.doors
+
+    @property
+    def label(self) -> str:
+        """Short description such as ``enemy+item x100``."""
+        counts = {"enemy": self.enemies, "item": self.items, "chest": self.chests, "door": self.doors}
+        kinds = [kind for kind in KINDS if counts[kind]]
+        return f"{'+'.join(kinds) or 'empty'} x{max(counts.values())}"
+
+
+def scaling_curve(counts: List[int], kinds: List[str], separate: bool = False,
+                  frames: int = STRESS_FRAMES) -> List[Scenario]:
+    """
+    Build the scenarios of a scaling curve.
+
+    Args:
+        counts: Entity counts per kind, e.g. 10, 100, 1000, 10000
+        kinds: Entity kinds to add (enemy, item, chest, door)
+        separate: Scale each kind on its own instead of all together
+        frames: Frames to run per scenario
+
+    Returns:
+        Scenarios in run order
+    """
+    groups = [[kind] for kind in kinds] if separate else [list(kinds)]
+    scenarios = []
+    for group in groups:
+        for count in counts:
+            scenarios.append(Scenario(
+                enemies=count if "enemy" in group else 0,
+                items=count if "item" in group else 0,
+                chests=count if "chest" in group else 0,
+                doors=count if "door" in group else 0,
+                frames=frames,
+            ))
+    return scenarios
+
+
+def _rss_bytes() -> int:
+    """Get the resident memory of this process."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        import resource
+        # ru_maxrss is the peak, in kilobytes on Linux and bytes on macOS
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    """Get a percentile of sorted values."""
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def run_scenario(scenario: Scenario) -> Dict:
+    """
+    Run one scenario in the current process.
+
+    The first level is entered, the scenario's entities are added across the
+    loaded part of it and the level scene is updated and drawn for
+    ``scenario.frames`` frames at the nominal frame time. The player is made
+    invulnerable so enemies cannot end the run.
+
+    Args:
+        scenario: Entity counts to run
+
+    Returns:
+        Frame-time percentiles in milliseconds, memory growth in megabytes
+        and the mean milliseconds per frame of every traced subsystem
+    """
+    init_headless()
+    from game import Game
+    from chest import Chest
+    from door import Door
+    from enemy import Enemy
+    from item import spawn_key, spawn_weapon
+
+    game = Game()
+    game.scenes.change("game")
+    game.scenes.apply_pending()
+    scene = game.scenes.current
+    game.player.health = math.inf
+    game.dt = 1 / FPS
+    baseline = _rss_bytes()
+
+    rng = random.Random(scenario.seed)
+    random.seed(scenario.seed)
+    # Spread enemies over the loaded chunks so streaming keeps them all
+    width = (max(scene.stream.loaded) + 1) * scene.stream.data.chunk_width
+    for _ in range(scenario.enemies):
+        enemy = Enemy(rng.randint(0, width - ENEMY_SIZE), None, scene.tilemap)
+        enemy.navigation = scene.stream.navigation
+        scene.enemies.append(enemy)
+    for index in range(scenario.items):
+        item = spawn_weapon() if index % 2 else spawn_key()
+        item.rect.topleft = (rng.randint(0, SCREEN_WIDTH - item.rect.width),
+                             rng.randint(0, GROUND_Y - 2 * item.rect.height))
+        item.enter_world(game.physics)
+        game.dropped_items.append(item)
+    chests = [Chest((rng.randint(0, SCREEN_WIDTH), None)) for _ in range(scenario.chests)]
+    doors = [Door(DOOR_SIZE, width, rng.randint(0, width - DOOR_SIZE[0]))
+             for _ in range(scenario.doors)]
+    setup_bytes = _rss_bytes() - baseline
+
+    frame_times = []
+    subsystems: Dict[str, int] = defaultdict(int)
+    tracer.enabled = True
+    tracer.drain()
+    for _ in range(scenario.frames):
+        start = time.perf_counter()
+        with tracer.span("frame"):
+            scene.update()
+            game.screen.fill(WHITE)
+            scene.draw(game.screen)
+            with tracer.span("draw extra chests"):
+                for chest in chests:
+                    chest.draw(game.screen)
+            with tracer.span("draw extra doors"):
+                for door in doors:
+                    door.draw(game.screen, scene.total_scroll)
+            pygame.display.flip()
+        frame_times.append(time.perf_counter() - start)
+        for name, _, _, duration, _ in tracer.drain():
+            subsystems[name] += duration
+    tracer.enabled = False
+    peak_bytes = _rss_bytes() - baseline
+    pygame.quit()
+
+    frame_times.sort()
+    frames = len(frame_times)
+    return {
+        "scenario": asdict(scenario),
+        "label": scenario.label,
+        "entities": scenario.total,
+        "p50_ms": _percentile(frame_times, 0.50) * 1000,
+        "p95_ms": _percentile(frame_times, 0.95) * 1000,
+        "p99_ms": _percentile(frame_times, 0.99) * 1000,
+        "max_ms": frame_times[-1] * 1000,
+        "setup_mb": setup_bytes / 2 ** 20,
+        "peak_mb": peak_bytes / 2 ** 20,
+        "subsystems": {name: total / frames / 1e6 for name, total in subsystems.items()
+                       if name != "frame"},
+    }
+
+
+def run_all(scenarios: List[Scenario]) -> List[Dict]:
+    """
+    Run each scenario in a fresh process, one at a time.
+
+    A new process per scenario keeps memory readings and caches from
+    leaking between scenarios; running them one at a time keeps the
+    timings free of interference.
+
+    Args:
+        scenarios: Scenarios to run
+
+    Returns:
+        Result of each scenario, in order
+    """
+    context = multiprocessing.get_context("spawn")
+    results = []
+    for scenario in scenarios:
+        with context.Pool(1) as pool:
+            result = pool.apply(run_scenario, (scenario,))
+        print(f"  {result['label']:<28} p50 {result['p50_ms']:7.2f} ms  p99 {result['p99_ms']:7.2f} ms",
+              flush=True)
+        results.append(result)
+    return results
+
+
+def scaling_report(results: List[Dict],
+                   factor: float = STRESS_SUPERLINEAR_FACTOR) -> List[Tuple[str, str]]:
+    """
+    Find where each subsystem stops scaling with entity count.
+
+    A subsystem stops scaling at the first scenario whose cost grew more
+    than ``factor`` times faster than its entity count since the previous
+    scenario of the curve, or at which the subsystem alone exceeds the
+    frame budget. Costs below ``STRESS_NOISE_FLOOR_MS`` are ignored.
+
+    Args:
+        results: Results of one scaling curve, smallest first
+        factor: Growth beyond linear that counts as not scaling
+
+    Returns:
+        (subsystem, verdict) pairs, the most expensive subsystem first
+    """
+    budget = 1000 / FPS
+    names = sorted({name for result in results for name in result["subsystems"]},
+                   key=lambda name: -results[-1]["subsystems"].get(name, 0.0))
+    report = []
+    for name in names:
+        verdict = f"scales up to {results[-1]['entities']} entities"
+        for previous, current in zip(results, results[1:]):
+            before = previous["subsystems"].get(name, 0.0)
+            after = current["subsystems"].get(name, 0.0)
+            growth = current["entities"] / max(1, previous["entities"])
+            if after > budget:
+                verdict = f"over the {budget:.1f} ms frame budget at {current['entities']} entities"
+                break
+            if after > STRESS_NOISE_FLOOR_MS and before > 0 and after / before > growth * factor:
+                verdict = (f"superlinear from {previous['entities']} to {current['entities']} "
+                           f"entities ({after / before:.1f}x cost for {growth:.0f}x entities)")
+                break
+        report.append((name, verdict))
+    return report
+
+
+def print_results(results: List[Dict], top: int = 8) -> None:
+    """
+    Print frame times, memory and subsystem costs per scenario.
+
+    Args:
+        results: Scenario results
+        top: Number of most expensive subsystems to list per scenario
+    """
+    print(f"\n{'scenario':<28} {'entities':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'max ms':>8} {'setup MB':>9} {'peak MB':>8}")
+    for result in results:
+        print(f"{result['label']:<28} {result['entities']:>8} {result['p50_ms']:>8.2f} "
+              f"{result['p95_ms']:>8.2f} {result['p99_ms']:>8.2f} {result['max_ms']:>8.2f} "
+              f"{result['setup_mb']:>9.1f} {result['peak_mb']:>8.1f}")
+
+    curves: Dict[str, List[Dict]] = defaultdict(list)
+    for result in results:
+        curves[result["label"].split(" x")[0]].append(result)
+    for kinds, curve in curves.items():
+        print(f"\nms per frame by subsystem ({kinds})")
+        names = sorted(curve[-1]["subsystems"], key=lambda name: -curve[-1]["subsystems"][name])[:top]
+        print(f"{'subsystem':<24}" + "".join(f"{result['entities']:>10}" for result in curve))
+        for name in names:
+            print(f"{name:<24}" + "".join(f"{result['subsystems'].get(name, 0.0):>10.3f}"
+                                          for result in curve))
+        print()
+        for name, verdict in scaling_report(curve)[:top]:
+            print(f"{name:<24} {verdict}")
+
+
+def main() -> None:
+    """Run the scaling curves given on the command line and print the report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--counts", default=",".join(map(str, STRESS_COUNTS)),
+                        help="comma-separated entity counts per kind")
+    parser.add_argument("--kinds", default=",".join(KINDS),
+                        help="comma-separated entity kinds to add (enemy, item, chest, door)")
+    parser.add_argument("--separate", action="store_true",
+                        help="scale each kind on its own instead of all together")
+    parser.add_argument("--frames", type=int, default=STRESS_FRAMES, help="frames run per scenario")
+    parser.add_argument("--json", default=None, metavar="PATH", help="also write the results as JSON")
+    args = parser.parse_args()
+
+    kinds = [kind.strip() for kind in args.kinds.split(",") if kind.strip()]
+    unknown = set(kinds) - set(KINDS)
+    if unknown:
+        parser.error(f"unknown kinds: {', '.join(sorted(unknown))}")
+    counts = [int(count) for count in args.counts.split(",")]
+    scenarios = scaling_curve(counts, kinds, args.separate, args.frames)
+
+    print(f"Running {len(scenarios)} scenarios of {args.frames} frames")
+    results = run_all(scenarios)
+    print_results(results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as output:
+            json.dump(results, output, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+"""
+Tile platforms for the Escape-WE-Project game.
+Holds a level's static collision grid and draws its tiles from cached chunk surfaces.
+"""
+
+import random
+import pygame
+from typing import Dict, Iterable, List, Optional, Tuple
+from config import (
+    SCREEN_WIDTH, SCREEN_HEIGHT, GROUND_Y, TILE_SIZE, TILE_CHUNK_WIDTH, PLATFORM_SPACING,
+    PLATFORM_ROWS, TILE_COLOR, TILE_EDGE_COLOR, COLORKEY
+)
+
+# Platform as (first column, row, length in tiles)
+Platform = Tuple[int, int, int]
+
+
+class TileMap:
+    """
+    Static grid of one-way platform tiles.
+
+    The grid is built once per level. From it, each column gets the sorted
+    tops of its platforms and each row gets its solid spans, so collision
+    queries are a lookup in the few columns an object covers rather than a
+    test against every platform rect. Platforms can be jumped through from
+    below and are only solid for objects landing on them.
+
+    Positions passed to queries are in screen coordinates; ``offset_x`` is
+    the scroll offset that converts them to level coordinates. A map may
+    cover only part of a level, starting at ``origin_column``, so a
+    streamed level only holds the grid of the chunks that are loaded.
+
+    Attributes:
+        columns: Grid width in tiles
+        rows: Grid height in tiles
+        tile_size: Tile edge length in pixels
+        origin_column: Level column of the grid's first column
+        platforms: Platforms the grid was built from
+        offset_x: Current scroll offset of the level
+    """
+
+    def __init__(self, columns: int, platforms: Iterable[Platform],
+                 rows: int = SCREEN_HEIGHT // TILE_SIZE, tile_size: int = TILE_SIZE,
+                 origin_column: int = 0,
+                 chunk_cache: Optional[Dict[int, Tuple[pygame.Surface, int]]] = None):
+        """
+        Build the collision grid.
+
+        Args:
+            columns: Grid width in tiles
+            platforms: Platforms as (first level column, row, length)
+            rows: Grid height in tiles
+            tile_size: Tile edge length in pixels
+            origin_column: Level column of the grid's first column
+            chunk_cache: Rendered chunks to share with other maps of the same level
+        """
+        self.columns = columns
+        self.rows = rows
+        self.tile_size = tile_size
+        self.origin_column = origin_column
+        self.platforms: List[Platform] = list(platforms)
+        self.offset_x = 0
+        self.grid = bytearray(columns * rows)
+        for column, row, length in self.platforms:
+            column -= origin_column
+            for c in range(max(0, column), min(columns, column + length)):
+                self.grid[row * columns + c] = 1
+
+        # Tops of the surfaces in each column, from the highest down
+        self._column_tops: List[Tuple[int, ...]] = []
+        for c in range(columns):
+            self._column_tops.append(tuple(
+                row * tile_size for row in range(rows)
+                if self.grid[row * columns + c]
+                and (row == 0 or not self.grid[(row - 1) * columns + c])
+            ))
+
+        # Solid spans of each row as (left, right) in level pixels
+        self._row_spans: List[List[Tuple[int, int]]] = []
+        for row in range(rows):
+            spans = []
+            start = None
+            for c in range(columns + 1):
+                solid = c < columns and self.grid[row * columns + c]
+                if solid and start is None:
+                    start = c
+                elif not solid and start is not None:
+                    spans.append(((origin_column + start) * tile_size,
+                                  (origin_column + c) * tile_size))
+                    start = None
+            self._row_spans.append(spans)
+
+        # Rendered chunks as (surface, top) by level chunk index
+        self.chunk_cache = {} if chunk_cache is None else chunk_cache
+
+    @staticmethod
+    def layout(first_column: int, columns: int, rng: Optional[random.Random] = None,
+               tile_size: int = TILE_SIZE) -> List[Platform]:
+        """
+        Lay out random platforms over a range of level columns.
+
+        Every ``PLATFORM_SPACING`` pixels get a low platform that can be
+        reached from the ground, sometimes with a higher one reachable from
+        it. The first section of a level is left free for the player to start in.
+
+        Args:
+            first_column: First level column of the range
+            columns: Number of columns in the range
+            rng: Random number generator to draw from, the shared one if None
+            tile_size: Tile edge length in pixels
+
+        Returns:
+            Platforms as (first level column, row, length)
+        """
+        rng = rng or random
+        section = max(1, PLATFORM_SPACING // tile_size)
+        low_row, high_row = PLATFORM_ROWS
+        platforms = []
+        end = first_column + columns
+        for start in range(max(first_column, section), end - section // 2, section):
+            length = rng.randint(3, 5)
+            column = start + rng.randint(0, max(0, section - length - 3))
+            platforms.append((column, low_row, length))
+            if rng.random() < 0.5:
+                platforms.append((column + length - 1, high_row, rng.randint(3, 4)))
+        return platforms
+
+    @classmethod
+    def generate(cls, width: int, tile_size: int = TILE_SIZE) -> "TileMap":
+        """
+        Lay out random platforms across a whole level.
+
+        Args:
+            width: Level width in pixels
+            tile_size: Tile edge length in pixels
+
+        Returns:
+            New tile map
+        """
+        columns = width // tile_size
+        return cls(columns, cls.layout(0, columns, tile_size=tile_size), tile_size=tile_size)
+
+    def is_solid(self, column: int, row: int) -> bool:
+        """
+        Check whether a grid cell holds a tile.
+
+        Args:
+            column: Grid column
+            row: Grid row
+
+        Returns:
+            True if the cell is solid
+        """
+        if 0 <= column < self.columns and 0 <= row < self.rows:
+            return bool(self.grid[row * self.columns + column])
+        return False
+
+    def surface_tops(self, column: int) -> Tuple[int, ...]:
+        """
+        Get the tops of the platform surfaces in a grid column.
+
+        Args:
+            column: Grid column
+
+        Returns:
+            Surface tops in pixels from the highest down, empty outside the grid
+        """
+        if 0 <= column < self.columns:
+            return self._column_tops[column]
+        return ()
+
+    def ground_below(self, left: float, right: float, bottom: float) -> float:
+        """
+        Find the highest surface at or below a point across a horizontal span.
+
+        Args:
+            left: Left edge of the span in screen coordinates
+            right: Right edge of the span in screen coordinates
+            bottom: Lowest point of the object (its feet)
+
+        Returns:
+            Top of the surface the object would land on, GROUND_Y if no platform
+        """
+        size = self.tile_size
+        first = max(0, int(left + self.offset_x) // size - self.origin_column)
+        last = min(self.columns - 1, int(right - 1 + self.offset_x) // size - self.origin_column)
+        ground = GROUND_Y
+        for column in range(first, last + 1):
+            for top in self._column_tops[column]:
+                if top >= bottom:
+                    if top < ground:
+                        ground = top
+                    break
+        return ground
+
+    def platform_bounds(self, left: float, right: float,
+                        bottom: float) -> Optional[Tuple[float, float]]:
+        """
+        Get the horizontal extent of the platform an object stands on.
+
+        Args:
+            left: Left edge of the object in screen coordinates
+            right: Right edge of the object in screen coordinates
+            bottom: Feet of the object
+
+        Returns:
+            (left, right) of the platform in screen coordinates, None when
+            standing on the ground or in the air
+        """
+        if bottom >= GROUND_Y or bottom % self.tile_size:
+            return None
+        row = int(bottom) // self.tile_size
+        if not 0 <= row < self.rows:
+            return None
+        center = (left + right) / 2 + self.offset_x
+        for span_left, span_right in self._row_spans[row]:
+            if span_left <= center < span_right:
+                return span_left - self.offset_x, span_right - self.offset_x
+        return None
+
+    def _render_chunk(self, index: int) -> Tuple[pygame.Surface, int]:
+        """Draw the tiles of one chunk onto a colorkey surface cropped to its highest tile."""
+        size = self.tile_size
+        first = index * TILE_CHUNK_WIDTH // size - self.origin_column
+        columns = range(max(0, first), min(self.columns, first + TILE_CHUNK_WIDTH // size))
+        solid_rows = [row for row in range(self.rows)
+                      if any(self.grid[row * self.columns + column] for column in columns)]
+        top = solid_rows[0] * size if solid_rows else SCREEN_HEIGHT - size
+        chunk = pygame.Surface((TILE_CHUNK_WIDTH, SCREEN_HEIGHT - top)).convert()
+        chunk.fill(COLORKEY)
+        for row in solid_rows:
+            for column in columns:
+                if self.grid[row * self.columns + column]:
+                    tile = pygame.Rect((column - first) * size, row * size - top, size, size)
+                    chunk.fill(TILE_COLOR, tile)
+                    pygame.draw.rect(chunk, TILE_EDGE_COLOR, tile, 2)
+        chunk.set_colorkey(COLORKEY, pygame.RLEACCEL)
+        return chunk, top
+
+    def draw(self, screen: pygame.Surface) -> None:
+        """
+        Draw the visible chunks at the current scroll offset.
+
+        Args:
+            screen: Surface to draw on
+        """
+        if not self.platforms:
+            return
+        start = self.origin_column * self.tile_size
+        end = start + self.columns * self.tile_size
+        first = max(start, int(self.offset_x)) // TILE_CHUNK_WIDTH
+        last = min(end - 1, int(self.offset_x + SCREEN_WIDTH - 1)) // TILE_CHUNK_WIDTH
+        for index in range(first, last + 1):
+            cached = self.chunk_cache.get(index)
+            if cached is None:
+                cached = self.chunk_cache[index] = self._render_chunk(index)
+            chunk, top = cached
+            screen.blit(chunk, (index * TILE_CHUNK_WIDTH - self.offset_x, top))
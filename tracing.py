@@ -0,0 +1,194 @@
+"""
+Frame tracing for the Escape-WE-Project game.
+Records timed spans into a ring buffer and exports them as Chrome trace-event JSON.
+"""
+
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+from config import TRACE_BUFFER_SIZE, TRACE_OUTPUT_PATH
+
+logger = logging.getLogger(__name__)
+
+# (name, category, start_ns, duration_ns, thread_id)
+SpanRecord = Tuple[str, str, int, int, int]
+
+
+class _NullSpan:
+    """Span returned while tracing is disabled; does nothing."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    """Context manager that records its own duration into a tracer's buffer."""
+
+    __slots__ = ("tracer", "name", "category", "start")
+
+    def __init__(self, tracer: "Tracer", name: str, category: str):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.start = 0
+
+    def __enter__(self) -> "_Span":
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        end = time.perf_counter_ns()
+        self.tracer._record((self.name, self.category, self.start,
+                             end - self.start, threading.get_ident()))
+
+
+class Tracer:
+    """
+    Collects timed spans for offline frame analysis.
+
+    Spans are appended to a bounded deque, so the newest ``capacity`` spans
+    are kept and recording never allocates beyond that bound. Nothing is
+    serialized until ``flush`` writes the buffer as a Chrome trace-event
+    file that can be opened in Perfetto or ``chrome://tracing``. Spans may
+    be recorded from any thread, e.g. the render thread, while another
+    drains or flushes the buffer.
+
+    Example:
+        tracer.enable("trace.json")
+        with tracer.span("Player.update"):
+            player.update()
+        tracer.flush()
+
+    Attributes:
+        enabled: Whether spans are being recorded
+        output_path: File written by ``flush``
+    """
+
+    def __init__(self, capacity: int = TRACE_BUFFER_SIZE):
+        """
+        Initialize a disabled tracer.
+
+        Args:
+            capacity: Maximum number of spans kept in the ring buffer
+        """
+        self.enabled = False
+        self.output_path = TRACE_OUTPUT_PATH
+        self._buffer: Deque[SpanRecord] = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter_ns()
+        self._atexit_registered = False
+
+    def enable(self, output_path: Optional[str] = None) -> None:
+        """
+        Start recording spans and flush them when the process exits.
+
+        Args:
+            output_path: File to write the trace to (defaults to TRACE_OUTPUT_PATH)
+        """
+        if output_path:
+            self.output_path = output_path
+        self.enabled = True
+        if not self._atexit_registered:
+            atexit.register(self.flush)
+            self._atexit_registered = True
+
+    def disable(self) -> None:
+        """Stop recording spans. Already recorded spans are kept."""
+        self.enabled = False
+
+    def span(self, name: str, category: str = "frame") -> _Span | _NullSpan:
+        """
+        Create a context manager that records a span around its body.
+
+        Args:
+            name: Span name shown in the trace viewer
+            category: Span category used for filtering
+
+        Returns:
+            A recording span, or a shared no-op span while disabled
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, category)
+
+    def _record(self, record: SpanRecord) -> None:
+        """Append a finished span to the buffer."""
+        with self._lock:
+            self._buffer.append(record)
+
+    def drain(self) -> List[SpanRecord]:
+        """
+        Remove and return the buffered spans, e.g. to aggregate them in process.
+
+        Returns:
+            Spans recorded since the last drain, oldest first
+        """
+        with self._lock:
+            spans = list(self._buffer)
+            self._buffer.clear()
+        return spans
+
+    def to_trace_events(self) -> Dict[str, list]:
+        """
+        Convert the buffered spans to the Chrome trace-event format.
+
+        Returns:
+            Dictionary ready to be serialized as JSON
+        """
+        with self._lock:
+            spans = list(self._buffer)
+        thread_ids: Dict[int, int] = {}
+        events = []
+        pid = os.getpid()
+        for name, category, start, duration, ident in spans:
+            tid = thread_ids.setdefault(ident, len(thread_ids) + 1)
+            events.append({
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": (start - self._origin) / 1000,
+                "dur": duration / 1000,
+                "pid": pid,
+                "tid": tid,
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def flush(self, output_path: Optional[str] = None) -> int:
+        """
+        Write the buffered spans to a trace file.
+
+        Args:
+            output_path: File to write (defaults to ``self.output_path``)
+
+        Returns:
+            Number of spans written
+        """
+        if not self._buffer:
+            return 0
+        path = output_path or self.output_path
+        trace = self.to_trace_events()
+        try:
+            with open(path, "w", encoding="utf-8") as trace_file:
+                json.dump(trace, trace_file)
+        except OSError as e:
+            logger.error("Error writing trace %s: %s", path, e)
+            return 0
+        logger.info("Wrote %d trace events to %s", len(trace["traceEvents"]), path)
+        return len(trace["traceEvents"])
+
+
+# Process-wide tracer shared by all modules
+tracer = Tracer()
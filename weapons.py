@@ -0,0 +1,84 @@
+"""
+Weapon hit detection for the Escape-WE-Project game.
+Sweeps a weapon's swing arc against targets using cached per-angle blade masks.
+"""
+
+import math
+from typing import Any, List, Sequence, Set, Tuple
+import pygame
+from config import WEAPON_MASK_STEP
+from item import Item
+
+
+class SwingHitDetector:
+    """
+    Hits along the arc a weapon sweeps during an attack.
+
+    Each call tests the part of the swing covered since the previous one:
+    the blade is placed at every WEAPON_MASK_STEP degrees of that part of
+    the arc, the bounding box of all placements picks the candidate targets
+    in a single ``Rect.collidelistall`` call, and only those are tested
+    pixel by pixel against the blade's cached mask at each placement. Fast
+    swings therefore cannot skip over a target between frames, and a target
+    is hit at most once per swing.
+
+    Targets are objects with a ``rect`` and a ``get_mask()`` method
+    returning the mask of their current sprite.
+
+    Attributes:
+        hit: Targets hit during the current swing
+    """
+
+    def __init__(self):
+        """Initialize without a swing in progress."""
+        self.hit: Set[Any] = set()
+
+    def sweep(self, weapon: Item, pivot: Tuple[float, float], aim: float,
+              swept: Tuple[float, float], targets: Sequence[Any]) -> List[Any]:
+        """
+        Find the targets the weapon hits in part of its swing.
+
+        Args:
+            weapon: Swinging weapon
+            pivot: Point the weapon swings around, the wielder's center
+            aim: Angle in radians the swing ends on
+            swept: Attack progress before and after the part to test, as
+                returned by ``Item.advance_attack``
+            targets: Objects that can be hit
+
+        Returns:
+            Targets hit for the first time this swing
+        """
+        start, end = swept
+        if start == 0:
+            self.hit.clear()
+        radius = math.hypot(weapon.rect.centerx - pivot[0], weapon.rect.centery - pivot[1])
+        first = aim + weapon.swing_offset(start)
+        last = aim + weapon.swing_offset(end)
+        steps = max(1, math.ceil(abs(math.degrees(last - first)) / WEAPON_MASK_STEP))
+
+        placements = []
+        for step in range(steps + 1):
+            angle = first + (last - first) * step / steps
+            mask = weapon.blade_mask(math.degrees(angle))
+            width, height = mask.get_size()
+            rect = pygame.Rect(0, 0, width, height)
+            rect.center = (round(pivot[0] + radius * math.cos(angle)),
+                           round(pivot[1] + radius * math.sin(angle)))
+            placements.append((rect, mask))
+        bounds = placements[0][0].unionall([rect for rect, _ in placements[1:]])
+
+        hits = []
+        for index in bounds.collidelistall([target.rect for target in targets]):
+            target = targets[index]
+            if target in self.hit:
+                continue
+            target_rect = target.rect
+            target_mask = target.get_mask()
+            for rect, mask in placements:
+                if rect.colliderect(target_rect) and mask.overlap(
+                        target_mask, (target_rect.x - rect.x, target_rect.y - rect.y)):
+                    self.hit.add(target)
+                    hits.append(target)
+                    break
+        return hits